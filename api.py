@@ -0,0 +1,342 @@
+"""
+Headless HTTP API for the resume pipeline.
+
+Exposes the same utils functions the Streamlit app uses:
+
+    POST /parse      multipart upload (field "file") -> parsed sections
+    POST /generate   JSON input_data -> resume and ATS score (?profile=1 to profile)
+    POST /regenerate JSON {resume, section, job_description, feedback} -> resume with
+                     that section rewritten, and its ATS score
+    POST /tailor     JSON input_data plus job_descriptions -> one tailored resume
+                     and ATS score per job description
+    POST /score      JSON {resume, job_description, target_role} -> ATS score
+    POST /render     JSON {resume, format: pdf|docx, layout, max_pages} -> file bytes
+                     (max_pages condenses the PDF to fit that many pages)
+    GET  /metrics    Prometheus metrics for every pipeline stage
+    GET  /healthz    liveness
+    GET  /readyz     readiness (pool started and not saturated)
+
+Run with:
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+Parsing and rendering are CPU-bound and run in a shared process pool; LLM
+generation is I/O-bound and runs in threads. Each endpoint has a bounded
+number of running and waiting requests; when both are full the request is
+rejected with 503 and Retry-After instead of queueing without limit.
+"""
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from utils import admission, metrics
+from utils.ats_scorer import calculate_ats_score
+from utils.pdf_generator import create_pdf, create_docx, LAYOUTS, DEFAULT_LAYOUT
+from utils.ai_generator import SECTION_HEADERS
+from utils.pipeline import admit_generation, run_resume_pipeline, regenerate_resume_section, tailor_resume_to_jobs
+from utils.resume_parser import parse_resume_bytes, MAX_UPLOAD_BYTES
+from utils.resume_model import ResumeDocument
+from utils.tailoring import normalize_jobs
+
+PROCESS_WORKERS = int(os.getenv('API_PROCESS_WORKERS', str(os.cpu_count() or 1)))
+LLM_CONCURRENCY = int(os.getenv('API_LLM_CONCURRENCY', '8'))
+MAX_QUEUE = int(os.getenv('API_MAX_QUEUE', '32'))
+RETRY_AFTER_SECONDS = int(os.getenv('API_RETRY_AFTER', '5'))
+
+REQUIRED_FIELDS = ('full_name', 'email', 'phone', 'target_role')
+
+# Form inputs of /generate and /tailor; each must be a string when given
+TEXT_FIELDS = REQUIRED_FIELDS + (
+    'summary', 'skills', 'experience', 'projects', 'education', 'certifications', 'job_description',
+)
+
+MEDIA_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
+class Overloaded(Exception):
+    """Raised when a lane's running and waiting slots are all taken"""
+
+
+class Lane:
+    """
+    Bounded admission for one kind of work: at most `concurrency` requests
+    run at once and at most `max_queue` more may wait for a slot.
+    """
+
+    def __init__(self, name, concurrency, max_queue):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.running = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(concurrency)
+
+    @property
+    def saturated(self):
+        return self.waiting >= self.max_queue
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.running >= self.concurrency and self.saturated:
+            raise Overloaded(self.name)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    def stats(self):
+        return {
+            'running': self.running,
+            'waiting': self.waiting,
+            'concurrency': self.concurrency,
+            'max_queue': self.max_queue,
+        }
+
+
+def error(message, status=400, **headers):
+    return JSONResponse({'error': message}, status_code=status, headers=headers or None)
+
+
+async def run_in_lane(request, lane_name, fn, *args, process=False):
+    """Run fn(*args) in the process pool or a thread, under the lane's limits"""
+    state = request.app.state
+    lane = state.lanes[lane_name]
+    loop = asyncio.get_running_loop()
+    async with lane.slot():
+        if process:
+            # Spans recorded in the worker are shipped back and exported here
+            result, records = await loop.run_in_executor(state.process_pool, metrics.run_collecting, fn, *args)
+            metrics.replay(records)
+            return result
+        return await asyncio.to_thread(fn, *args)
+
+
+async def read_json(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ValueError("Request body must be JSON")
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    return body
+
+
+def check_text_fields(body, fields):
+    """400 response naming the first field that is set but not a string, or None"""
+    for field in fields:
+        value = body.get(field)
+        if value is not None and not isinstance(value, str):
+            return error(f"Expected '{field}' to be a string")
+    return None
+
+
+async def parse(request):
+    form = await request.form(max_files=1)
+    upload = form.get('file')
+    if upload is None or not hasattr(upload, 'read'):
+        return error("Expected a multipart upload in field 'file'")
+    if upload.size is not None and upload.size > MAX_UPLOAD_BYTES:
+        return error(f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit", 413)
+
+    data = await upload.read()
+    try:
+        parsed = await run_in_lane(request, 'parse', parse_resume_bytes, upload.filename or '', data, process=True)
+    except ValueError as e:
+        return error(str(e), 413)
+    if parsed is None:
+        return error("Could not parse file; upload a PDF or DOCX resume", 422)
+    return JSONResponse(parsed)
+
+
+async def generate(request):
+    try:
+        input_data = await read_json(request)
+    except ValueError as e:
+        return error(str(e))
+
+    invalid = check_text_fields(input_data, TEXT_FIELDS)
+    if invalid:
+        return invalid
+    missing = [f for f in REQUIRED_FIELDS if not str(input_data.get(f) or '').strip()]
+    if missing:
+        return error(f"Missing required fields: {', '.join(missing)}")
+
+    # Decide before waiting for the lane, so a shed request is answered at once
+    slot, shed = admit_generation(input_data)
+    if shed is not None:
+        return JSONResponse(shed)
+
+    profile = request.query_params.get('profile') == '1'
+    try:
+        result = await run_in_lane(request, 'generate', run_resume_pipeline, input_data, profile, slot)
+    except BaseException:
+        # Rejected by the lane, failed or cancelled: never keep the slot
+        if slot is not None:
+            slot.release()
+        raise
+    return JSONResponse(result)
+
+
+async def regenerate(request):
+    try:
+        body = await read_json(request)
+    except ValueError as e:
+        return error(str(e))
+    if not isinstance(body.get('resume'), dict):
+        return error("Expected 'resume' to be a resume object")
+    if body.get('section') not in SECTION_HEADERS:
+        return error(f"Expected 'section' to be one of: {', '.join(SECTION_HEADERS)}")
+    invalid = check_text_fields(body, ('job_description', 'feedback'))
+    if invalid:
+        return invalid
+
+    result = await run_in_lane(request, 'generate', regenerate_resume_section, body)
+    return JSONResponse(result)
+
+
+async def tailor(request):
+    try:
+        body = await read_json(request)
+    except ValueError as e:
+        return error(str(e))
+
+    invalid = check_text_fields(body, TEXT_FIELDS)
+    if invalid:
+        return invalid
+    missing = [f for f in REQUIRED_FIELDS if not str(body.get(f) or '').strip()]
+    if missing:
+        return error(f"Missing required fields: {', '.join(missing)}")
+    if not isinstance(body.get('job_descriptions'), list):
+        return error("Expected 'job_descriptions' to be a list of strings or {title, job_description} objects")
+    try:
+        normalize_jobs(body['job_descriptions'])
+    except (ValueError, AttributeError) as e:
+        return error(str(e) if isinstance(e, ValueError) else "Invalid job description entry")
+
+    result = await run_in_lane(request, 'generate', tailor_resume_to_jobs, body)
+    return JSONResponse(result)
+
+
+async def score(request):
+    try:
+        body = await read_json(request)
+    except ValueError as e:
+        return error(str(e))
+    if not isinstance(body.get('resume'), dict):
+        return error("Expected 'resume' to be a resume object")
+    invalid = check_text_fields(body, ('job_description', 'target_role'))
+    if invalid:
+        return invalid
+
+    resume = ResumeDocument.from_dict(body['resume'])
+    target_role = body.get('target_role') or resume.target_role
+    result = await run_in_lane(request, 'score', calculate_ats_score, resume, body.get('job_description') or '', target_role)
+    return JSONResponse(result)
+
+
+async def render(request):
+    try:
+        body = await read_json(request)
+    except ValueError as e:
+        return error(str(e))
+    if not isinstance(body.get('resume'), dict):
+        return error("Expected 'resume' to be a resume object")
+
+    fmt = body.get('format', 'pdf')
+    if fmt not in MEDIA_TYPES:
+        return error(f"Unknown format '{fmt}'. Choose from: {', '.join(MEDIA_TYPES)}")
+    layout = body.get('layout', DEFAULT_LAYOUT)
+    if layout not in LAYOUTS:
+        return error(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}")
+    max_pages = body.get('max_pages')
+    if max_pages is not None and (type(max_pages) is not int or max_pages < 1):
+        return error("Expected 'max_pages' to be a positive integer")
+
+    resume = body['resume']
+    if fmt == 'pdf':
+        data = await run_in_lane(request, 'render', create_pdf, resume, layout, max_pages, process=True)
+    else:
+        data = await run_in_lane(request, 'render', create_docx, resume, process=True)
+
+    name = re.sub(r'[^A-Za-z0-9]+', '_', str(resume.get('name') or 'Resume')).strip('_') or 'Resume'
+    return Response(data, media_type=MEDIA_TYPES[fmt], headers={
+        'Content-Disposition': f'attachment; filename="{name}_Resume.{fmt}"'
+    })
+
+
+async def metrics_endpoint(request):
+    return Response(metrics.prometheus_text(), media_type='text/plain; version=0.0.4')
+
+
+async def healthz(request):
+    return JSONResponse({'status': 'ok'})
+
+
+async def readyz(request):
+    state = request.app.state
+    lanes = {name: lane.stats() for name, lane in state.lanes.items()}
+    ready = state.ready and not any(lane.saturated for lane in state.lanes.values())
+    body = {'ready': ready, 'lanes': lanes, 'llm': admission.controller.stats()}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+async def overloaded(request, exc):
+    return error(f"Server busy ({exc}); retry later", 503, **{'Retry-After': str(RETRY_AFTER_SECONDS)})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.ready = False
+    app.state.process_pool = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+    app.state.lanes = {
+        'parse': Lane('parse', PROCESS_WORKERS, MAX_QUEUE),
+        'render': Lane('render', PROCESS_WORKERS, MAX_QUEUE),
+        'generate': Lane('generate', LLM_CONCURRENCY, MAX_QUEUE),
+        'score': Lane('score', PROCESS_WORKERS, MAX_QUEUE),
+    }
+    # Requests waiting for a generation slot count towards load shedding
+    admission.controller.set_queue_depth(lambda: app.state.lanes['generate'].waiting)
+
+    # Start the worker processes (and their imports) before taking traffic
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[
+        loop.run_in_executor(app.state.process_pool, os.getpid) for _ in range(PROCESS_WORKERS)
+    ])
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        app.state.process_pool.shutdown(wait=True, cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route('/parse', parse, methods=['POST']),
+        Route('/generate', generate, methods=['POST']),
+        Route('/regenerate', regenerate, methods=['POST']),
+        Route('/tailor', tailor, methods=['POST']),
+        Route('/score', score, methods=['POST']),
+        Route('/render', render, methods=['POST']),
+        Route('/metrics', metrics_endpoint, methods=['GET']),
+        Route('/healthz', healthz, methods=['GET']),
+        Route('/readyz', readyz, methods=['GET']),
+    ],
+    exception_handlers={Overloaded: overloaded},
+    lifespan=lifespan,
+)
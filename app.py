@@ -1,9 +1,19 @@
 import streamlit as st
-from utils.resume_parser import parse_resume
-from utils.ai_generator import generate_resume_content
-from utils.ats_scorer import calculate_ats_score
-from utils.pdf_generator import create_pdf, create_docx
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.resume_parser import parse_resume, MAX_UPLOAD_BYTES
+from utils.pdf_generator import create_pdf, create_docx, measure_pages, LAYOUTS, DEFAULT_LAYOUT
+from utils.resume_model import as_document, ResumeDocument
+from utils.ats_scorer import IncrementalScorer
+from utils.jobs import JobQueue, QUEUED, DONE, FAILED
+from utils.pipeline import admit_generation, provisional_result, run_job
+from utils.tailoring import variants_zip
+from utils.jd_library import get_library
+from utils.ai_generator import SECTION_HEADERS, get_llm
+from utils import admission, artifacts, metrics
 import os
+import pickle
+import re
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -49,11 +59,163 @@ st.markdown("""
 st.markdown('<p class="main-header">📄 ResumeAI Pro</p>', unsafe_allow_html=True)
 st.markdown('<p style="text-align: center; color: #666;">AI-Powered ATS-Friendly Resume Builder</p>', unsafe_allow_html=True)
 
-# Initialize session state
-if 'resume_data' not in st.session_state:
-    st.session_state.resume_data = None
-if 'ats_score' not in st.session_state:
-    st.session_state.ats_score = None
+@st.cache_resource
+def start_metrics_server():
+    """Expose /metrics on RESUME_METRICS_PORT, once per server process"""
+    port = os.getenv('RESUME_METRICS_PORT')
+    return metrics.serve(int(port)) if port else None
+
+
+start_metrics_server()
+
+
+@st.cache_resource
+def get_jd_library():
+    """The local JD library; opening it also lets scoring use its stored JD features"""
+    return get_library()
+
+
+def use_library_jd(jd_id):
+    """Fill the form's job description from the library"""
+    jd = get_jd_library().get(jd_id)
+    if jd:
+        st.session_state.form_jd = jd['job_description']
+
+
+@st.cache_resource
+def get_job_queue():
+    """One job queue per server process, shared by every session"""
+    queue = JobQueue(run_job, max_workers=int(os.getenv('RESUME_LLM_CONCURRENCY', '4')))
+    # Jobs waiting for a worker count towards LLM load shedding
+    admission.controller.set_queue_depth(queue.queued_count)
+    return queue
+
+
+def show_result(resume, ats_score, job_description):
+    """
+    Put a result in the artifact store and show it in the Results tab. The
+    session keeps only the keys, so idle sessions hold almost nothing.
+    """
+    st.session_state.resume_key = artifacts.store.put_json(as_document(resume).to_dict())
+    st.session_state.score_key = artifacts.store.put_json({
+        'ats_score': ats_score,
+        'job_description': job_description or '',
+    })
+
+
+def load_job_result(job):
+    """Show a finished job's resume and score"""
+    result = job['result']
+    if 'section' in result and result['resume'].get('degraded'):
+        # The rewrite fell back to keeping the section; say so instead of
+        # passing the unchanged text off as new
+        previous = artifacts.load_resume(st.session_state.resume_key)
+        if previous is not None and previous[result['section']] == result['resume'][result['section']]:
+            st.session_state.section_kept = result['section']
+    show_result(result['resume'], result['ats_score'], result.get('job_description', ''))
+    st.session_state.loaded_job = job['id']
+    st.session_state.pending_section = None
+    st.session_state.pending_upgrade = False
+    # The final result replaces a provisional one; keep its score to show the change
+    st.session_state.score_baseline = job['provisional']['ats_score'] if job['provisional'] else None
+    # Multi-JD runs return one variant per job description; the first is shown
+    if 'section' not in result:
+        variants = result.get('variants')
+        st.session_state.variants_key = artifacts.store.put_json(variants) if variants else None
+        st.session_state.variant_index = 0
+    elif st.session_state.variants_key:
+        # A section rewrite of the shown variant replaces that variant
+        variants = artifacts.store.get_json(st.session_state.variants_key)
+        if variants:
+            index = st.session_state.variant_index
+            variants[index] = {**variants[index], 'resume': result['resume'], 'ats_score': result['ats_score']}
+            st.session_state.variants_key = artifacts.store.put_json(variants)
+
+
+def load_provisional_result(job):
+    """Show a pending job's locally built provisional result until the final one lands"""
+    provisional = job['provisional']
+    show_result(provisional['resume'], provisional['ats_score'], provisional.get('job_description', ''))
+    st.session_state.provisional_job = job['id']
+    st.session_state.score_baseline = None
+
+
+def submit_generation(input_data):
+    """
+    Queue a generation job, or serve the degraded local resume right away
+    when the LLM is saturated. Admission is decided here, before the job
+    waits for a worker, and an admitted job carries a provisional draft that
+    shows while it is queued. Returns the job ID, or None if no job was queued.
+    """
+    queue = get_job_queue()
+    slot, shed = admit_generation(input_data)
+    if shed is None:
+        # Without an LLM the job itself is the quick local generator
+        provisional = provisional_result(input_data) if get_llm() is not None else None
+        return queue.submit(input_data, provisional=provisional, slot=slot)
+    show_result(shed['resume'], shed['ats_score'], shed['job_description'])
+    st.session_state.variants_key = None
+    st.session_state.score_baseline = None
+    st.session_state.pending_upgrade = False
+    st.session_state.served_degraded = True
+    st.session_state.job_id = None
+    st.query_params.pop('job', None)
+    return None
+
+
+def session_state_bytes():
+    """Approximate size of this session's state, from its pickled values"""
+    total = 0
+    for value in st.session_state.to_dict().values():
+        try:
+            total += len(pickle.dumps(value))
+        except Exception:
+            pass
+    return total
+
+
+# Initialize session state. Results and large inputs live in the artifact
+# store (utils/artifacts.py); the session holds their keys.
+if 'resume_key' not in st.session_state:
+    st.session_state.resume_key = None
+    st.session_state.score_key = None
+    st.session_state.variants_key = None
+    st.session_state.last_input_key = None
+if 'upload_nonce' not in st.session_state:
+    # Bumped after parsing so the uploader widget (and its bytes) is dropped
+    st.session_state.upload_nonce = 0
+if 'job_id' not in st.session_state:
+    # The job ID is also kept in the URL so a refreshed page can pick it up
+    st.session_state.job_id = st.query_params.get('job')
+    st.session_state.loaded_job = None
+    # Section being regenerated by the pending job, if that's what it is
+    st.session_state.pending_section = None
+    # Whether the pending job redoes a degraded resume with the LLM
+    st.session_state.pending_upgrade = False
+    # Job whose provisional result is currently shown
+    st.session_state.provisional_job = None
+
+# Reload the result of a job that finished while this page wasn't connected
+if st.session_state.job_id and st.session_state.loaded_job != st.session_state.job_id:
+    _job = get_job_queue().get(st.session_state.job_id)
+    if _job is None:
+        st.session_state.job_id = None
+        st.query_params.pop('job', None)
+    elif _job['status'] == DONE:
+        load_job_result(_job)
+    elif _job['provisional'] and st.session_state.provisional_job != _job['id']:
+        load_provisional_result(_job)
+
+# The result shown in the Results tab, read back from the artifact store
+resume_data = artifacts.load_resume(st.session_state.resume_key)
+_shown = artifacts.store.get_json(st.session_state.score_key) if st.session_state.score_key else None
+if st.session_state.resume_key and (resume_data is None or _shown is None):
+    # Evicted from the store after a long idle period
+    st.session_state.resume_key = st.session_state.score_key = st.session_state.variants_key = None
+    resume_data = _shown = None
+    st.info("⌛ Your previous result has expired. Please generate it again.")
+ats_score = _shown['ats_score'] if _shown else None
+shown_job_description = _shown['job_description'] if _shown else ''
 
 # Sidebar for input collection
 st.sidebar.header("📝 Enter Your Details")
@@ -88,6 +250,27 @@ st.header("📋 Build Your ATS-Optimized Resume")
 tab1, tab2 = st.tabs(["📝 Enter Details", "📊 Results"])
 
 with tab1:
+    # Search stored JDs instead of pasting one; outside the form so results
+    # update as you type
+    with st.expander("📚 Job Description Library", expanded=False):
+        jd_library = get_jd_library()
+        if not jd_library.count():
+            st.caption("The library is empty. Import postings with `python -m utils.jd_library import jds.jsonl`.")
+        else:
+            jd_query = st.text_input("Search job descriptions", placeholder="e.g. python django kubernetes", key="jd_query")
+            hits = {hit['id']: hit for hit in jd_library.search(jd_query, limit=20)}
+            if hits:
+                picked = st.selectbox(
+                    f"Matches ({jd_library.count():,} in the library)",
+                    list(hits),
+                    format_func=lambda jd_id: hits[jd_id]['title'] + (f" @ {hits[jd_id]['company']}" if hits[jd_id]['company'] else ''),
+                    key="jd_pick"
+                )
+                st.caption(hits[picked]['snippet'])
+                st.button("📋 Use This Job Description", on_click=use_library_jd, args=(picked,))
+            else:
+                st.caption("No matching job descriptions.")
+    
     # Create a single form for ALL inputs
     with st.form("resume_form", clear_on_submit=False):
         
@@ -111,12 +294,19 @@ with tab1:
             height=120,
             key="form_jd"
         )
+        form_more_jds = st.text_area(
+            "More Job Descriptions (tailor to several jobs at once)",
+            placeholder="Paste more job descriptions, separated by a line containing only ---",
+            height=100,
+            key="form_more_jds"
+        )
         
         # Optional: Upload Resume
         form_resume = st.file_uploader(
             "📄 Upload Existing Resume (Optional)",
             type=['pdf', 'docx'],
-            key="form_resume"
+            key=f"form_resume_{st.session_state.upload_nonce}",
+            help=f"Max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
         )
         
         # Education
@@ -180,55 +370,154 @@ with tab1:
             st.error("⚠️ Please enter your Target Job Role!")
         else:
             try:
-                with st.spinner("🤖 AI is crafting your perfect resume... This may take 10-15 seconds."):
-                    
-                    # Parse uploaded resume if provided
-                    existing_data = None
-                    if form_resume:
-                        try:
-                            existing_data = parse_resume(form_resume)
-                        except Exception as e:
-                            st.warning(f"Could not parse uploaded resume: {e}")
-                    
-                    # Prepare input data
-                    input_data = {
-                        'full_name': form_name.strip(),
-                        'phone': form_phone.strip(),
-                        'email': form_email.strip(),
-                        'target_role': form_role.strip(),
-                        'education': form_education,
-                        'experience': form_experience,
-                        'projects': form_projects,
-                        'skills': form_skills,
-                        'certifications': form_certifications,
-                        'job_description': form_jd,
-                        'existing_data': existing_data
-                    }
-                    
-                    # Generate resume
-                    st.session_state.resume_data = generate_resume_content(input_data)
-                    
-                    # Calculate ATS score
-                    st.session_state.ats_score = calculate_ats_score(
-                        st.session_state.resume_data, 
-                        form_jd,
-                        form_role
-                    )
+                # Parse uploaded resume if provided
+                existing_data = None
+                if form_resume:
+                    try:
+                        existing_data = parse_resume(form_resume)
+                    except Exception as e:
+                        st.warning(f"Could not parse uploaded resume: {e}")
+                    finally:
+                        # Only the parsed text is needed from here on; release
+                        # the upload so its bytes don't live for the whole session
+                        form_resume.close()
+                        st.session_state.pop(f"form_resume_{st.session_state.upload_nonce}", None)
+                        st.session_state.upload_nonce += 1
+                
+                # Prepare input data
+                input_data = {
+                    'full_name': form_name.strip(),
+                    'phone': form_phone.strip(),
+                    'email': form_email.strip(),
+                    'target_role': form_role.strip(),
+                    'education': form_education,
+                    'experience': form_experience,
+                    'projects': form_projects,
+                    'skills': form_skills,
+                    'certifications': form_certifications,
+                    'job_description': form_jd,
+                    'existing_data': existing_data
+                }
+                
+                # Several JDs: generate the shared sections once and tailor
+                # the rest to each job
+                more_jds = [jd.strip() for jd in re.split(r'^\s*---\s*$', form_more_jds or '', flags=re.MULTILINE)]
+                more_jds = [jd for jd in more_jds if jd]
+                if more_jds:
+                    input_data['task'] = 'tailor'
+                    input_data['job_descriptions'] = ([form_jd.strip()] if form_jd and form_jd.strip() else []) + more_jds
                 
-                st.success("✅ Resume generated successfully!")
-                st.balloons()
+                # Generation and scoring run on the shared worker pool; this
+                # script thread only polls for the result
+                job_id = get_job_queue().submit(input_data) if more_jds else submit_generation(input_data)
+                # Kept so a degraded result can be upgraded without refilling the form
+                st.session_state.last_input_key = artifacts.store.put_json(input_data)
+                st.session_state.pending_tailor = bool(more_jds)
+                if job_id:
+                    st.session_state.job_id = job_id
+                    st.query_params['job'] = job_id
                 st.rerun()
                 
             except Exception as e:
                 st.error(f"❌ Error generating resume: {str(e)}")
                 st.error("Please check your inputs and try again.")
+    
+    @st.fragment(run_every=1.0)
+    def job_progress():
+        """Poll the pending job without rerunning the whole page"""
+        job = get_job_queue().get(st.session_state.job_id)
+        if job is None:
+            return
+        
+        if job['status'] == DONE:
+            load_job_result(job)
+            st.balloons()
+            st.rerun(scope="app")
+        elif job['status'] == FAILED:
+            st.session_state.job_error = job['error']
+            st.session_state.job_id = None
+            st.session_state.pending_section = None
+            st.session_state.pending_upgrade = False
+            st.query_params.pop('job', None)
+            st.rerun(scope="app")
+        elif job['provisional'] and st.session_state.provisional_job != job['id']:
+            load_provisional_result(job)
+            st.rerun(scope="app")
+        else:
+            waited = time.time() - job['created_at']
+            if job['status'] == QUEUED:
+                message = "⏳ Waiting for a free worker..."
+            elif st.session_state.pending_section:
+                message = f"🤖 AI is rewriting your {SECTION_HEADERS[st.session_state.pending_section].title()} section..."
+            elif st.session_state.pending_upgrade:
+                message = "🤖 AI is upgrading your quick resume..."
+            elif st.session_state.get('pending_tailor'):
+                message = "🤖 AI is tailoring your resume to each job..."
+            else:
+                message = "🤖 AI is crafting your perfect resume..."
+            st.info(f"{message} ({waited:.0f}s, usually 10-15 seconds)")
+    
+    job_pending = st.session_state.job_id and st.session_state.loaded_job != st.session_state.job_id
+    showing_provisional = job_pending and st.session_state.provisional_job == st.session_state.job_id
+    # Section rewrites, upgrades and provisional results show progress on the Results tab
+    pending_in_results = (st.session_state.pending_section or st.session_state.pending_upgrade
+                          or showing_provisional)
+    
+    if st.session_state.get('job_error'):
+        st.error(f"❌ Error generating resume: {st.session_state.pop('job_error')}")
+        st.error("Please check your inputs and try again.")
+    elif st.session_state.pop('served_degraded', False):
+        st.warning("⚡ The AI is busy, so a quick resume was built from your details. See the Results tab.")
+    elif showing_provisional:
+        st.success("⚡ A quick draft is ready in the Results tab. The AI version will replace it shortly.")
+    elif job_pending and not pending_in_results:
+        job_progress()
+    elif st.session_state.loaded_job:
+        st.success("✅ Resume generated successfully! See the Results tab.")
 
 # Display results in second tab
 with tab2:
-    if st.session_state.get('ats_score') and st.session_state.get('resume_data'):
+    if ats_score and resume_data:
+        
+        variants = artifacts.store.get_json(st.session_state.variants_key) if st.session_state.variants_key else None
+        if variants:
+            choice = st.selectbox(
+                "🎯 Resume tailored for",
+                range(len(variants)),
+                index=st.session_state.variant_index,
+                format_func=lambda i: f"{variants[i]['title']} ({variants[i]['ats_score']['score']}/100)",
+                key=f"variant_{st.session_state.loaded_job}"
+            )
+            if choice != st.session_state.variant_index:
+                variant = variants[choice]
+                show_result(variant['resume'], variant['ats_score'], variant['job_description'])
+                st.session_state.variant_index = choice
+                st.rerun()
+        
+        if showing_provisional:
+            st.info("⚡ This is a quick draft built from your details. "
+                    "The AI-written version will replace it when it's ready.")
+            job_progress()
+        # Built by the local fallback because the LLM was overloaded
+        elif resume_data.degraded:
+            st.warning("⚡ The AI was busy, so this is a quick resume built directly from your details. "
+                       "Upgrade it with AI once you're ready.")
+            if job_pending and st.session_state.pending_upgrade:
+                job_progress()
+            elif st.button("✨ Upgrade with AI", disabled=bool(job_pending) or not st.session_state.last_input_key):
+                last_input = artifacts.store.get_json(st.session_state.last_input_key)
+                if last_input is None:
+                    st.session_state.last_input_key = None
+                    st.rerun()
+                job_id = submit_generation(last_input)
+                if job_id:
+                    st.session_state.job_id = job_id
+                    st.session_state.pending_upgrade = True
+                    st.query_params['job'] = job_id
+                st.rerun()
         
         # Display ATS Score
-        score_data = st.session_state.ats_score
+        score_data = ats_score
         
         col_score1, col_score2, col_score3 = st.columns([1, 2, 1])
         
@@ -246,89 +535,229 @@ with tab2:
             </div>
             """, unsafe_allow_html=True)
         
+        # Change against the quick draft this result replaced
+        baseline = st.session_state.get('score_baseline')
+        if baseline:
+            change = score_data['score'] - baseline['score']
+            st.caption(f"🤖 AI version: {baseline['score']} → {score_data['score']} ({change:+d}) against the quick draft")
+        
+        def score_delta(name):
+            return score_data[name] - baseline[name] if baseline else None
+        
         st.markdown("---")
         
         # Score breakdown
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Skill Match", f"{score_data['skill_match']}/25")
+            st.metric("Skill Match", f"{score_data['skill_match']}/25", delta=score_delta('skill_match'))
             st.progress(score_data['skill_match']/25)
         
         with col2:
-            st.metric("Keywords", f"{score_data['keyword_relevance']}/25")
+            st.metric("Keywords", f"{score_data['keyword_relevance']}/25", delta=score_delta('keyword_relevance'))
             st.progress(score_data['keyword_relevance']/25)
         
         with col3:
-            st.metric("Role Alignment", f"{score_data['role_alignment']}/25")
+            st.metric("Role Alignment", f"{score_data['role_alignment']}/25", delta=score_delta('role_alignment'))
             st.progress(score_data['role_alignment']/25)
         
         with col4:
-            st.metric("Formatting", f"{score_data['formatting']}/25")
+            st.metric("Formatting", f"{score_data['formatting']}/25", delta=score_delta('formatting'))
             st.progress(score_data['formatting']/25)
         
+        if 'semantic_match' in score_data:
+            st.caption(f"🧠 Semantic match: {score_data['semantic_match']}/25 — credits related wording that "
+                       "exact keywords miss; not counted in the total")
+        
         # Recommendations
         st.subheader("💡 Recommendations")
         st.info(score_data['explanation'])
         
+        @st.fragment
+        def live_score_editor():
+            """Edit sections or the JD and watch the score update; reruns only this fragment"""
+            resume = resume_data
+            saved = ats_score
+            # Keys include the job so a new result resets the editor
+            suffix = st.session_state.loaded_job
+            
+            with st.expander("✏️ Edit & Re-score", expanded=False):
+                edits = {}
+                for key, label, height in (
+                    ('skills', "Skills", 80),
+                    ('summary', "Professional Summary", 100),
+                    ('experience', "Experience", 200),
+                    ('projects', "Projects", 160),
+                ):
+                    text = st.text_area(label, value=resume[key], height=height, key=f"live_{key}_{suffix}")
+                    if text != resume[key]:
+                        edits[key] = text
+                job_description = st.text_area(
+                    "Job Description",
+                    value=shown_job_description,
+                    height=120,
+                    key=f"live_jd_{suffix}"
+                )
+                
+                edited = ResumeDocument.from_dict({**resume.to_dict(), **edits}) if edits else resume
+                
+                # The scorer keeps JD features and per-section matches between
+                # reruns, so only components whose inputs changed are redone
+                if 'live_scorer' not in st.session_state:
+                    st.session_state.live_scorer = IncrementalScorer()
+                live = st.session_state.live_scorer.score(edited, job_description, resume['target_role'])
+                
+                cols = st.columns(5)
+                cols[0].metric("Live Score", f"{live['score']}/100", delta=live['score'] - saved['score'])
+                for col, (name, label) in zip(cols[1:], (
+                    ('skill_match', "Skill Match"),
+                    ('keyword_relevance', "Keywords"),
+                    ('role_alignment', "Role Alignment"),
+                    ('formatting', "Formatting"),
+                )):
+                    col.metric(label, f"{live[name]}/25", delta=live[name] - saved[name])
+                if 'semantic_match' in live:
+                    st.caption(f"🧠 Semantic match: {live['semantic_match']}/25")
+                
+                if st.button("💾 Apply Edits", disabled=not edits and job_description == shown_job_description):
+                    show_result(edited, live, job_description)
+                    st.session_state.score_baseline = None
+                    st.rerun(scope="app")
+        
+        live_score_editor()
+        
+        # Rewrite one section without regenerating the rest of the resume
+        st.subheader("🔄 Regenerate a Section")
+        col_section, col_feedback = st.columns([1, 2])
+        with col_section:
+            regen_section = st.selectbox(
+                "Section",
+                list(SECTION_HEADERS),
+                format_func=lambda key: SECTION_HEADERS[key].title(),
+                key="regen_section"
+            )
+        with col_feedback:
+            regen_feedback = st.text_input(
+                "What should change? (optional)",
+                placeholder="e.g., Focus more on backend projects",
+                key="regen_feedback"
+            )
+        
+        section_kept = st.session_state.pop('section_kept', None)
+        if section_kept:
+            st.warning(f"⚡ The AI couldn't rewrite your {SECTION_HEADERS[section_kept].title()} section "
+                       "right now, so it was kept as it was. Try again in a moment.")
+        
+        if job_pending and st.session_state.pending_section:
+            job_progress()
+        elif st.button("🔄 Regenerate Section", disabled=bool(job_pending)):
+            job_id = get_job_queue().submit({
+                'task': 'regenerate_section',
+                'resume': resume_data.to_dict(),
+                'section': regen_section,
+                'job_description': shown_job_description,
+                'feedback': regen_feedback,
+            })
+            st.session_state.job_id = job_id
+            st.session_state.pending_section = regen_section
+            st.query_params['job'] = job_id
+            st.rerun()
+        
         # Download buttons
         st.subheader("⬇️ Download Your Resume")
         
+        layout_names = list(LAYOUTS)
+        pdf_layout = st.selectbox(
+            "PDF Layout",
+            layout_names,
+            index=layout_names.index(DEFAULT_LAYOUT),
+            format_func=str.title,
+            key="pdf_layout"
+        )
+        
+        page_count = measure_pages(resume_data, pdf_layout)
+        fit_one_page = st.checkbox(
+            "Fit to one page",
+            key="fit_one_page",
+            help=f"Currently {page_count} page{'s' if page_count != 1 else ''} in this layout. "
+                 "Tightens spacing and type first, then trims the oldest roles and extra bullets."
+        )
+        max_pages = 1 if fit_one_page else None
+        
+        # Files are rendered when a button is clicked, then kept in the
+        # artifact store by resume and layout; the session never holds the bytes
+        resume_key = st.session_state.resume_key
+        file_stem = resume_data['name'].replace(' ', '_')
         col_dl1, col_dl2 = st.columns(2)
         
         with col_dl1:
-            pdf_file = create_pdf(st.session_state.resume_data)
             st.download_button(
                 label="📥 Download PDF",
-                data=pdf_file,
-                file_name=f"{st.session_state.resume_data['name'].replace(' ', '_')}_Resume.pdf",
+                data=lambda: artifacts.store.get_or_build(
+                    ('pdf', pdf_layout, max_pages, resume_key),
+                    lambda: create_pdf(resume_data, layout=pdf_layout, max_pages=max_pages)
+                ),
+                file_name=f"{file_stem}_Resume.pdf",
                 mime="application/pdf",
                 use_container_width=True
             )
         
         with col_dl2:
-            docx_file = create_docx(st.session_state.resume_data)
             st.download_button(
                 label="📥 Download DOCX",
-                data=docx_file,
-                file_name=f"{st.session_state.resume_data['name'].replace(' ', '_')}_Resume.docx",
+                data=lambda: artifacts.store.get_or_build(('docx', resume_key), lambda: create_docx(resume_data)),
+                file_name=f"{file_stem}_Resume.docx",
                 mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                 use_container_width=True
             )
         
+        if variants:
+            st.download_button(
+                label=f"📦 Download All {len(variants)} Variants (ZIP)",
+                data=lambda: artifacts.store.get_or_build(
+                    ('variants_zip', pdf_layout, st.session_state.variants_key),
+                    lambda: variants_zip(variants, layout=pdf_layout)
+                ),
+                file_name=f"{file_stem}_Resumes.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+        
         # Resume Preview
         st.markdown("---")
         st.subheader("👀 Resume Preview")
         
-        data = st.session_state.resume_data
+        data = resume_data
         
         st.markdown(f"# {data['name']}")
         st.markdown(f"📞 {data['phone']} | 📧 {data['email']}")
         st.markdown("---")
         
-        if data.get('summary'):
-            st.subheader("Professional Summary")
-            st.write(data['summary'])
-        
-        if data.get('skills'):
-            st.subheader("Skills")
-            st.write(data['skills'])
-        
-        if data.get('experience'):
-            st.subheader("Experience")
-            st.write(data['experience'])
-        
-        if data.get('projects'):
-            st.subheader("Projects")
-            st.write(data['projects'])
-        
-        if data.get('education'):
-            st.subheader("Education")
-            st.write(data['education'])
-        
-        if data.get('certifications'):
-            st.subheader("Certifications & Achievements")
-            st.write(data['certifications'])
+        # Sections come pre-parsed on the ResumeDocument, so the preview just
+        # walks the entries instead of re-splitting the raw strings
+        preview_titles = {
+            'summary': "Professional Summary",
+            'skills': "Skills",
+            'experience': "Experience",
+            'projects': "Projects",
+            'education': "Education",
+            'certifications': "Certifications & Achievements",
+        }
+        for key, title in preview_titles.items():
+            if not data.get(key):
+                continue
+            st.subheader(title)
+            if key == 'skills':
+                st.write(', '.join(data.skill_list))
+            elif key in data.entries:
+                for entry in data.entries[key]:
+                    lines = [f"**{entry.heading}**"] if entry.heading else []
+                    lines += entry.details
+                    st.markdown('  \n'.join(lines) + '\n' + ''.join(f"\n- {bullet}" for bullet in entry.bullets))
+            elif key == 'certifications':
+                st.markdown('\n'.join(f"- {line}" for line in data.lines[key]))
+            else:
+                st.markdown('  \n'.join(data.lines[key]))
     
     else:
         st.info("👈 Fill out the form in the 'Enter Details' tab and click 'Generate' to see your results here!")
@@ -340,4 +769,8 @@ st.markdown("""
     <p>Made with ❤️ for Sophyra Platform | AI Intern Qualification Task</p>
     <p>Built with Streamlit & OpenAI GPT-4</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+# Report this session's state size for the session_state_bytes gauges
+_ctx = get_script_run_ctx()
+if _ctx is not None:
+    artifacts.session_sizes.record(_ctx.session_id, session_state_bytes())
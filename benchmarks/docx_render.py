@@ -0,0 +1,55 @@
+"""
+DOCX render throughput: template-based writer vs python-docx.
+
+Usage:
+    python benchmarks/docx_render.py [--renders 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import pdf_generator
+from utils.ai_generator import format_basic_resume
+
+SAMPLE_INPUT = {
+    'full_name': 'Jordan Lee',
+    'email': 'jordan.lee@example.com',
+    'phone': '+1 234 567 8900',
+    'target_role': 'Software Engineer',
+    'skills': 'Python, Django, PostgreSQL, Docker',
+    'experience': 'Backend developer at Acme Corp building REST APIs for 3 years',
+}
+
+
+def renders_per_second(render, resume_data, renders):
+    started = time.perf_counter()
+    for _ in range(renders):
+        render(resume_data)
+    return renders / (time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark create_docx against the python-docx renderer")
+    parser.add_argument('--renders', type=int, default=200)
+    args = parser.parse_args(argv)
+    
+    resume_data = format_basic_resume(SAMPLE_INPUT)
+    
+    # Warm up imports and the cached template package
+    pdf_generator.create_docx(resume_data)
+    pdf_generator.create_docx_python_docx(resume_data)
+    
+    legacy = renders_per_second(pdf_generator.create_docx_python_docx, resume_data, args.renders)
+    fast = renders_per_second(pdf_generator.create_docx, resume_data, args.renders)
+    
+    print(f"📝 create_docx, {args.renders} renders")
+    print(f"  python-docx:     {legacy:8.1f} renders/s")
+    print(f"  template writer: {fast:8.1f} renders/s  ({fast / legacy:.1f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
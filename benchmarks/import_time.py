@@ -0,0 +1,108 @@
+"""
+Import-time budget check.
+
+Runs a fresh interpreter with ``python -X importtime`` importing the app's
+helper modules, parses the per-module timings and fails when the total
+exceeds the budget or when a heavy dependency gets imported eagerly again.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 50] [--runs 5] [--top 10]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What app startup and worker processes import
+STARTUP_IMPORTS = [
+    'utils',
+    'utils.ai_generator',
+    'utils.ats_scorer',
+    'utils.pdf_generator',
+    'utils.resume_parser',
+]
+
+# These must only be loaded on first use
+LAZY_MODULES = [
+    'google.generativeai',
+    'reportlab',
+    'pdfplumber',
+    'PyPDF2',
+    'docx',
+    'numpy',
+    # Pulled in by xml.sax.saxutils; escape markup without it
+    'urllib.request',
+]
+
+LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def measure_once(modules):
+    """Return [(module, self_us, cumulative_us, depth)] for one cold import"""
+    code = '; '.join(f'import {m}' for m in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    
+    timings = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def summarize(timings):
+    """Total cumulative time of the top-level utils imports, in ms"""
+    return sum(
+        cumulative for name, _, cumulative, depth in timings
+        if depth == 0 and (name == 'utils' or name.startswith('utils.'))
+    ) / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure and enforce the app import-time budget")
+    parser.add_argument('--budget-ms', type=float, default=50.0, help="Fail if median import time exceeds this")
+    parser.add_argument('--runs', type=int, default=5, help="Cold imports to measure")
+    parser.add_argument('--top', type=int, default=10, help="Slowest modules to list")
+    args = parser.parse_args(argv)
+    
+    totals = []
+    timings = []
+    for _ in range(args.runs):
+        timings = measure_once(STARTUP_IMPORTS)
+        totals.append(summarize(timings))
+    totals.sort()
+    median = totals[len(totals) // 2]
+    
+    print(f"⏱️ Startup imports: median {median:.1f} ms over {args.runs} runs (min {totals[0]:.1f}, max {totals[-1]:.1f})")
+    print("Slowest modules (self time, last run):")
+    for name, self_us, _, _ in sorted(timings, key=lambda t: t[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.2f} ms  {name}")
+    
+    failures = []
+    imported = {name for name, _, _, _ in timings}
+    for module in LAZY_MODULES:
+        eager = [name for name in imported if name == module or name.startswith(module + '.')]
+        if eager:
+            failures.append(f"{module} is imported at startup")
+    
+    if median > args.budget_ms:
+        failures.append(f"median {median:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+    
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    
+    print("✅ Import-time budget met")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Concurrent-session load test for the Streamlit app.
+
+Drives N simulated users through the real form flow in app.py with
+streamlit.testing's AppTest: open the page, fill in the form, submit, poll
+until the background job finishes, then render the Results tab. Generation
+uses the offline stub model with a configurable latency, so the run needs
+no API key and measures the app rather than Gemini.
+
+Usage:
+    python benchmarks/load_test.py --sessions 20 --llm-latency-ms 3000 [-o load.json]
+
+AppTest keeps one process-wide runtime, so script runs are serialized
+through a lock. That matches how one server process behaves under load,
+since reruns are CPU-bound and share the GIL: each rerun is reported as
+its run time (the cost of the rerun) and its wait time (queueing behind
+other sessions' reruns). Growing wait times as sessions increase show
+where a single process saturates. Polls rerun the whole script, where the
+real app reruns only the progress fragment, so poll costs are an upper
+bound.
+
+Per-session memory is the growth in process RSS while all sessions are
+alive, divided by the number of sessions, plus the pickled size of each
+session's state (results themselves live in the artifact store).
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def configure_env(args):
+    """Must run before streamlit or utils are imported"""
+    os.environ['RESUME_LLM_BACKEND'] = 'stub'
+    os.environ['RESUME_STUB_LATENCY_MS'] = str(args.llm_latency_ms)
+    os.environ['RESUME_STUB_TTFB_MS'] = str(min(args.llm_latency_ms, args.llm_ttfb_ms))
+    os.environ['RESUME_LLM_CONCURRENCY'] = str(args.llm_concurrency)
+    os.environ.setdefault('RESUME_LOG_LEVEL', 'WARNING')
+    # A fresh job database, so earlier runs' jobs aren't picked up
+    os.environ['RESUME_DATA_DIR'] = tempfile.mkdtemp(prefix='resume-load-')
+
+
+def rss_bytes():
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        # Peak rather than current, but the best available off Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentiles(values, unit='ms'):
+    """Summary of durations given in seconds, reported in ms or s"""
+    if not values:
+        return {}
+    values = sorted(values)
+    scale = 1000 if unit == 'ms' else 1
+
+    def pick(p):
+        return round(values[min(int(p / 100 * len(values)), len(values) - 1)] * scale, 1)
+
+    return {'count': len(values), **{f'{name}_{unit}': pick(p) for name, p in
+                                     (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100))}}
+
+
+class Session:
+    """One simulated user walking through the form flow"""
+
+    def __init__(self, index, runner_lock, args):
+        self.index = index
+        self.lock = runner_lock
+        self.args = args
+        self.reruns = []  # (kind, wait seconds, run seconds)
+        self.error = None
+        self.app = None
+        self.finished = None
+
+    def rerun(self, kind, action):
+        queued = time.perf_counter()
+        with self.lock:
+            started = time.perf_counter()
+            action()
+            self.reruns.append((kind, started - queued, time.perf_counter() - started))
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].value)
+
+    def run(self):
+        from streamlit.testing.v1 import AppTest
+
+        try:
+            self.app = AppTest.from_file(os.path.join(APP_DIR, 'app.py'), default_timeout=self.args.timeout)
+            self.rerun('open', self.app.run)
+            time.sleep(self.args.think_ms / 1000)
+
+            self.app.text_input(key='form_name').input(f'Load Test User {self.index}')
+            self.app.text_input(key='form_email').input(f'user{self.index}@example.com')
+            self.app.text_input(key='form_phone').input('+1 555 010 0000')
+            self.app.text_input(key='form_role').input('Software Engineer')
+            self.app.text_input(key='form_skills').input('Python, SQL, Docker, React')
+            self.app.text_area(key='form_experience').input('Backend developer at Acme Corp building REST APIs')
+            self.app.text_area(key='form_jd').input('Python developer with SQL, Docker and REST API experience')
+            self.rerun('submit', self.app.button[0].click().run)
+
+            deadline = time.monotonic() + self.args.timeout
+            while self.app.session_state['loaded_job'] is None:
+                if time.monotonic() > deadline:
+                    raise TimeoutError('job did not finish in time')
+                time.sleep(self.args.poll_interval)
+                self.rerun('poll', self.app.run)
+
+            self.rerun('results', self.app.run)
+            self.finished = time.perf_counter()
+        except Exception as e:
+            self.error = f'{type(e).__name__}: {e}'
+
+    def state_bytes(self):
+        """Pickled size of the session's state, as app.py reports it"""
+        total = 0
+        for value in self.app.session_state.to_dict().values():
+            try:
+                total += len(pickle.dumps(value))
+            except Exception:
+                pass
+        return total
+
+
+def run_load(args):
+    # AppTest builds elements outside a script run while setting up; its
+    # "missing ScriptRunContext" warnings are expected here. Streamlit resets
+    # its loggers' levels when it loads config, so filter instead.
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(
+        lambda record: 'missing ScriptRunContext' not in record.getMessage()
+    )
+    runner_lock = threading.Lock()
+
+    # One session first, to pay import and cache warm-up costs outside the run
+    warmup = Session(-1, runner_lock, args)
+    warmup.run()
+    if warmup.error:
+        raise RuntimeError(f'Warm-up session failed: {warmup.error}')
+    rss_before = rss_bytes()
+
+    sessions = [Session(i, runner_lock, args) for i in range(args.sessions)]
+    threads = [threading.Thread(target=s.run, name=f'session-{s.index}') for s in sessions]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+        time.sleep(args.ramp_seconds / max(args.sessions, 1))
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    rss_after = rss_bytes()
+
+    completed = [s for s in sessions if s.error is None]
+    reruns = [r for s in sessions for r in s.reruns]
+    report = {
+        'sessions': args.sessions,
+        'completed': len(completed),
+        'errors': [s.error for s in sessions if s.error],
+        'llm_latency_ms': args.llm_latency_ms,
+        'llm_concurrency': args.llm_concurrency,
+        'elapsed_seconds': round(elapsed, 2),
+        'sessions_per_second': round(len(completed) / elapsed, 3),
+        'reruns_per_second': round(len(reruns) / elapsed, 2),
+        'session_seconds': percentiles([s.finished - started for s in completed], unit='s'),
+        'rerun_run': {kind: percentiles([r[2] for r in reruns if r[0] == kind])
+                      for kind in ('open', 'submit', 'poll', 'results')},
+        'rerun_wait': percentiles([r[1] for r in reruns]),
+        'rss_per_session_kib': round((rss_after - rss_before) / max(args.sessions, 1) / 1024, 1),
+        'state_per_session_kib': round(
+            sum(s.state_bytes() for s in completed) / max(len(completed), 1) / 1024, 1
+        ),
+    }
+    return report
+
+
+def print_report(report):
+    print(f"👥 {report['completed']}/{report['sessions']} sessions in {report['elapsed_seconds']}s "
+          f"(LLM latency {report['llm_latency_ms']} ms, concurrency {report['llm_concurrency']})")
+    print(f"  throughput: {report['sessions_per_second']} sessions/s, {report['reruns_per_second']} reruns/s")
+    print(f"  {'rerun':<10} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    rows = dict(report['rerun_run'], wait=report['rerun_wait'])
+    for kind, stats in rows.items():
+        if stats:
+            print(f"  {kind:<10} {stats['count']:6d} {stats['p50_ms']:9.1f} {stats['p90_ms']:9.1f} "
+                  f"{stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}")
+    print(f"  memory: {report['rss_per_session_kib']} KiB RSS and "
+          f"{report['state_per_session_kib']} KiB session state per session")
+    if report['session_seconds']:
+        print(f"  time to result: p50 {report['session_seconds']['p50_s']}s, "
+              f"p90 {report['session_seconds']['p90_s']}s")
+    for error in report['errors']:
+        print(f"  ❌ {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent sessions through app.py")
+    parser.add_argument('--sessions', type=int, default=10)
+    parser.add_argument('--ramp-seconds', type=float, default=0.0, help="Spread session starts over this long")
+    parser.add_argument('--llm-latency-ms', type=float, default=2000)
+    parser.add_argument('--llm-ttfb-ms', type=float, default=500)
+    parser.add_argument('--llm-concurrency', type=int, default=4, help="RESUME_LLM_CONCURRENCY for the job queue")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between progress polls")
+    parser.add_argument('--think-ms', type=float, default=0, help="Pause between opening the page and submitting")
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('-o', '--output', help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    configure_env(args)
+    sys.path.insert(0, APP_DIR)
+
+    report = run_load(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
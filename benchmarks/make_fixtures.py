@@ -0,0 +1,63 @@
+"""
+Regenerate the fixture resumes in benchmarks/fixtures/resumes/.
+
+Each profile in fixtures/profiles.jsonl is generated with the offline stub
+model and rendered to PDF and DOCX; the last profile is also rendered with
+its experience and projects repeated to give a multi-page resume. The
+output is checked in so benchmark runs parse identical files.
+
+Usage:
+    python benchmarks/make_fixtures.py
+"""
+import json
+import os
+import sys
+
+os.environ['RESUME_LLM_BACKEND'] = 'stub'
+os.environ.setdefault('RESUME_LOG_LEVEL', 'WARNING')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+
+from utils.ai_generator import generate_resume_content
+from utils.pdf_generator import create_pdf, create_docx
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Repeat entry sections this many times for the multi-page variant
+LONG_REPEAT = 4
+
+
+def load_profiles():
+    with open(os.path.join(FIXTURES, 'profiles.jsonl'), encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_resume(name, resume):
+    for fmt, render in (('pdf', create_pdf), ('docx', create_docx)):
+        path = os.path.join(FIXTURES, 'resumes', f'{name}.{fmt}')
+        with open(path, 'wb') as f:
+            f.write(render(resume))
+        print(f"  {path} ({os.path.getsize(path) / 1024:.1f} KiB)")
+
+
+def main():
+    # Leave out creation dates and random IDs so rebuilt PDFs are identical
+    rl_config.invariant = 1
+    os.makedirs(os.path.join(FIXTURES, 'resumes'), exist_ok=True)
+
+    profiles = load_profiles()
+    resume = None
+    for profile in profiles:
+        resume = generate_resume_content(profile)
+        write_resume(profile['id'], resume)
+
+    for key in ('experience', 'projects'):
+        resume = resume.with_section(key, '\n\n'.join([resume[key]] * LONG_REPEAT))
+    write_resume(profiles[-1]['id'] + '-long', resume)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+PDF render throughput with and without the cached layout templates.
+
+"cold" clears the template registry before every render, which is the
+per-call style/heading setup create_pdf used to do; "warm" reuses the
+process-wide templates. "measure" is the page-count preflight
+(measure_pages) that create_pdf(max_pages=...) runs instead of trial builds.
+
+Usage:
+    python benchmarks/pdf_render.py [--renders 200] [--layout classic]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import pdf_generator
+from utils.ai_generator import format_basic_resume
+
+SAMPLE_INPUT = {
+    'full_name': 'Jordan Lee',
+    'email': 'jordan.lee@example.com',
+    'phone': '+1 234 567 8900',
+    'target_role': 'Software Engineer',
+    'skills': 'Python, Django, PostgreSQL, Docker',
+    'experience': 'Backend developer at Acme Corp building REST APIs for 3 years',
+}
+
+
+def renders_per_second(resume_data, layout, renders, cold):
+    started = time.perf_counter()
+    for _ in range(renders):
+        if cold:
+            pdf_generator._templates.clear()
+        pdf_generator.create_pdf(resume_data, layout=layout)
+    return renders / (time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark create_pdf with cold vs cached templates")
+    parser.add_argument('--renders', type=int, default=200)
+    parser.add_argument('--layout', default=pdf_generator.DEFAULT_LAYOUT, choices=sorted(pdf_generator.LAYOUTS))
+    args = parser.parse_args(argv)
+    
+    resume_data = format_basic_resume(SAMPLE_INPUT)
+    pdf_generator.create_pdf(resume_data, layout=args.layout)  # Warm up imports and font metrics
+    
+    cold = renders_per_second(resume_data, args.layout, args.renders, cold=True)
+    warm = renders_per_second(resume_data, args.layout, args.renders, cold=False)
+    
+    started = time.perf_counter()
+    for _ in range(args.renders):
+        pdf_generator.PdfTemplate(args.layout, pdf_generator.LAYOUTS[args.layout])
+    setup_ms = (time.perf_counter() - started) / args.renders * 1000
+    
+    started = time.perf_counter()
+    for _ in range(args.renders):
+        pdf_generator.measure_pages(resume_data, layout=args.layout)
+    measure = args.renders / (time.perf_counter() - started)
+    
+    print(f"📄 create_pdf layout={args.layout}, {args.renders} renders")
+    print(f"  template setup: {setup_ms:8.2f} ms (now paid once per process)")
+    print(f"  cold templates: {cold:8.1f} renders/s")
+    print(f"  cached:         {warm:8.1f} renders/s  ({warm / cold:.2f}x)")
+    print(f"  measure_pages:  {measure:8.1f} measures/s ({measure / warm:.2f}x a render)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
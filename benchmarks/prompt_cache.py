@@ -0,0 +1,88 @@
+"""
+Input tokens and time to first token with and without the static resume
+instructions sent as a reusable system instruction.
+
+"single" sends create_resume_prompt() (instructions and candidate fields
+in one prompt) on every call; "system" sends create_resume_request() with
+RESUME_SYSTEM_INSTRUCTION as the system instruction, which the stub model
+treats as cached from the second call on, like a provider's context cache.
+TTFB is modelled as a fixed delay plus a prefill cost per uncached token.
+
+Usage:
+    python benchmarks/prompt_cache.py [--calls 30] [--ttfb-ms 50] [--prefill-ms-per-1k 100]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('RESUME_LOG_LEVEL', 'WARNING')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import llm_stub
+from utils.ai_generator import RESUME_SYSTEM_INSTRUCTION, create_resume_prompt, create_resume_request
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_inputs():
+    with open(os.path.join(FIXTURES, 'profiles.jsonl'), encoding='utf-8') as f:
+        profiles = [json.loads(line) for line in f if line.strip()]
+    with open(os.path.join(FIXTURES, 'jds', 'medium.txt'), encoding='utf-8') as f:
+        job_description = f.read()
+    return [{**profile, 'job_description': job_description} for profile in profiles]
+
+
+def run(mode, inputs, calls, ttfb):
+    """[(input tokens, cached tokens, ttfb seconds)] for `calls` calls"""
+    samples = []
+    for n in range(calls):
+        data = inputs[n % len(inputs)]
+        if mode == 'single':
+            prompt, system = create_resume_prompt(data), None
+        else:
+            prompt, system = create_resume_request(data), RESUME_SYSTEM_INSTRUCTION
+        usage = {}
+        started = time.perf_counter()
+        stream = llm_stub.stream_response(prompt, system=system, ttfb=ttfb, latency=ttfb, usage=usage)
+        next(stream)
+        samples.append((usage['input_tokens'], usage['cached_input_tokens'], time.perf_counter() - started))
+        for _ in stream:
+            pass
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare one-prompt and system-instruction generation requests")
+    parser.add_argument('--calls', type=int, default=30)
+    parser.add_argument('--ttfb-ms', type=float, default=50.0, help="Fixed delay before the first token")
+    parser.add_argument('--prefill-ms-per-1k', type=float, default=100.0, help="Delay per 1,000 uncached input tokens")
+    args = parser.parse_args(argv)
+
+    llm_stub.PREFILL_SECONDS_PER_TOKEN = args.prefill_ms_per_1k / 1000 / 1000
+    inputs = load_inputs()
+    print(f"🧾 {args.calls} resume generations, system instruction ~{llm_stub.estimate_tokens(RESUME_SYSTEM_INSTRUCTION)} tokens")
+    print(f"  {'mode':<8}{'input tok':>11}{'cached':>9}{'uncached':>10}{'ttfb p50 ms':>13}")
+
+    results = {}
+    for mode in ('single', 'system'):
+        samples = run(mode, inputs, args.calls, args.ttfb_ms / 1000)
+        results[mode] = {
+            'input': statistics.mean(s[0] for s in samples),
+            'cached': statistics.mean(s[1] for s in samples),
+            'ttfb': statistics.median(s[2] for s in samples) * 1000,
+        }
+        r = results[mode]
+        print(f"  {mode:<8}{r['input']:>11.0f}{r['cached']:>9.0f}{r['input'] - r['cached']:>10.0f}{r['ttfb']:>13.1f}")
+
+    single, system = results['single'], results['system']
+    saved = 1 - (system['input'] - system['cached']) / single['input']
+    print(f"  uncached input tokens -{saved:.0%}, ttfb {single['ttfb']:.0f} -> {system['ttfb']:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Benchmark suite for the resume pipeline's hot functions.
+
+Runs parse_resume, parse_ai_response, format_basic_resume,
+calculate_ats_score, generate_resume_content (against the offline stub
+model), create_pdf and create_docx on the checked-in fixtures, and reports
+latency percentiles, throughput and peak traced memory per case.
+
+Usage:
+    python benchmarks/run.py [-k FILTER] [--max-seconds 2] [-o results.json]
+    python benchmarks/run.py --compare baseline.json [--threshold 0.2]
+
+With --compare, cases whose p50 latency or peak memory grew by more than
+the threshold against the baseline are flagged and the exit status is 1.
+Baselines are machine-specific; record one with -o on the machine that runs
+the comparison.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ['RESUME_LLM_BACKEND'] = 'stub'
+os.environ.setdefault('RESUME_LOG_LEVEL', 'WARNING')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ai_generator import create_resume_prompt, format_basic_resume, generate_resume_content, parse_ai_response
+from utils.ats_scorer import calculate_ats_score
+from utils.llm_stub import build_response
+from utils.pdf_generator import create_pdf, create_docx
+from utils.resume_parser import parse_resume
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Differences below this are treated as timer noise, whatever the ratio
+NOISE_FLOOR_MS = 0.05
+
+
+def load_fixtures():
+    with open(os.path.join(FIXTURES, 'profiles.jsonl'), encoding='utf-8') as f:
+        profiles = [json.loads(line) for line in f if line.strip()]
+
+    jds = {}
+    for name in sorted(os.listdir(os.path.join(FIXTURES, 'jds'))):
+        with open(os.path.join(FIXTURES, 'jds', name), encoding='utf-8') as f:
+            jds[os.path.splitext(name)[0]] = f.read()
+
+    files = {}
+    for name in sorted(os.listdir(os.path.join(FIXTURES, 'resumes'))):
+        with open(os.path.join(FIXTURES, 'resumes', name), 'rb') as f:
+            files[name] = f.read()
+    return profiles, jds, files
+
+
+def upload(name, data):
+    stream = io.BytesIO(data)
+    stream.name = name
+    return stream
+
+
+def build_cases():
+    """Ordered {case name: zero-argument callable}"""
+    profiles, jds, files = load_fixtures()
+    cases = {}
+
+    for name, data in files.items():
+        cases[f'parse_resume[{name}]'] = lambda name=name, data=data: parse_resume(upload(name, data))
+
+    resumes = {}
+    for profile in profiles:
+        pid = profile['id']
+        response = build_response(create_resume_prompt(profile))
+        cases[f'parse_ai_response[{pid}]'] = lambda r=response, p=profile: parse_ai_response(r, p)
+        cases[f'format_basic_resume[{pid}]'] = lambda p=profile: format_basic_resume(p)
+        cases[f'generate_resume_content[{pid}]'] = lambda p=profile: generate_resume_content(p)
+        resumes[pid] = generate_resume_content(profile)
+
+    scored = resumes['mid']
+    for jd_name, jd in jds.items():
+        cases[f'calculate_ats_score[mid,{jd_name}]'] = lambda jd=jd: calculate_ats_score(scored, jd, scored.target_role)
+
+    for pid, resume in resumes.items():
+        cases[f'create_pdf[{pid}]'] = lambda r=resume: create_pdf(r)
+        cases[f'create_docx[{pid}]'] = lambda r=resume: create_docx(r)
+
+    return cases
+
+
+def measure(fn, max_seconds, min_iterations, max_iterations, warmup):
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    deadline = time.perf_counter() + max_seconds
+    started = time.perf_counter()
+    while len(timings) < max_iterations:
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+        if len(timings) >= min_iterations and time.perf_counter() > deadline:
+            break
+    elapsed = time.perf_counter() - started
+
+    # Memory is measured on a separate call; tracing would skew the timings
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+
+    def percentile(p):
+        return timings[min(int(p / 100 * len(timings)), len(timings) - 1)] * 1000
+
+    return {
+        'iterations': len(timings),
+        'mean_ms': round(statistics.fmean(timings) * 1000, 4),
+        'p50_ms': round(percentile(50), 4),
+        'p90_ms': round(percentile(90), 4),
+        'p99_ms': round(percentile(99), 4),
+        'ops_per_second': round(len(timings) / elapsed, 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Rows of (case, metric, baseline, current, change) that regressed"""
+    regressions = []
+    for case, current in results.items():
+        before = baseline.get(case)
+        if before is None:
+            continue
+        p50, base_p50 = current['p50_ms'], before['p50_ms']
+        if p50 - base_p50 > NOISE_FLOOR_MS and p50 > base_p50 * (1 + threshold):
+            regressions.append((case, 'p50_ms', base_p50, p50, p50 / base_p50 - 1))
+        peak, base_peak = current['peak_kib'], before['peak_kib']
+        if base_peak and peak > base_peak * (1 + memory_threshold):
+            regressions.append((case, 'peak_kib', base_peak, peak, peak / base_peak - 1))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume pipeline on the checked-in fixtures")
+    parser.add_argument('-k', '--filter', default='', help="Only run cases whose name contains this text")
+    parser.add_argument('--max-seconds', type=float, default=2.0, help="Time budget per case")
+    parser.add_argument('--min-iterations', type=int, default=5)
+    parser.add_argument('--max-iterations', type=int, default=1000)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('-o', '--output', help="Write results as JSON to this path")
+    parser.add_argument('--compare', metavar='BASELINE', help="Flag regressions against a saved results file")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed p50 slowdown (0.2 = 20%%)")
+    parser.add_argument('--memory-threshold', type=float, default=0.2, help="Allowed peak memory growth")
+    args = parser.parse_args(argv)
+
+    cases = {name: fn for name, fn in build_cases().items() if args.filter in name}
+    if not cases:
+        print(f"No cases match '{args.filter}'", file=sys.stderr)
+        return 2
+
+    results = {}
+    print(f"{'case':<42} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'peak KiB':>9}")
+    for name, fn in cases.items():
+        result = results[name] = measure(fn, args.max_seconds, args.min_iterations, args.max_iterations, args.warmup)
+        print(f"{name:<42} {result['p50_ms']:9.3f} {result['p90_ms']:9.3f} {result['p99_ms']:9.3f} "
+              f"{result['ops_per_second']:9.1f} {result['peak_kib']:9.1f}")
+
+    if args.output:
+        report = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        missing = sorted(set(results) - set(baseline))
+        if missing:
+            print(f"\nℹ️ Not in baseline: {', '.join(missing)}")
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.compare}")
+            for case, metric, before, after, change in regressions:
+                print(f"  {case:<42} {metric:<9} {before:10.3f} -> {after:10.3f}  (+{change:.0%})")
+            return 1
+        print(f"\n✅ No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Offline test setup: the stub LLM backend and a throwaway data directory,
+set before any utils module reads its environment.
+"""
+import os
+import sys
+import tempfile
+
+os.environ['RESUME_LLM_BACKEND'] = 'stub'
+os.environ['RESUME_LOG_LEVEL'] = 'WARNING'
+os.environ['RESUME_DATA_DIR'] = tempfile.mkdtemp(prefix='resume-tests-')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
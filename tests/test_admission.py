@@ -0,0 +1,76 @@
+import json
+import time
+
+import pytest
+
+from utils import admission
+from utils.ai_generator import generate_resume_content
+from utils.jobs import DONE, JobQueue
+from utils.pipeline import admit_generation, run_job
+
+PROFILE = {
+    'full_name': 'Ann Lee', 'email': 'ann@example.com', 'phone': '555 0100',
+    'target_role': 'Data Analyst', 'skills': 'Python, SQL',
+}
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    """A fresh controller allowing one LLM request in flight"""
+    fresh = admission.AdmissionController(max_in_flight=1, max_queue=0, max_p95=0)
+    monkeypatch.setattr(admission, 'controller', fresh)
+    return fresh
+
+
+def wait_done(queue, job_id):
+    for _ in range(200):
+        job = queue.get(job_id)
+        if job['status'] == DONE:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_client_admitted_flag_is_ignored(controller):
+    held, _ = controller.admit()
+
+    resume = generate_resume_content({**PROFILE, 'admitted': True})
+
+    assert resume.degraded
+    assert controller.in_flight == 1
+    assert controller.shed == 1
+    held.release()
+    assert controller.in_flight == 0
+
+
+def test_slot_release_is_idempotent(controller):
+    slot, reason = controller.admit()
+    assert reason is None
+    slot.release()
+    slot.release()
+    assert controller.in_flight == 0
+    assert controller.admit()[1] is None
+
+
+def test_admit_generation_sheds_before_queueing(controller):
+    held, _ = controller.admit()
+    slot, shed = admit_generation(PROFILE)
+    assert slot is None
+    assert shed['resume']['degraded']
+    held.release()
+
+
+def test_queued_job_releases_its_slot_and_does_not_store_it(controller, tmp_path):
+    queue = JobQueue(run_job, db_path=str(tmp_path / 'jobs.sqlite3'), max_workers=1)
+    try:
+        slot, shed = admit_generation(PROFILE)
+        assert shed is None and controller.in_flight == 1
+
+        job = wait_done(queue, queue.submit(PROFILE, slot=slot))
+
+        assert not job['result']['resume']['degraded']
+        assert controller.in_flight == 0
+        stored = queue._execute('SELECT payload FROM jobs WHERE id = ?', (job['id'],)).fetchone()[0]
+        assert json.loads(stored) == PROFILE
+    finally:
+        queue.shutdown()
@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+import pytest
+
+import api
+
+PROFILE = {'full_name': 'Ann Lee', 'email': 'ann@example.com', 'phone': '555 0100', 'target_role': 'Data Analyst'}
+RESUME = {'name': 'Ann Lee', 'summary': 'Data analyst.', 'skills': 'Python, SQL'}
+
+
+class JSONRequest:
+    """Just enough of a starlette Request for handlers that reject a body"""
+
+    def __init__(self, body):
+        self._body = body
+        self.query_params = {}
+
+    async def json(self):
+        return self._body
+
+
+def call(handler, body):
+    response = asyncio.run(handler(JSONRequest(body)))
+    return response.status_code, json.loads(response.body)
+
+
+@pytest.mark.parametrize('handler, body, field', [
+    (api.generate, {**PROFILE, 'job_description': 5}, 'job_description'),
+    (api.generate, {**PROFILE, 'target_role': ['Analyst']}, 'target_role'),
+    (api.generate, {**PROFILE, 'skills': {'python': True}}, 'skills'),
+    (api.tailor, {**PROFILE, 'experience': 3, 'job_descriptions': ['SQL']}, 'experience'),
+    (api.score, {'resume': RESUME, 'job_description': 123}, 'job_description'),
+    (api.score, {'resume': RESUME, 'target_role': 7}, 'target_role'),
+    (api.regenerate, {'resume': RESUME, 'section': 'summary', 'feedback': 1}, 'feedback'),
+])
+def test_non_string_text_field_is_a_400_naming_the_field(handler, body, field):
+    status, payload = call(handler, body)
+    assert status == 400
+    assert f"'{field}'" in payload['error']
+
+
+def test_null_text_fields_are_allowed():
+    assert api.check_text_fields({**PROFILE, 'job_description': None}, api.TEXT_FIELDS) is None
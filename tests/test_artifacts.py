@@ -0,0 +1,46 @@
+import os
+import time
+
+from utils.artifacts import ArtifactStore
+
+
+def age(store, key, seconds):
+    """Backdate a stored file, moving it back in LRU order"""
+    when = time.time() - seconds
+    os.utime(os.path.join(store.root, key), (when, when))
+
+
+def test_round_trip_and_dedupe(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=10_000)
+    key = store.put_json({'b': 1, 'a': [1, 2]})
+    assert store.put_json({'a': [1, 2], 'b': 1}) == key
+    assert store.get_json(key) == {'a': [1, 2], 'b': 1}
+    assert store.get('0' * 64) is None
+
+
+def test_evicts_least_recently_used_past_the_limit(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=250)
+    oldest = store.put(b'a' * 100)
+    read = store.put(b'b' * 100)
+    age(store, oldest, 300)
+    age(store, read, 200)
+    assert store.get(read) is not None  # a read refreshes its LRU position
+    newest = store.put(b'c' * 100)
+    assert store.get(oldest) is None
+    assert store.get(read) is not None and store.get(newest) is not None
+    assert store.evicted == 1 and store.total_bytes == 200
+
+
+def test_get_or_build_builds_once_and_reopens_with_sizes(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=10_000)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return b'%PDF-fake'
+
+    inputs = {'resume': 'abc', 'layout': 'classic'}
+    assert store.get_or_build(inputs, build) == b'%PDF-fake'
+    assert store.get_or_build(inputs, build) == b'%PDF-fake'
+    assert len(calls) == 1
+    assert ArtifactStore(str(tmp_path)).total_bytes == store.total_bytes == len(b'%PDF-fake')
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+from utils.ats_scorer import IncrementalScorer, calculate_ats_score
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'benchmarks' / 'fixtures'
+JDS = [(FIXTURES / 'jds' / name).read_text() for name in ('short.txt', 'medium.txt', 'long.txt')]
+
+
+def load_profiles():
+    with open(FIXTURES / 'profiles.jsonl') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def as_resume(profile):
+    return {
+        'name': profile.get('full_name', ''),
+        'email': profile.get('email', ''),
+        'phone': profile.get('phone', ''),
+        'summary': profile.get('summary', ''),
+        'skills': profile.get('skills', ''),
+        'experience': profile.get('experience', ''),
+        'projects': profile.get('projects', ''),
+        'education': profile.get('education', ''),
+    }
+
+
+def test_incremental_scorer_matches_full_scoring_across_edits():
+    for profile in load_profiles():
+        scorer = IncrementalScorer()
+        resume = as_resume(profile)
+        role = profile.get('target_role', '')
+        edits = [
+            {},
+            {'skills': resume['skills'] + ', Kubernetes'},
+            {'summary': 'Analyst who ships reliable data pipelines.'},
+            {'experience': ''},
+        ]
+        for jd in JDS + ['']:
+            for edit in edits:
+                resume.update(edit)
+                assert scorer.score(resume, jd, role) == calculate_ats_score(resume, jd, role)
+
+
+def test_bulleted_skills_score_like_a_comma_list():
+    jd = JDS[1]
+    plain = {'skills': 'Python, SQL, Docker'}
+    bulleted = {'skills': '• Python\n• SQL\n- Docker'}
+    assert (calculate_ats_score(bulleted, jd, 'Data Analyst')['skill_match']
+            == calculate_ats_score(plain, jd, 'Data Analyst')['skill_match'])
@@ -0,0 +1,26 @@
+import json
+import zipfile
+
+from utils.batch_render import read_jsonl, render_batch
+
+RESUME = {'name': 'Ann Lee', 'email': 'ann@example.com', 'phone': '555 0100', 'summary': 'Data analyst.'}
+
+
+def test_bad_line_is_recorded_and_the_rest_rendered(tmp_path):
+    source = tmp_path / 'resumes.jsonl'
+    source.write_text(
+        json.dumps(RESUME) + '\n' + '{"name": "broken\n' + '[1, 2]\n' + json.dumps({**RESUME, 'name': 'Bo Kim'}) + '\n',
+        encoding='utf-8'
+    )
+    output = tmp_path / 'out.zip'
+
+    stats = render_batch(read_jsonl(str(source)), str(output), formats=('docx',), workers=1)
+
+    assert stats['rendered'] == 2
+    assert stats['failed'] == 2
+    with zipfile.ZipFile(output) as archive:
+        names = set(archive.namelist())
+        errors = [json.loads(line) for line in archive.read('errors.jsonl').decode().splitlines()]
+    assert names == {'00000_Ann_Lee_Resume.docx', '00003_Bo_Kim_Resume.docx', 'errors.jsonl'}
+    assert [e['index'] for e in sorted(errors, key=lambda e: e['index'])] == [1, 2]
+    assert 'line 2' in errors[0]['error']
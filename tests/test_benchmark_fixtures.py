@@ -0,0 +1,39 @@
+import io
+import json
+from pathlib import Path
+
+from utils.ai_generator import generate_resume_content
+from utils.resume_model import parse_skills
+from utils.resume_parser import parse_resume
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'benchmarks' / 'fixtures'
+
+
+def load_profiles():
+    with open(FIXTURES / 'profiles.jsonl') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def upload(path):
+    stream = io.BytesIO(path.read_bytes())
+    stream.name = path.name
+    return stream
+
+
+def test_fixture_resumes_parse_the_same_contact_details_from_pdf_and_docx():
+    for pdf in sorted((FIXTURES / 'resumes').glob('*.pdf')):
+        from_pdf = parse_resume(upload(pdf))
+        from_docx = parse_resume(upload(pdf.with_suffix('.docx')))
+        assert from_pdf['email'] and from_pdf['email'] == from_docx['email'], pdf.name
+        assert from_pdf['phone'] == from_docx['phone'], pdf.name
+        assert from_pdf['skills'], pdf.name
+
+
+def test_stub_generation_is_deterministic_and_keeps_profile_skills():
+    for profile in load_profiles():
+        resume = generate_resume_content(profile)
+        assert resume == generate_resume_content(profile), profile['id']
+        assert not resume.degraded
+        assert resume['email'] == profile['email']
+        generated = {skill.lower() for skill in resume.skill_list}
+        assert all(skill.lower() in generated for skill in parse_skills(profile['skills'])), profile['id']
@@ -0,0 +1,66 @@
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from utils import jobs
+from utils.jobs import DONE, RUNNING, JobQueue
+
+
+@pytest.fixture(autouse=True)
+def fast_heartbeat(monkeypatch):
+    monkeypatch.setattr(jobs, 'HEARTBEAT_SECONDS', 0.05)
+    monkeypatch.setattr(jobs, 'STALE_AFTER_SECONDS', 0.3)
+
+
+def wait_for(queue, job_id, status, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] == status:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} is {queue.get(job_id)['status']}, expected {status}")
+
+
+def test_job_orphaned_by_a_recent_restart_is_requeued(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    JobQueue(lambda payload, slot: payload, db_path=db_path).shutdown()
+    # A job that a process had just started when it died
+    conn = sqlite3.connect(db_path)
+    now = time.time()
+    conn.execute(
+        'INSERT INTO jobs (id, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+        ('orphan', RUNNING, json.dumps({'n': 1}), now, now)
+    )
+    conn.commit()
+    conn.close()
+
+    queue = JobQueue(lambda payload, slot: payload, db_path=db_path)
+    try:
+        assert wait_for(queue, 'orphan', DONE)['result'] == {'n': 1}
+    finally:
+        queue.shutdown()
+
+
+def test_long_running_job_is_heartbeated_not_requeued(tmp_path):
+    calls = []
+    release = threading.Event()
+
+    def runner(payload, slot):
+        calls.append(payload)
+        release.wait(5)
+        return payload
+
+    queue = JobQueue(runner, db_path=str(tmp_path / 'jobs.sqlite3'))
+    try:
+        job_id = queue.submit({'n': 2})
+        time.sleep(1.0)
+        assert queue.get(job_id)['status'] == RUNNING
+        release.set()
+        wait_for(queue, job_id, DONE)
+        assert calls == [{'n': 2}]
+    finally:
+        queue.shutdown()
@@ -0,0 +1,46 @@
+import io
+
+from PyPDF2 import PdfReader
+
+from utils.page_fit import fit_to_pages
+from utils.pdf_generator import LAYOUTS, MAX_DENSITY, create_pdf, measure_pages
+
+
+def make_resume(roles):
+    experience = '\n\n'.join(
+        f"Engineer {i} | Company {i}\n2015 - 2020\n" + '\n'.join(
+            f"• Delivered project {j} for team {i}, cutting costs and latency across several services"
+            for j in range(6))
+        for i in range(roles))
+    return {
+        'name': 'Jordan Lee',
+        'email': 'jordan.lee@example.com',
+        'phone': '+1 234 567 8900',
+        'summary': 'Backend engineer. Builds reliable services. Enjoys mentoring. Writes docs.',
+        'skills': 'Python, SQL, Docker, Kubernetes, PostgreSQL',
+        'experience': experience,
+        'projects': 'Payments API\n• Built a REST API\n\nDashboard\n• Shipped a React dashboard',
+        'education': 'B.Sc. Computer Science, 2014',
+    }
+
+
+def pdf_pages(pdf_bytes):
+    return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+
+
+def test_measure_pages_matches_the_rendered_page_count():
+    for layout in LAYOUTS:
+        for density in (0, MAX_DENSITY):
+            for roles in (1, 4, 9):
+                resume = make_resume(roles)
+                pdf = create_pdf(resume, layout, density=density)
+                assert measure_pages(resume, layout, density) == pdf_pages(pdf), (layout, density, roles)
+
+
+def test_fit_to_pages_condenses_to_the_budget():
+    resume = make_resume(4)
+    layout = next(iter(LAYOUTS))
+    assert measure_pages(resume, layout) > 1
+    fit = fit_to_pages(resume, layout, 1)
+    assert fit.pages == 1 and fit.steps
+    assert pdf_pages(create_pdf(resume, layout, max_pages=1)) == 1
@@ -0,0 +1,54 @@
+import pickle
+
+from utils.resume_model import ResumeDocument, escape_markup, parse_entries, parse_lines, parse_skills
+
+EXPERIENCE = """Data Analyst | Acme Corp
+Jan 2021 - Present
+• Built dashboards used by 40 managers
+- Cut report time by 30%
+
+Intern | Beta Labs
+2020
+* Cleaned survey data"""
+
+
+def test_parse_skills_splits_strips_bullets_and_dedupes():
+    text = "• Python, SQL; pandas\n- python | Tableau\nSQL"
+    assert parse_skills(text) == ['Python', 'SQL', 'pandas', 'Tableau']
+
+
+def test_parse_entries_groups_headings_details_and_bullets():
+    entries = parse_entries(EXPERIENCE)
+    assert [e.heading for e in entries] == ['Data Analyst | Acme Corp', 'Intern | Beta Labs']
+    assert entries[0].details == ['Jan 2021 - Present']
+    assert entries[0].bullets == ['Built dashboards used by 40 managers', 'Cut report time by 30%']
+    assert entries[1].bullets == ['Cleaned survey data']
+
+
+def test_parse_entries_keeps_bullets_without_a_heading():
+    entries = parse_entries("• Shipped v2\n• Wrote docs")
+    assert len(entries) == 1 and entries[0].heading == ''
+    assert entries[0].bullets == ['Shipped v2', 'Wrote docs']
+
+
+def test_parse_lines_strips_markers_but_not_hyphenated_words():
+    assert parse_lines("• AWS Certified\n-not a bullet\n\n▪ PMP") == ['AWS Certified', '-not a bullet', 'PMP']
+
+
+def test_mapping_view_matches_to_dict():
+    doc = ResumeDocument.from_dict({'name': 'Ann', 'skills': 'Python', 'degraded': True})
+    assert doc.get('degraded') is True
+    assert 'degraded' in doc
+    assert dict(doc) == doc.to_dict()
+    assert doc.get('nonexistent') is None
+
+
+def test_with_section_and_pickle_keep_the_document():
+    doc = ResumeDocument.from_dict({'name': 'Ann', 'skills': 'Python', 'experience': EXPERIENCE, 'degraded': True})
+    updated = doc.with_section('skills', 'Python, SQL')
+    assert updated.skill_list == ['Python', 'SQL'] and updated.experience == doc.experience
+    assert pickle.loads(pickle.dumps(doc)).to_dict() == doc.to_dict()
+
+
+def test_escape_markup():
+    assert escape_markup('R&D <b>"x"</b>') == 'R&amp;D &lt;b&gt;"x"&lt;/b&gt;'
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from utils.similarity import VectorCache, similarities, similarity, similarity_matrix
+
+RESUME = "Built REST services in Python and deployed them with Docker"
+RELATED = "RESTful service development with Python and Docker"
+UNRELATED = "Registered nurse caring for patients in an intensive care ward"
+
+
+def test_identical_text_scores_one():
+    assert similarity(RESUME, RESUME) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_related_wording_scores_above_unrelated():
+    assert similarity(RESUME, RELATED) > similarity(RESUME, UNRELATED)
+
+
+def test_batch_helpers_match_pairwise_similarity():
+    jds = [RELATED, UNRELATED, RESUME]
+    expected = [similarity(RESUME, jd) for jd in jds]
+    np.testing.assert_allclose(similarities(RESUME, jds), expected, rtol=1e-5)
+    matrix = similarity_matrix([RESUME, UNRELATED], jds)
+    assert matrix.shape == (2, 3)
+    np.testing.assert_allclose(matrix[0], expected, rtol=1e-5)
+    assert len(similarities(RESUME, [])) == 0
+
+
+def test_vector_cache_reuses_and_evicts_least_recent():
+    cache = VectorCache(maxsize=2)
+    first = cache.get(RELATED)
+    assert cache.get(RELATED) is first
+    assert not first.flags.writeable
+    unrelated = cache.get(UNRELATED)
+    cache.get(RELATED)  # RELATED is now the most recently used
+    cache.get(RESUME)   # evicts UNRELATED
+    assert cache.get(RELATED) is first
+    assert cache.get(UNRELATED) is not unrelated
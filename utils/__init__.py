@@ -1,14 +1,31 @@
-# utils/__init__.py (create if it doesn't exist)
-# This file can be empty or contain:
-from .ai_generator import generate_resume_content
-from .ats_scorer import calculate_ats_score
-from .pdf_generator import create_pdf, create_docx
-from .resume_parser import parse_resume
-
-__all__ = [
-    'generate_resume_content',
-    'calculate_ats_score',
-    'create_pdf',
-    'create_docx',
-    'parse_resume'
-]
\ No newline at end of file
+"""
+Resume builder helpers.
+
+The public functions are re-exported here but resolved lazily: importing
+``utils`` does not import Gemini, reportlab, pdfplumber or python-docx until
+one of the functions that needs them is first accessed.
+"""
+import importlib
+
+_EXPORTS = {
+    'generate_resume_content': 'ai_generator',
+    'calculate_ats_score': 'ats_scorer',
+    'create_pdf': 'pdf_generator',
+    'create_docx': 'pdf_generator',
+    'parse_resume': 'resume_parser',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,177 @@
+"""
+Load-aware admission control for LLM generation.
+
+Generation requests are admitted when they are submitted, before they
+wait for a job queue worker or an API lane (utils.pipeline.admit_generation),
+so a saturated LLM is detected while shedding still saves the wait. A shed
+request is served right away by the local format_basic_resume() generator,
+and the result is flagged as degraded so the UI can offer an upgrade later.
+An admitted request holds a Slot, passed along as an argument, and counts
+as in flight until generate_resume_content releases it after the LLM call.
+Section rewrites and tailoring are admitted when they run.
+
+A request is shed when any configured threshold is exceeded (0 disables a
+check; all are off by default):
+- RESUME_SHED_MAX_IN_FLIGHT: admitted LLM requests not yet finished in this process
+- RESUME_SHED_MAX_QUEUE: requests waiting for a worker (see set_queue_depth)
+- RESUME_SHED_P95_SECONDS: p95 of recent LLM call durations
+
+Latency samples older than RESUME_SHED_WINDOW_SECONDS (default 300) are
+dropped, so a slow spell stops shedding once it has aged out.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from . import metrics
+
+MAX_IN_FLIGHT = int(os.getenv('RESUME_SHED_MAX_IN_FLIGHT', '0'))
+MAX_QUEUE = int(os.getenv('RESUME_SHED_MAX_QUEUE', '0'))
+MAX_P95_SECONDS = float(os.getenv('RESUME_SHED_P95_SECONDS', '0'))
+WINDOW_SECONDS = float(os.getenv('RESUME_SHED_WINDOW_SECONDS', '300'))
+
+# Samples needed before the p95 check applies
+MIN_SAMPLES = 10
+MAX_SAMPLES = 200
+
+
+class AdmissionController:
+    """Tracks LLM load and decides whether a new request may use the LLM"""
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, max_queue=MAX_QUEUE, max_p95=MAX_P95_SECONDS,
+                 window=WINDOW_SECONDS):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_p95 = max_p95
+        self.window = window
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self._queue_depth = None
+        self._samples = deque(maxlen=MAX_SAMPLES)  # (finished at, seconds)
+        self._lock = threading.Lock()
+
+    def set_queue_depth(self, read):
+        """Register a function returning how many requests wait for a worker"""
+        self._queue_depth = read
+
+    def queue_depth(self):
+        if self._queue_depth is None:
+            return 0
+        try:
+            return self._queue_depth()
+        except Exception:
+            return 0
+
+    def p95(self):
+        """p95 of LLM call durations within the window, or None with too few samples"""
+        cutoff = time.time() - self.window
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            durations = sorted(seconds for _, seconds in self._samples)
+        if len(durations) < MIN_SAMPLES:
+            return None
+        return durations[min(int(0.95 * len(durations)), len(durations) - 1)]
+
+    def _shed_reason(self):
+        """Checks that don't need the lock; in-flight is checked when reserving"""
+        if self.max_queue and self.queue_depth() > self.max_queue:
+            return 'queue'
+        if self.max_p95:
+            p95 = self.p95()
+            if p95 is not None and p95 > self.max_p95:
+                return 'latency'
+        return None
+
+    def admit(self):
+        """
+        Admit or shed one request. Returns (slot, None) when admitted, in
+        which case the request counts as in flight until slot.release(), or
+        (None, reason) when shed: 'in_flight', 'queue' or 'latency'.
+        """
+        reason = self._shed_reason()
+        with self._lock:
+            if not reason and self.max_in_flight and self.in_flight >= self.max_in_flight:
+                reason = 'in_flight'
+            if reason:
+                self.shed += 1
+            else:
+                self.admitted += 1
+                self.in_flight += 1
+        if reason:
+            return None, reason
+        return Slot(self), None
+
+    def _release(self, elapsed):
+        with self._lock:
+            self.in_flight -= 1
+            if elapsed is not None:
+                self._samples.append((time.time(), elapsed))
+
+    @contextmanager
+    def llm_slot(self, slot=None):
+        """
+        Hold a slot for one LLM call. Yields None when the request may call
+        the LLM or the reason it was shed. slot is one admit() already
+        returned when the request was submitted; it is only timed and
+        released here.
+        """
+        if slot is None:
+            slot, reason = self.admit()
+            if reason:
+                yield reason
+                return
+
+        started = time.perf_counter()
+        try:
+            yield None
+        finally:
+            slot.release(time.perf_counter() - started)
+
+    def shed_rate(self):
+        """Fraction of requests shed since the process started"""
+        total = self.admitted + self.shed
+        return self.shed / total if total else 0.0
+
+    def stats(self):
+        p95 = self.p95()
+        return {
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth(),
+            'p95_seconds': None if p95 is None else round(p95, 3),
+            'admitted': self.admitted,
+            'shed': self.shed,
+            'shed_rate': round(self.shed_rate(), 4),
+        }
+
+
+class Slot:
+    """
+    An admitted request's place in the in-flight count. It lives only in
+    this process and is never stored with a request, so a client or a
+    recovered job cannot claim one. release() is idempotent.
+    """
+
+    def __init__(self, controller):
+        self._controller = controller
+        self._lock = threading.Lock()
+        self.released = False
+
+    def release(self, elapsed=None):
+        """Give the slot back, recording the LLM call time if one was made"""
+        with self._lock:
+            if self.released:
+                return
+            self.released = True
+        self._controller._release(elapsed)
+
+
+controller = AdmissionController()
+
+metrics.register_gauge('llm_in_flight', lambda: controller.in_flight)
+metrics.register_gauge('llm_queue_depth', controller.queue_depth)
+metrics.register_gauge('llm_latency_p95_seconds', lambda: controller.p95() or 0)
+metrics.register_gauge('llm_shed_ratio', controller.shed_rate)
@@ -1,116 +1,374 @@
-import google.generativeai as genai
+import functools
 import os
-from dotenv import load_dotenv
 import re
+import threading
 import time
+from datetime import datetime, timedelta, timezone
 
-load_dotenv()
+from . import admission
+from .log import get_logger
+from .metrics import span
+from .resume_model import ResumeDocument, SECTION_KEYS, ENTRY_SECTIONS, as_document
 
-# Configure Gemini API
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
-    print(f"✅ Gemini API configured with key: {GOOGLE_API_KEY[:10]}...")
-else:
-    print("⚠️ WARNING: No GOOGLE_API_KEY found!")
+logger = get_logger(__name__)
 
+MODEL_NAME = 'gemini-2.0-flash-exp'
 
-def generate_resume_content(input_data):
+# 'gemini', or 'stub' for the deterministic offline model in llm_stub
+LLM_BACKEND = os.getenv('RESUME_LLM_BACKEND', 'gemini').lower()
+
+# Opt-in: serve the resume system instruction from a Gemini cached-content
+# handle. Caching needs a versioned model name and a minimum prompt size, so
+# when the cache can't be created the plain system instruction is used.
+CONTEXT_CACHE = os.getenv('RESUME_GEMINI_CONTEXT_CACHE', '0') == '1'
+CACHE_MODEL_NAME = os.getenv('RESUME_GEMINI_CACHE_MODEL', f'models/{MODEL_NAME}')
+CACHE_TTL_SECONDS = int(os.getenv('RESUME_GEMINI_CACHE_TTL_SECONDS', '3600'))
+
+# Extend a cache's TTL once it is this close to expiring
+CACHE_REFRESH_SECONDS = 300
+
+# google.generativeai is slow to import, so it is loaded on first use by
+# init_gemini() rather than when this module is imported.
+_genai = None
+_gemini_lock = threading.Lock()
+_gemini_initialized = False
+GOOGLE_API_KEY = None
+
+
+def init_gemini():
     """
-    Use Gemini AI to generate optimized resume content
+    Load the Gemini SDK and configure it from GOOGLE_API_KEY.
+    
+    Safe to call any number of times; only the first call does any work.
+    Returns the configured genai module, or None if no API key is set.
     """
+    global _genai, _gemini_initialized, GOOGLE_API_KEY
     
-    # Check if API key is set
-    if not GOOGLE_API_KEY:
-        print("⚠️ No API key - using fallback")
-        return format_basic_resume(input_data)
+    if _gemini_initialized:
+        return _genai
     
-    # Create comprehensive prompt
-    prompt = create_resume_prompt(input_data)
+    with _gemini_lock:
+        if _gemini_initialized:
+            return _genai
+        
+        from dotenv import load_dotenv
+        load_dotenv()
+        
+        GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
+        if GOOGLE_API_KEY:
+            import google.generativeai as genai
+            genai.configure(api_key=GOOGLE_API_KEY)
+            _genai = genai
+            logger.info("✅ Gemini API configured")
+        else:
+            logger.warning("⚠️ WARNING: No GOOGLE_API_KEY found!")
+        
+        _gemini_initialized = True
+        return _genai
+
+
+def get_llm():
+    """
+    The configured LLM backend as a function (prompt, system=None) ->
+    response text, or None if it is unavailable (no Gemini API key).
+    system is a static instruction sent apart from the prompt, so the
+    backend can reuse it across calls.
+    """
+    if LLM_BACKEND == 'stub':
+        return call_stub
+    
+    genai = init_gemini()
+    if genai is None:
+        return None
+    return functools.partial(call_gemini, genai)
+
+
+def generate_resume_content(input_data, slot=None):
+    """
+    Use Gemini AI to generate optimized resume content.
+    Returns a ResumeDocument.
+    
+    slot is the admission.Slot of a request admitted when it was submitted
+    (see utils.pipeline.admit_generation); it is released here. Without
+    one, admission is decided now.
+    """
+    with span('generate') as generate_span:
+        llm = get_llm()
+        
+        # Check if API key is set
+        if llm is None:
+            logger.warning("⚠️ No API key - using fallback")
+            generate_span.incr('fallbacks')
+            if slot is not None:
+                slot.release()
+            return ResumeDocument.from_dict(format_basic_resume(input_data))
+        
+        # Serve the local fallback straight away when the LLM is saturated
+        with admission.controller.llm_slot(slot) as shed_reason:
+            if shed_reason:
+                logger.info("⚡ LLM overloaded (%s) - serving fallback", shed_reason)
+                generate_span.incr('shed')
+                return ResumeDocument.from_dict({**format_basic_resume(input_data), 'degraded': True})
+            
+            generate_span.incr('admitted')
+            resume = generate_with_llm(llm, input_data, generate_span)
+        
+        if resume is not None:
+            return resume
+        
+        # If all retries failed, use fallback
+        logger.warning("⚠️ All AI attempts failed, using enhanced fallback")
+        generate_span.incr('fallbacks')
+        return ResumeDocument.from_dict({**format_basic_resume(input_data), 'degraded': True})
+
+
+def generate_with_llm(llm, input_data, generate_span):
+    """
+    Generate with up to three attempts; returns a ResumeDocument, or None
+    if every attempt failed.
+    """
+    # Only the candidate's fields; the instructions go as the system instruction
+    with span('prompt_build'):
+        prompt = create_resume_request(input_data)
     
     max_retries = 3
     retry_count = 0
     
     while retry_count < max_retries:
+        if retry_count:
+            generate_span.incr('retries')
         try:
-            print(f"\n🔄 Attempt {retry_count + 1}/{max_retries}")
-            
-            # Initialize Gemini model
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')  # Using stable model
+            logger.info("🔄 Attempt %d/%d, prompt length: %d characters", retry_count + 1, max_retries, len(prompt))
             
-            print(f"📤 Sending request to Gemini AI...")
-            print(f"📝 Prompt length: {len(prompt)} characters")
-            
-            # Generate content with configuration
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.7,
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=2048,
-            )
-            
-            response = model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                safety_settings={
-                    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
-                    'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
-                    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
-                    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
-                }
-            )
-            
-            # Check if response exists and has text
-            if not response or not hasattr(response, 'text'):
-                print(f"⚠️ No response or no text attribute")
-                print(f"Response: {response}")
-                retry_count += 1
-                time.sleep(2)
-                continue
-            
-            ai_content = response.text
+            ai_content = llm(prompt, system=RESUME_SYSTEM_INSTRUCTION)
             
             if not ai_content or len(ai_content) < 100:
-                print(f"⚠️ Response too short: {len(ai_content)} chars")
-                print(f"Content: {ai_content[:200]}")
+                logger.warning("⚠️ Response too short: %d chars", len(ai_content or ''))
+                logger.debug("Content: %s", (ai_content or '')[:200])
                 retry_count += 1
                 time.sleep(2)
                 continue
             
-            print(f"✅ AI Response received: {len(ai_content)} characters")
-            print(f"📄 First 200 chars: {ai_content[:200]}")
+            logger.info("✅ AI Response received: %d characters", len(ai_content))
+            logger.debug("First 200 chars: %s", ai_content[:200])
             
             # Parse AI response
-            resume_data = parse_ai_response(ai_content, input_data)
+            with span('response_parse'):
+                resume_data = parse_ai_response(ai_content, input_data)
             
             # Validate parsed data
             if not resume_data.get('summary') or len(resume_data.get('summary', '')) < 20:
-                print("⚠️ Parsed data seems incomplete, retrying...")
+                logger.warning("⚠️ Parsed data seems incomplete, retrying...")
                 retry_count += 1
                 time.sleep(2)
                 continue
             
-            print("✅ Resume data parsed successfully!")
-            return resume_data
+            logger.info("✅ Resume data parsed successfully!")
+            return ResumeDocument.from_dict(resume_data)
             
         except Exception as e:
-            print(f"❌ Error on attempt {retry_count + 1}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error on attempt %d: %s", retry_count + 1, e)
             retry_count += 1
             time.sleep(2)
     
-    # If all retries failed, use fallback
-    print("⚠️ All AI attempts failed, using enhanced fallback")
-    return format_basic_resume(input_data)
+    return None
 
 
-def create_resume_prompt(data):
-    """Create detailed prompt for Gemini AI"""
+class ContextCache:
+    """
+    Gemini cached-content handle for one system instruction, created on
+    first use and extended whenever it is within CACHE_REFRESH_SECONDS of
+    expiring. If the cache can't be created (model or prompt size not
+    supported), model() returns None from then on and callers send the
+    instruction as a plain system instruction.
+    """
+    
+    def __init__(self, system, ttl_seconds=CACHE_TTL_SECONDS):
+        self.system = system
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.disabled = False
+        self._cache = None
+        self._model = None
+        self._lock = threading.Lock()
     
-    prompt = f"""Act as an expert ATS resume writer. Create a highly professional, ATS-optimized resume.
+    def model(self, genai):
+        with self._lock:
+            if self.disabled:
+                return None
+            now = datetime.now(timezone.utc)
+            try:
+                if self._cache is None or self._cache.expire_time <= now:
+                    from google.generativeai import caching
+                    self._cache = caching.CachedContent.create(
+                        model=CACHE_MODEL_NAME, system_instruction=self.system, ttl=self.ttl
+                    )
+                    self._model = genai.GenerativeModel.from_cached_content(self._cache)
+                    logger.info("🗄️ Created context cache %s", self._cache.name)
+                elif self._cache.expire_time - now < timedelta(seconds=CACHE_REFRESH_SECONDS):
+                    self._cache.update(ttl=self.ttl)
+            except Exception as e:
+                logger.warning("⚠️ Context cache unavailable, using a system instruction: %s", e)
+                self.disabled = True
+                return None
+            return self._model
 
-CANDIDATE DETAILS:
+
+_gemini_models = {}  # system instruction -> GenerativeModel
+_context_caches = {}  # system instruction -> ContextCache
+
+
+def gemini_model(genai, system=None):
+    """The model for a system instruction, built once per instruction"""
+    if system and CONTEXT_CACHE:
+        with _gemini_lock:
+            cache = _context_caches.setdefault(system, ContextCache(system))
+        model = cache.model(genai)
+        if model is not None:
+            return model
+    
+    model = _gemini_models.get(system)
+    if model is None:
+        model = genai.GenerativeModel(MODEL_NAME, system_instruction=system)
+        with _gemini_lock:
+            model = _gemini_models.setdefault(system, model)
+    return model
+
+
+def call_gemini(genai, prompt, system=None):
+    """
+    Send one prompt to Gemini and return the response text.
+    
+    The response is streamed so the llm_call span can record time to first
+    byte as well as the total, and the input and cached token counts the
+    API reports.
+    """
+    model = gemini_model(genai, system)
+    
+    generation_config = genai.types.GenerationConfig(
+        temperature=0.7,
+        top_p=0.95,
+        top_k=40,
+        max_output_tokens=2048,
+    )
+    
+    with span('llm_call', model=MODEL_NAME) as call:
+        started = time.perf_counter()
+        response = model.generate_content(
+            prompt,
+            generation_config=generation_config,
+            safety_settings={
+                'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
+                'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
+                'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
+                'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
+            },
+            stream=True
+        )
+        
+        parts = []
+        for chunk in response:
+            if not parts:
+                call.observe('ttfb', time.perf_counter() - started)
+            parts.append(chunk.text)
+        
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            call.incr('input_tokens', usage.prompt_token_count or 0)
+            call.incr('cached_input_tokens', getattr(usage, 'cached_content_token_count', 0) or 0)
+        return ''.join(parts)
+
+
+def call_stub(prompt, system=None):
+    """Run one prompt through the local stub model (see llm_stub)"""
+    from . import llm_stub
+    
+    with span('llm_call', model=llm_stub.MODEL_NAME) as call:
+        started = time.perf_counter()
+        usage = {}
+        parts = []
+        for chunk in llm_stub.stream_response(prompt, system=system, usage=usage):
+            if not parts:
+                call.observe('ttfb', time.perf_counter() - started)
+            parts.append(chunk)
+        call.incr('input_tokens', usage['input_tokens'])
+        call.incr('cached_input_tokens', usage['cached_input_tokens'])
+        return ''.join(parts)
+
+
+# What the model is asked to write for each section, by resume key
+SECTION_HEADERS = {
+    'summary': 'PROFESSIONAL SUMMARY',
+    'skills': 'SKILLS',
+    'experience': 'EXPERIENCE',
+    'projects': 'PROJECTS',
+    'education': 'EDUCATION',
+    'certifications': 'CERTIFICATIONS',
+}
+
+SECTION_INSTRUCTIONS = {
+    'summary': """Write a compelling 3-sentence summary for a {role}. Include specific skills and career goals. Make it impactful and professional.""",
+    'skills': """List 12-15 technical and soft skills relevant to {role}. Include programming languages, frameworks, tools, and soft skills. Format as comma-separated list.""",
+    'experience': """Expand the provided experience into 2-3 professional roles with:
+- Job Title | Company Name
+- Duration (Month Year - Month Year)
+- 4-5 bullet points per role with action verbs (Developed, Implemented, Led, Designed)
+- Include metrics and numbers (increased by X%, reduced by Y, led team of Z)
+- Show technical skills used
+If no experience provided, create realistic internship/project-based roles.""",
+    'projects': """Expand the provided projects into 2-3 detailed projects with:
+- Project Name | Technologies Used
+- Problem solved and approach taken
+- Technical implementation details
+- Measurable results or impact
+Make them impressive and technical.""",
+    'education': """Format the education professionally:
+- Degree Name (Full form)
+- University/College Name
+- Graduation Year
+- GPA/CGPA if strong
+- Relevant coursework""",
+    'certifications': """List certifications, online courses, or achievements:
+- Certification Name - Issuing Organization (Year)
+Make it professional.""",
+}
+
+
+def format_section_instructions(role, keys=None, instructions=SECTION_INSTRUCTIONS):
+    """The header and instructions for each section, as in the prompt"""
+    keys = keys or SECTION_HEADERS
+    return '\n\n'.join(f"{SECTION_HEADERS[key]}:\n{instructions[key].format(role=role)}" for key in keys)
+
+
+# The system instruction is written before the role is known, so the
+# summary is asked "for the target role" rather than "for a {role}"
+SYSTEM_SECTION_INSTRUCTIONS = {
+    **SECTION_INSTRUCTIONS,
+    'summary': SECTION_INSTRUCTIONS['summary'].replace('for a {role}', 'for {role}'),
+}
+
+# Everything in a full-resume prompt that doesn't depend on the candidate.
+# It is sent once as the model's system instruction (see get_llm), so each
+# request carries only create_resume_request()'s fields.
+RESUME_SYSTEM_INSTRUCTION = f"""Act as an expert ATS resume writer. Create a highly professional, ATS-optimized resume for the candidate in each request.
+
+CREATE A COMPLETE RESUME WITH THESE EXACT SECTIONS:
+
+{format_section_instructions('the target role', instructions=SYSTEM_SECTION_INSTRUCTIONS)}
+
+CRITICAL FORMATTING RULES:
+1. Use EXACTLY these section headers: PROFESSIONAL SUMMARY, SKILLS, EXPERIENCE, PROJECTS, EDUCATION, CERTIFICATIONS
+2. Make content detailed and professional
+3. Use numbers and metrics
+4. Include action verbs
+5. Make it ATS-friendly
+6. NO placeholders like "To be added" or "Not provided"
+7. Create complete, realistic content"""
+
+
+def create_resume_request(data):
+    """The candidate-specific part of a full-resume prompt"""
+    
+    prompt = f"""CANDIDATE DETAILS:
 Name: {data['full_name']}
 Email: {data['email']}
 Phone: {data['phone']}
@@ -140,64 +398,267 @@ JOB DESCRIPTION TO MATCH:
 CRITICAL: Extract keywords from this JD and use them throughout the resume.
 """
     
-    prompt += f"""
+    prompt += """
+OUTPUT THE COMPLETE RESUME NOW:"""
+    
+    return prompt
 
-CREATE A COMPLETE RESUME WITH THESE EXACT SECTIONS:
 
-PROFESSIONAL SUMMARY:
-Write a compelling 3-sentence summary for a {data['target_role']}. Include specific skills and career goals. Make it impactful and professional.
+def create_resume_prompt(data):
+    """The whole full-resume prompt, system instruction included, as one text"""
+    return f"{RESUME_SYSTEM_INSTRUCTION}\n\n{create_resume_request(data)}"
 
-SKILLS:
-List 12-15 technical and soft skills relevant to {data['target_role']}. Include programming languages, frameworks, tools, and soft skills. Format as comma-separated list.
 
-EXPERIENCE:
-Expand the provided experience into 2-3 professional roles with:
-- Job Title | Company Name
-- Duration (Month Year - Month Year)
-- 4-5 bullet points per role with action verbs (Developed, Implemented, Led, Designed)
-- Include metrics and numbers (increased by X%, reduced by Y, led team of Z)
-- Show technical skills used
-If no experience provided, create realistic internship/project-based roles.
+def section_context(resume, key):
+    """A one-line digest of a section, used as context when rewriting another"""
+    if key == 'skills':
+        return ', '.join(resume.skill_list)
+    if key in ENTRY_SECTIONS:
+        return '; '.join(entry.heading for entry in resume.entries[key] if entry.heading)
+    text = '; '.join(resume.lines[key])
+    return text if len(text) <= 300 else text[:300].rsplit(' ', 1)[0] + '...'
 
-PROJECTS:
-Expand the provided projects into 2-3 detailed projects with:
-- Project Name | Technologies Used
-- Problem solved and approach taken
-- Technical implementation details
-- Measurable results or impact
-Make them impressive and technical.
 
-EDUCATION:
-Format the education professionally:
-- Degree Name (Full form)
-- University/College Name
-- Graduation Year
-- GPA/CGPA if strong
-- Relevant coursework
+def create_section_prompt(resume, key, job_description='', feedback=''):
+    """
+    Prompt that rewrites one section of an existing resume.
+    
+    The other sections are included only as compact digests, so the prompt
+    and the response are a fraction of a full generation.
+    """
+    header = SECTION_HEADERS[key]
+    context = '\n'.join(
+        f"{SECTION_HEADERS[other]}: {section_context(resume, other)}"
+        for other in SECTION_KEYS if other != key and resume[other]
+    )
+    
+    prompt = f"""Act as an expert ATS resume writer. Rewrite ONE section of an existing resume.
 
-CERTIFICATIONS:
-List certifications, online courses, or achievements:
-- Certification Name - Issuing Organization (Year)
-Make it professional.
+CANDIDATE DETAILS:
+Name: {resume.name}
+Target Role: {resume.target_role}
 
-CRITICAL FORMATTING RULES:
-1. Use EXACTLY these section headers: PROFESSIONAL SUMMARY, SKILLS, EXPERIENCE, PROJECTS, EDUCATION, CERTIFICATIONS
-2. Make content detailed and professional
-3. Use numbers and metrics
-4. Include action verbs
-5. Make it ATS-friendly
-6. NO placeholders like "To be added" or "Not provided"
-7. Create complete, realistic content
+REST OF THE RESUME (keep the new section consistent with it):
+{context or 'None'}
+"""
+    
+    if job_description:
+        prompt += f"""
+JOB DESCRIPTION TO MATCH:
+{job_description[:1000]}
 
-OUTPUT THE COMPLETE RESUME NOW:"""
+CRITICAL: Use keywords from this JD.
+"""
+    
+    prompt += f"""
+CURRENT {header}:
+{resume[key] or 'None'}
+"""
+    
+    if feedback:
+        prompt += f"""
+USER FEEDBACK ON THE CURRENT VERSION:
+{feedback[:500]}
+"""
+    
+    prompt += f"""
+REWRITE THIS SECTION:
+{format_section_instructions(resume.target_role, [key])}
+
+Make it detailed, professional and ATS-friendly, with action verbs and metrics. NO placeholders.
+Output ONLY the new {header} content, without the header:"""
     
     return prompt
 
 
-def parse_ai_response(ai_text, original_data):
-    """Parse Gemini AI response into structured format"""
+def parse_section_response(ai_text, key):
+    """Clean a single-section response the same way parse_ai_response does"""
+    text = ai_text.replace('**', '').replace('##', '').replace('#', '')
+    text = re.sub(r'\*\s', '• ', text).strip()
+    
+    # Drop a repeated header line if the model added one
+    header = re.escape(SECTION_HEADERS[key])
+    text = re.sub(rf'^\s*{header}:?\s*\n', '', text, flags=re.IGNORECASE).strip()
+    return re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+
+
+def regenerate_section(resume_data, key, job_description='', feedback=''):
+    """
+    Rewrite one section of a resume with the LLM and return a new
+    ResumeDocument with only that section replaced.
+    
+    Returns the resume with the section unchanged (flagged degraded if an
+    LLM was configured) when no LLM is available, it is overloaded, or both
+    attempts fail; real content is never replaced with generic text.
+    """
+    if key not in SECTION_HEADERS:
+        raise ValueError(f"Unknown section '{key}'. Choose from: {', '.join(SECTION_HEADERS)}")
+    resume = as_document(resume_data)
+    
+    with span('regenerate', section=key) as regenerate_span:
+        llm = get_llm()
+        text = None
+        if llm is not None:
+            with admission.controller.llm_slot() as shed_reason:
+                if shed_reason:
+                    logger.info("⚡ LLM overloaded (%s) - keeping %s as it is", shed_reason, key)
+                    regenerate_span.incr('shed')
+                else:
+                    regenerate_span.incr('admitted')
+                    text = regenerate_with_llm(llm, resume, key, job_description, feedback, regenerate_span)
+        
+        if text is not None:
+            return resume.with_section(key, text)
+        
+        logger.warning("⚠️ Could not regenerate %s; keeping the current section", key)
+        regenerate_span.incr('fallbacks')
+        return ResumeDocument.from_dict({**resume.to_dict(), 'degraded': resume.degraded or llm is not None})
+
+
+def regenerate_with_llm(llm, resume, key, job_description, feedback, regenerate_span):
+    """Rewrite one section with up to two attempts; returns the text or None"""
+    with span('prompt_build'):
+        prompt = create_section_prompt(resume, key, job_description, feedback)
+    
+    for attempt in range(2):
+        if attempt:
+            regenerate_span.incr('retries')
+            time.sleep(2)
+        try:
+            ai_content = llm(prompt)
+            with span('response_parse'):
+                text = parse_section_response(ai_content, key)
+        except Exception as e:
+            logger.exception("❌ Error regenerating %s: %s", key, e)
+            continue
+        if len(text) >= 20:
+            logger.info("✅ Regenerated %s: %d chars", key, len(text))
+            return text
+        logger.warning("⚠️ Regenerated %s too short: %d chars", key, len(text))
+    return None
+
+
+# Sections rewritten per job description in multi-JD tailoring; the others
+# are generated once and shared by every variant
+TAILORED_SECTIONS = ('summary', 'skills', 'experience')
+
+TAILOR_INSTRUCTIONS = {
+    'summary': "Write a compelling 3-sentence summary built around what this job asks for.",
+    'skills': "The same skills as a comma-separated list, reordered so the ones this job asks for come first.",
+    'experience': """Keep the same roles, companies and dates. Reword and reorder the bullets to emphasise
+work relevant to this job, keeping their metrics.""",
+}
+
+
+def create_tailor_prompt(resume, job_description):
+    """
+    Prompt that adapts the JD-sensitive sections of a base resume to one job.
+    
+    Shared sections go in only as digests, and the response holds just the
+    TAILORED_SECTIONS, so each extra job costs a fraction of a full
+    generation.
+    """
+    shared = '\n'.join(
+        f"{SECTION_HEADERS[key]}: {section_context(resume, key)}"
+        for key in SECTION_KEYS if key not in TAILORED_SECTIONS and resume[key]
+    )
+    # The summary is written afresh for each job, so only the sections being
+    # reworked are sent in full
+    current = '\n\n'.join(
+        f"CURRENT {SECTION_HEADERS[key]}:\n{resume[key] or 'None'}" for key in TAILORED_SECTIONS if key != 'summary'
+    )
+    instructions = '\n\n'.join(f"{SECTION_HEADERS[key]}:\n{TAILOR_INSTRUCTIONS[key]}" for key in TAILORED_SECTIONS)
+    headers = ', '.join(SECTION_HEADERS[key] for key in TAILORED_SECTIONS)
+    
+    return f"""Act as an expert ATS resume writer. Tailor an existing resume to one job description.
+
+CANDIDATE DETAILS:
+Name: {resume.name}
+Target Role: {resume.target_role}
+
+UNCHANGED SECTIONS (keep the tailored sections consistent with them):
+{shared or 'None'}
+
+JOB DESCRIPTION TO MATCH:
+{job_description[:1000]}
+
+{current}
+
+TAILOR THESE SECTIONS: {headers}
+
+{instructions}
+
+Use EXACTLY these section headers: {headers}. Do not invent new employers, dates or skills. NO placeholders.
+Output ONLY these sections:"""
+
+
+def tailor_resume(resume_data, job_description):
+    """
+    Adapt the TAILORED_SECTIONS of a base resume to one job description and
+    return a new ResumeDocument; the other sections are kept as they are.
+    
+    Returns the base resume unchanged (flagged degraded if an LLM was
+    configured) when no LLM is available, it is overloaded, or both
+    attempts fail.
+    """
+    resume = as_document(resume_data)
+    
+    with span('tailor') as tailor_span:
+        llm = get_llm()
+        sections = None
+        if llm is not None:
+            with admission.controller.llm_slot() as shed_reason:
+                if shed_reason:
+                    logger.info("⚡ LLM overloaded (%s) - keeping the base resume", shed_reason)
+                    tailor_span.incr('shed')
+                else:
+                    tailor_span.incr('admitted')
+                    sections = tailor_with_llm(llm, resume, job_description, tailor_span)
+        
+        if sections is not None:
+            return ResumeDocument.from_dict({**resume.to_dict(), **sections})
+        
+        logger.warning("⚠️ Could not tailor the resume; using the base resume")
+        tailor_span.incr('fallbacks')
+        return ResumeDocument.from_dict({**resume.to_dict(), 'degraded': resume.degraded or llm is not None})
+
+
+def tailor_with_llm(llm, resume, job_description, tailor_span):
+    """Tailor with up to two attempts; returns {key: text} or None"""
+    with span('prompt_build'):
+        prompt = create_tailor_prompt(resume, job_description)
+    
+    for attempt in range(2):
+        if attempt:
+            tailor_span.incr('retries')
+            time.sleep(2)
+        try:
+            ai_content = llm(prompt)
+            with span('response_parse'):
+                parsed = parse_ai_response(ai_content, {
+                    'full_name': resume.name,
+                    'email': resume.email,
+                    'phone': resume.phone,
+                    'target_role': resume.target_role,
+                }, keys=TAILORED_SECTIONS)
+        except Exception as e:
+            logger.exception("❌ Error tailoring resume: %s", e)
+            continue
+        sections = {key: parsed[key] for key in TAILORED_SECTIONS if parsed[key]}
+        if len(sections.get('summary', '')) >= 20:
+            logger.info("✅ Tailored %s", ', '.join(sections))
+            return sections
+        logger.warning("⚠️ Tailored response incomplete: %s", ', '.join(sections) or 'nothing parsed')
+    return None
+
+
+def parse_ai_response(ai_text, original_data, keys=None):
+    """
+    Parse Gemini AI response into structured format.
+    keys limits extraction to those sections, for partial responses.
+    """
     
-    print("📝 Parsing AI response...")
+    logger.debug("📝 Parsing AI response...")
     
     sections = {
         'name': original_data['full_name'],
@@ -216,7 +677,7 @@ def parse_ai_response(ai_text, original_data):
     ai_text = ai_text.replace('**', '').replace('##', '').replace('#', '')
     ai_text = re.sub(r'\*\s', '• ', ai_text)
     
-    print(f"Cleaned text length: {len(ai_text)}")
+    logger.debug("Cleaned text length: %d", len(ai_text))
     
     # More flexible extraction patterns
     patterns = {
@@ -229,21 +690,25 @@ def parse_ai_response(ai_text, original_data):
     }
     
     for key, pattern in patterns.items():
+        if keys is not None and key not in keys:
+            continue
         match = re.search(pattern, ai_text, re.DOTALL | re.IGNORECASE)
         if match:
             content = match.group(1).strip()
             content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
             sections[key] = content
-            print(f"✅ Extracted {key}: {len(content)} chars")
+            logger.debug("✅ Extracted %s: %d chars", key, len(content))
         else:
-            print(f"⚠️ Could not extract {key}")
+            logger.warning("⚠️ Could not extract %s", key)
     
     # Validate critical sections
     critical_sections = ['summary', 'skills', 'experience']
     for section in critical_sections:
+        if keys is not None and section not in keys:
+            continue
         if not sections[section] or len(sections[section]) < 20:
-            print(f"❌ Critical section '{section}' is too short or missing!")
-            print(f"Content: {sections[section][:100]}")
+            logger.warning("❌ Critical section '%s' is too short or missing!", section)
+            logger.debug("Content: %s", sections[section][:100])
             # Don't use fallback for individual sections, let the retry handle it
     
     return sections
@@ -252,7 +717,7 @@ def parse_ai_response(ai_text, original_data):
 def format_basic_resume(data):
     """Enhanced fallback formatting"""
     
-    print("🔄 Using ENHANCED fallback resume formatting...")
+    logger.info("🔄 Using ENHANCED fallback resume formatting...")
     
     role = data['target_role']
     
@@ -0,0 +1,213 @@
+"""
+Content-addressed local store for generated artifacts and large inputs.
+
+Sessions keep only the short keys returned by put()/put_json() instead of
+the objects themselves, and read the bytes back when they are needed (a
+download, a rerun that shows the resume). Keys are SHA-256 digests of the
+content, so identical artifacts from different sessions are stored once.
+get_or_build() keys an artifact by its inputs instead, so a rendered PDF
+is built once per (resume, layout) and served from disk afterwards.
+
+Files live under RESUME_DATA_DIR/artifacts. When the store grows past
+RESUME_ARTIFACT_MAX_MB (default 512), the least recently used files are
+evicted; a session whose key was evicted finds get() returning None.
+
+SessionSizes tracks the approximate size of each session's state for the
+session_state_bytes gauges.
+"""
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from . import metrics
+from .config import DATA_DIR
+from .log import get_logger
+from .resume_model import ResumeDocument
+
+logger = get_logger(__name__)
+
+MAX_BYTES = int(float(os.getenv('RESUME_ARTIFACT_MAX_MB', '512')) * 1024 * 1024)
+
+# Reads refresh a file's mtime (its LRU position) at most this often
+TOUCH_INTERVAL_SECONDS = 60
+
+# Sessions not seen for this long are dropped from SessionSizes
+SESSION_IDLE_SECONDS = 3600
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def canonical_json(obj):
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+class ArtifactStore:
+    """Files named by key, evicted least recently used past max_bytes"""
+
+    def __init__(self, root=None, max_bytes=MAX_BYTES):
+        self.root = root or os.path.join(DATA_DIR, 'artifacts')
+        self.max_bytes = max_bytes
+        self.evicted = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes = {}  # key -> size, for the files this process knows of
+        for name in os.listdir(self.root):
+            if not name.startswith('.'):
+                self._sizes[name] = os.path.getsize(os.path.join(self.root, name))
+        self.total_bytes = sum(self._sizes.values())
+
+    def _path(self, key):
+        if not key or not all(c in '0123456789abcdef' for c in key):
+            raise ValueError(f"Invalid artifact key '{key}'")
+        return os.path.join(self.root, key)
+
+    def _write(self, key, data):
+        path = self._path(key)
+        if os.path.exists(path):
+            self.touch(key)
+            return key
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if key not in self._sizes:
+                self._sizes[key] = len(data)
+                self.total_bytes += len(data)
+        self._evict()
+        return key
+
+    def put(self, data):
+        """Store bytes; returns their key"""
+        return self._write(digest(data), data)
+
+    def put_json(self, obj):
+        """Store a JSON-safe object; returns its key"""
+        data = canonical_json(obj)
+        return self._write(digest(data), data)
+
+    def get(self, key):
+        """The stored bytes, or None if the key is unknown or was evicted"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        self.touch(key)
+        return data
+
+    def get_json(self, key):
+        data = self.get(key)
+        return None if data is None else json.loads(data)
+
+    def touch(self, key):
+        """Mark a key as recently used; returns False if it isn't stored"""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > TOUCH_INTERVAL_SECONDS:
+                os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def get_or_build(self, inputs, build):
+        """
+        Bytes of the artifact derived from `inputs` (any JSON-safe value),
+        calling build() and storing the result the first time.
+        """
+        key = digest(canonical_json(inputs))
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self._write(key, data)
+        return data
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        with self._lock:
+            by_age = []
+            for key in list(self._sizes):
+                try:
+                    by_age.append((os.path.getmtime(os.path.join(self.root, key)), key))
+                except FileNotFoundError:
+                    self.total_bytes -= self._sizes.pop(key)
+            by_age.sort()
+            # Evict down to 90% so every write past the limit doesn't rescan
+            target = self.max_bytes * 0.9
+            evicted = 0
+            for _, key in by_age:
+                if self.total_bytes <= target:
+                    break
+                try:
+                    os.remove(os.path.join(self.root, key))
+                except FileNotFoundError:
+                    pass
+                self.total_bytes -= self._sizes.pop(key)
+                evicted += 1
+            self.evicted += evicted
+        logger.info("🧹 Evicted %d artifacts, %.1f MB left", evicted, self.total_bytes / (1024 * 1024))
+
+
+store = ArtifactStore()
+
+
+@functools.lru_cache(maxsize=256)
+def _decode_resume(key):
+    data = store.get_json(key)
+    return None if data is None else ResumeDocument.from_dict(data)
+
+
+def load_resume(key):
+    """
+    ResumeDocument stored under key, or None if it was evicted. Decoded
+    documents are shared across sessions through a small LRU, so a rerun
+    doesn't re-parse the resume.
+    """
+    if not key or not store.touch(key):
+        return None
+    return _decode_resume(key)
+
+
+class SessionSizes:
+    """Latest state size reported by each live session"""
+
+    def __init__(self):
+        self._sizes = {}  # session id -> (bytes, last seen)
+        self._lock = threading.Lock()
+
+    def record(self, session_id, nbytes):
+        now = time.time()
+        with self._lock:
+            self._sizes[session_id] = (nbytes, now)
+            for sid, (_, seen) in list(self._sizes.items()):
+                if now - seen > SESSION_IDLE_SECONDS:
+                    del self._sizes[sid]
+
+    def sizes(self):
+        with self._lock:
+            return [nbytes for nbytes, _ in self._sizes.values()]
+
+    def average(self):
+        sizes = self.sizes()
+        return sum(sizes) / len(sizes) if sizes else 0
+
+    def maximum(self):
+        return max(self.sizes(), default=0)
+
+
+session_sizes = SessionSizes()
+
+metrics.register_gauge('artifact_store_bytes', lambda: store.total_bytes)
+metrics.register_gauge('artifact_store_files', lambda: len(store._sizes))
+metrics.register_gauge('artifacts_evicted', lambda: store.evicted)
+metrics.register_gauge('sessions_tracked', lambda: len(session_sizes.sizes()))
+metrics.register_gauge('session_state_bytes_avg', session_sizes.average)
+metrics.register_gauge('session_state_bytes_max', session_sizes.maximum)
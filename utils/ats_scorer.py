@@ -1,49 +1,77 @@
+import functools
 import re
 from collections import Counter
 
+from . import similarity
+from .metrics import incr, span
+from .resume_model import as_document
+
+COMPONENTS = ('skill_match', 'keyword_relevance', 'role_alignment', 'formatting')
+
+# Reported next to the components but not counted in the total score
+EXTRA_COMPONENTS = ('semantic_match',) if similarity.ENABLED else ()
+
+ROLE_KEYWORDS = {
+    'software engineer': ['development', 'programming', 'coding', 'software', 'engineer', 'python', 'java'],
+    'data scientist': ['data', 'analysis', 'machine learning', 'python', 'statistics', 'modeling'],
+    'product manager': ['product', 'strategy', 'roadmap', 'stakeholder', 'agile', 'scrum'],
+    'designer': ['design', 'ui', 'ux', 'figma', 'adobe', 'creative', 'user experience'],
+    'marketing': ['marketing', 'campaign', 'seo', 'content', 'analytics', 'social media']
+}
+
+# Sections each text-matching component reads
+KEYWORD_SECTIONS = ('summary', 'skills', 'experience', 'projects')
+ROLE_SECTIONS = ('summary', 'experience', 'projects')
+
 def calculate_ats_score(resume_data, job_description, target_role):
     """
     Calculate comprehensive ATS score (0-100)
+
+    resume_data may be a ResumeDocument or a plain resume dict. Resume
+    skills come from ResumeDocument.skill_list, so bullet markers in the
+    skills section ("• Python") are stripped before matching.
     """
-    
-    # Initialize scores
-    skill_match_score = 0
-    keyword_relevance_score = 0
-    role_alignment_score = 0
-    formatting_score = 0
-    
-    # 1. Skill Match (25 points)
-    skill_match_score = calculate_skill_match(resume_data, job_description)
-    
-    # 2. Keyword Relevance (25 points)
-    keyword_relevance_score = calculate_keyword_relevance(resume_data, job_description, target_role)
-    
-    # 3. Role Alignment (25 points)
-    role_alignment_score = calculate_role_alignment(resume_data, target_role)
-    
-    # 4. Formatting (25 points)
-    formatting_score = calculate_formatting_score(resume_data)
-    
-    # Total score
-    total_score = skill_match_score + keyword_relevance_score + role_alignment_score + formatting_score
-    
-    # Generate explanation
-    explanation = generate_score_explanation(
-        total_score,
-        skill_match_score,
-        keyword_relevance_score,
-        role_alignment_score,
-        formatting_score
-    )
-    
-    return {
-        'score': round(total_score),
-        'skill_match': round(skill_match_score),
-        'keyword_relevance': round(keyword_relevance_score),
-        'role_alignment': round(role_alignment_score),
-        'formatting': round(formatting_score),
-        'explanation': explanation
-    }
+    with span('scoring'):
+        resume_data = as_document(resume_data)
+
+        # 1. Skill Match (25 points)
+        skill_match_score = calculate_skill_match(resume_data, job_description)
+
+        # 2. Keyword Relevance (25 points)
+        keyword_relevance_score = calculate_keyword_relevance(resume_data, job_description, target_role)
+
+        # 3. Role Alignment (25 points)
+        role_alignment_score = calculate_role_alignment(resume_data, target_role)
+
+        # 4. Formatting (25 points)
+        formatting_score = calculate_formatting_score(resume_data)
+
+        # Total score
+        total_score = skill_match_score + keyword_relevance_score + role_alignment_score + formatting_score
+
+        # Generate explanation
+        explanation = generate_score_explanation(
+            total_score,
+            skill_match_score,
+            keyword_relevance_score,
+            role_alignment_score,
+            formatting_score
+        )
+
+        result = {
+            'score': round(total_score),
+            'skill_match': round(skill_match_score),
+            'keyword_relevance': round(keyword_relevance_score),
+            'role_alignment': round(role_alignment_score),
+            'formatting': round(formatting_score),
+            'explanation': explanation
+        }
+
+        # 5. Semantic Match (25 points, optional and outside the total)
+        if similarity.ENABLED:
+            result['semantic_match'] = round(calculate_semantic_match(resume_data, job_description))
+
+        return result
 
 def calculate_skill_match(resume_data, job_description):
     """Calculate how well resume skills match JD"""
@@ -52,10 +80,10 @@ def calculate_skill_match(resume_data, job_description):
         return 20  # Default score if no JD provided
     
     # Extract skills from resume
-    resume_skills = extract_skills_list(resume_data.get('skills', ''))
+    resume_skills = as_document(resume_data).lower_skills
     
     # Extract skills from JD
-    jd_skills = extract_skills_from_text(job_description)
+    jd_skills = jd_features(job_description)[0]
     
     if not jd_skills:
         return 20
@@ -73,17 +101,10 @@ def calculate_keyword_relevance(resume_data, job_description, target_role):
         return 20  # Default score
     
     # Combine all resume text
-    resume_text = ' '.join([
-        str(resume_data.get('summary', '')),
-        str(resume_data.get('skills', '')),
-        str(resume_data.get('experience', '')),
-        str(resume_data.get('projects', ''))
-    ]).lower()
-    
-    jd_text = job_description.lower()
+    resume_text = as_document(resume_data).keyword_text
     
     # Extract important keywords from JD
-    jd_keywords = extract_keywords(jd_text)
+    jd_keywords = jd_features(job_description)[1]
     
     # Count how many JD keywords appear in resume
     matched_keywords = sum(1 for keyword in jd_keywords if keyword in resume_text)
@@ -92,28 +113,29 @@ def calculate_keyword_relevance(resume_data, job_description, target_role):
     
     return keyword_match_rate * 25
 
+def calculate_semantic_match(resume_data, job_description):
+    """
+    Calculate similarity of the resume to the JD from hashed n-gram
+    vectors, which credits related wording ("REST services" against
+    "RESTful APIs") that exact keyword hits miss
+    """
+    
+    if not job_description:
+        return 20  # Default score
+    
+    value = similarity.similarity(as_document(resume_data).keyword_text, job_description)
+    return similarity.similarity_points(value)
+
 def calculate_role_alignment(resume_data, target_role):
     """Calculate how well resume aligns with target role"""
     
-    role_keywords = {
-        'software engineer': ['development', 'programming', 'coding', 'software', 'engineer', 'python', 'java'],
-        'data scientist': ['data', 'analysis', 'machine learning', 'python', 'statistics', 'modeling'],
-        'product manager': ['product', 'strategy', 'roadmap', 'stakeholder', 'agile', 'scrum'],
-        'designer': ['design', 'ui', 'ux', 'figma', 'adobe', 'creative', 'user experience'],
-        'marketing': ['marketing', 'campaign', 'seo', 'content', 'analytics', 'social media']
-    }
-    
-    resume_text = ' '.join([
-        str(resume_data.get('summary', '')),
-        str(resume_data.get('experience', '')),
-        str(resume_data.get('projects', ''))
-    ]).lower()
+    resume_text = as_document(resume_data).role_text
     
     target_role_lower = target_role.lower()
     
     # Find matching role category
     relevant_keywords = []
-    for role, keywords in role_keywords.items():
+    for role, keywords in ROLE_KEYWORDS.items():
         if role in target_role_lower:
             relevant_keywords = keywords
             break
@@ -148,6 +170,153 @@ def calculate_formatting_score(resume_data):
     
     return min(score, 25)
 
+# Functions returning stored (skills, keywords) for a JD text, or None;
+# see add_feature_source
+_feature_sources = []
+
+def add_feature_source(lookup):
+    """
+    Register lookup(job_description) -> (skills, keywords) or None, which
+    jd_features consults before analyzing a JD it hasn't seen (the JD
+    library registers its precomputed features this way)
+    """
+    if lookup not in _feature_sources:
+        _feature_sources.append(lookup)
+    jd_features.cache_clear()
+
+def analyze_jd(job_description):
+    """(skills, top keywords) of a job description, computed from its text"""
+    return frozenset(extract_skills_from_text(job_description)), tuple(extract_keywords(job_description.lower()))
+
+@functools.lru_cache(maxsize=256)
+def jd_features(job_description):
+    """
+    (skills, top keywords) of a job description, cached by its text so a
+    JD that is scored repeatedly is only analyzed once, and read from a
+    feature source when one has it stored
+    """
+    for lookup in _feature_sources:
+        features = lookup(job_description)
+        if features is not None:
+            incr('jd_features_stored')
+            return features
+    return analyze_jd(job_description)
+
+def role_category(text):
+    """
+    The ROLE_KEYWORDS role a text (a JD or a title) is about: the first role
+    named in it, else the role with most whole-word keyword hits (at least
+    two), else ''
+    """
+    text_lower = text.lower()
+    for role in ROLE_KEYWORDS:
+        if role in text_lower:
+            return role
+    words = set(re.findall(r'\b\w+\b', text_lower))
+    hits = {
+        role: sum(1 for keyword in keywords if (keyword in text_lower if ' ' in keyword else keyword in words))
+        for role, keywords in ROLE_KEYWORDS.items()
+    }
+    best = max(hits, key=hits.get)
+    return best if hits[best] >= 2 else ''
+
+def formatting_inputs(resume_data):
+    """The section presence flags calculate_formatting_score looks at"""
+    return tuple(bool(resume_data.get(key)) for key in (
+        'summary', 'skills', 'experience', 'projects', 'education', 'name', 'email', 'phone'
+    ))
+
+class IncrementalScorer:
+    """
+    Re-scores a resume as it is edited, recomputing only the components
+    whose inputs changed since the previous call.
+    
+    Skill match depends on the skills and the JD, keyword relevance on four
+    sections and the JD, role alignment on three sections and the role, and
+    formatting only on which sections are present. JD features are cached
+    by text, and keyword hits are kept per section, so editing one section
+    rescans only that section. Scores are identical to calculate_ats_score.
+    """
+    
+    def __init__(self):
+        self._inputs = {}  # component -> the inputs its score was computed from
+        self._scores = {}
+        self._section_hits = {}  # section -> (text, jd keywords, keywords found)
+        self.recomputed = ()  # components recomputed by the last score() call
+    
+    def score(self, resume_data, job_description, target_role):
+        """Same result as calculate_ats_score(resume_data, job_description, target_role)"""
+        resume = as_document(resume_data)
+        job_description = job_description or ''
+        
+        with span('scoring', mode='incremental'):
+            inputs = {
+                'skill_match': (tuple(resume.skill_list), job_description),
+                'keyword_relevance': (tuple(getattr(resume, key) for key in KEYWORD_SECTIONS), job_description),
+                'role_alignment': (tuple(getattr(resume, key) for key in ROLE_SECTIONS), target_role),
+                'formatting': formatting_inputs(resume),
+            }
+            if similarity.ENABLED:
+                inputs['semantic_match'] = inputs['keyword_relevance']
+            
+            recomputed = []
+            for name, key in inputs.items():
+                if self._inputs.get(name) != key:
+                    self._scores[name] = self._compute(name, resume, job_description, target_role)
+                    self._inputs[name] = key
+                    recomputed.append(name)
+            self.recomputed = tuple(recomputed)
+            incr('components_recomputed', len(recomputed))
+            incr('components_reused', len(inputs) - len(recomputed))
+            
+            scores = self._scores
+            total_score = sum(scores[name] for name in COMPONENTS)
+            result = {
+                'score': round(total_score),
+                'skill_match': round(scores['skill_match']),
+                'keyword_relevance': round(scores['keyword_relevance']),
+                'role_alignment': round(scores['role_alignment']),
+                'formatting': round(scores['formatting']),
+                'explanation': generate_score_explanation(total_score, *(scores[name] for name in COMPONENTS)),
+            }
+            for name in EXTRA_COMPONENTS:
+                result[name] = round(scores[name])
+            return result
+    
+    def _compute(self, name, resume, job_description, target_role):
+        if name == 'skill_match':
+            return calculate_skill_match(resume, job_description)
+        if name == 'keyword_relevance':
+            return self._keyword_relevance(resume, job_description)
+        if name == 'role_alignment':
+            return calculate_role_alignment(resume, target_role)
+        if name == 'semantic_match':
+            return calculate_semantic_match(resume, job_description)
+        return calculate_formatting_score(resume)
+    
+    def _keyword_relevance(self, resume, job_description):
+        """calculate_keyword_relevance, rescanning only sections that changed"""
+        if not job_description:
+            return 20
+        
+        jd_keywords = jd_features(job_description)[1]
+        if not jd_keywords:
+            return 0
+        
+        # Keywords are single words, so matching per section finds exactly
+        # what matching the joined text would
+        matched = set()
+        for key in KEYWORD_SECTIONS:
+            text = getattr(resume, key)
+            cached = self._section_hits.get(key)
+            if cached is None or cached[0] != text or cached[1] != jd_keywords:
+                lower = text.lower()
+                cached = (text, jd_keywords, frozenset(k for k in jd_keywords if k in lower))
+                self._section_hits[key] = cached
+            matched |= cached[2]
+        
+        return len(matched) / len(jd_keywords) * 25
+
 def extract_skills_list(skills_text):
     """Extract individual skills from skills text"""
     if not skills_text:
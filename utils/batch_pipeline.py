@@ -0,0 +1,405 @@
+"""
+Headless end-to-end pipeline over a JSONL file of profiles.
+
+Each profile goes through the same steps as the app's submit handler:
+parse the existing resume (optional), generate, score and render. Every
+stage has its own pool: parsing and rendering are CPU-bound and run in
+process pools, generation waits on the LLM and runs in threads, and scoring
+is cheap enough for one thread. Stages are connected by bounded queues, so
+a slow stage blocks the one feeding it instead of letting work pile up in
+memory.
+
+Progress is checkpointed per item in OUTPUT/checkpoint.jsonl: once when the
+resume is generated and scored, and again when its files are written.
+Re-running with the same output directory skips finished items, renders
+generated ones without calling the LLM again and retries failures.
+
+Usage:
+    python -m utils.batch_pipeline profiles.jsonl -o out/ [--formats pdf,docx] [--layout classic]
+        [--llm-workers 8] [--parse-workers 2] [--render-workers 4] [--queue-size 16]
+
+Each input line holds the form inputs (full_name, email, phone,
+target_role, skills, experience, job_description, ...), plus optionally
+"resume_path" (an existing PDF/DOCX to parse) and "id" (a stable item key;
+by default the key is a digest of the line). Rendered files are written to
+OUTPUT/files. At the end, a table reports each stage's throughput and how
+busy its workers were, so the bottleneck stands out.
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .ai_generator import generate_resume_content
+from .ats_scorer import calculate_ats_score
+from .batch_render import archive_name, FORMATS
+from .log import get_logger
+from .pdf_generator import create_pdf, create_docx, LAYOUTS, DEFAULT_LAYOUT
+from .resume_parser import parse_resume
+
+logger = get_logger(__name__)
+
+GENERATED = 'generated'
+DONE = 'done'
+FAILED = 'failed'
+
+# Marks the end of a stage's input
+_END = object()
+
+# Key of a read_profiles() entry for a line that couldn't be read
+INVALID = '_invalid'
+
+
+def item_key(profile):
+    """Stable key of one input line: its "id", else a digest of its content"""
+    if profile.get('id') is not None:
+        return str(profile['id'])
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def load_checkpoint(path):
+    """{item key: latest checkpoint record}"""
+    records = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A line cut short by an interrupted run
+                records[record['key']] = record
+    return records
+
+
+class Checkpoint:
+    """Append-only JSONL of item records, flushed after every write"""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = load_checkpoint(path)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.records[record['key']] = record
+
+    def close(self):
+        self._file.close()
+
+
+def parse_step(path):
+    """Process worker: the parsed sections of an existing resume file"""
+    with open(path, 'rb') as f:
+        data = parse_resume(f)
+    if data is None:
+        raise ValueError(f"could not extract text from {path}")
+    return data
+
+
+def render_step(index, resume_data, formats, layout, files_dir):
+    """Process worker: write one resume's files; returns their names"""
+    names = []
+    for fmt in formats:
+        data = create_pdf(resume_data, layout=layout) if fmt == 'pdf' else create_docx(resume_data)
+        name = archive_name(index, resume_data, fmt)
+        tmp = os.path.join(files_dir, f'.{name}.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(files_dir, name))
+        names.append(name)
+    return names
+
+
+class Stage:
+    """
+    One pipeline stage: `workers` threads take items from a bounded input
+    queue, run step(item) and pass them on. With processes=True, each
+    thread hands the step's work to this stage's own process pool.
+
+    Items that already failed, or that the stage doesn't apply to
+    (applies(item) is false), pass straight through.
+    """
+
+    def __init__(self, name, step, workers, processes=False, applies=None, queue_size=16):
+        self.name = name
+        self.step = step
+        self.workers = max(1, workers)
+        self.applies = applies or (lambda item: True)
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers) if processes else None
+        self._pool_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._running = self.workers
+        self.items = 0
+        self.failed = 0
+        self.busy = 0.0  # Worker-seconds spent in step()
+        self.blocked = 0.0  # Seconds spent waiting for room downstream
+        self.first_started = None
+        self.last_finished = None
+
+    def submit(self, fn, *args):
+        """Run fn(*args) in this stage's process pool, rebuilding it once if a worker died"""
+        for attempt in range(2):
+            pool = self.pool
+            try:
+                return pool.submit(fn, *args).result()
+            except BrokenProcessPool:
+                with self._pool_lock:
+                    if self.pool is pool:
+                        logger.warning("⚠️ %s worker pool crashed, restarting", self.name)
+                        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+                if attempt:
+                    raise
+
+    def start(self, outbox):
+        self.threads = [
+            threading.Thread(target=self._work, args=(outbox,), name=f'pipeline-{self.name}-{n}', daemon=True)
+            for n in range(self.workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def _work(self, outbox):
+        while True:
+            item = self.inbox.get()
+            if item is _END:
+                self.inbox.put(_END)  # Let the other workers see it too
+                with self._lock:
+                    self._running -= 1
+                    last = self._running == 0
+                if last:
+                    outbox.put(_END)
+                return
+
+            if 'error' not in item and self.applies(item):
+                started = time.perf_counter()
+                try:
+                    self.step(self, item)
+                except Exception as e:
+                    item['error'] = f'{type(e).__name__}: {e}'
+                    item['failed_stage'] = self.name
+                finished = time.perf_counter()
+                with self._lock:
+                    self.items += 1
+                    self.failed += 'error' in item
+                    self.busy += finished - started
+                    self.first_started = min(self.first_started or started, started)
+                    self.last_finished = max(self.last_finished or finished, finished)
+
+            started = time.perf_counter()
+            outbox.put(item)
+            with self._lock:
+                self.blocked += time.perf_counter() - started
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def report(self, elapsed):
+        """Throughput of this stage, and how busy its workers were over the whole run"""
+        active = (self.last_finished - self.first_started) if self.items else 0.0
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'items': self.items,
+            'failed': self.failed,
+            'items_per_second': round(self.items / active, 2) if active > 0 else 0.0,
+            'avg_ms': round(self.busy / self.items * 1000, 1) if self.items else 0.0,
+            'utilization': round(self.busy / (elapsed * self.workers), 3) if elapsed > 0 else 0.0,
+            'blocked_seconds': round(self.blocked, 2),
+        }
+
+
+def run_pipeline(profiles, output_dir, formats=FORMATS, layout=DEFAULT_LAYOUT, llm_workers=8,
+                 parse_workers=None, render_workers=None, queue_size=16):
+    """
+    Run every profile through parse, generate, score and render.
+
+    Returns a stats dict: counts of items done, failed and skipped, elapsed
+    time, items per second and a report per stage (see Stage.report).
+    """
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}")
+
+    cpus = os.cpu_count() or 1
+    files_dir = os.path.join(output_dir, 'files')
+    os.makedirs(files_dir, exist_ok=True)
+    checkpoint = Checkpoint(os.path.join(output_dir, 'checkpoint.jsonl'))
+
+    def record(item, status, **fields):
+        checkpoint.write({'key': item['key'], 'index': item['index'], 'status': status, **fields})
+
+    def parse(stage, item):
+        item['input']['existing_data'] = stage.submit(parse_step, item['input']['resume_path'])
+
+    def generate(stage, item):
+        item['resume'] = generate_resume_content(item['input']).to_dict()
+
+    def score(stage, item):
+        profile = item['input']
+        item['ats_score'] = calculate_ats_score(
+            item['resume'], profile.get('job_description') or '', profile.get('target_role') or ''
+        )
+        record(item, GENERATED, resume=item['resume'], ats_score=item['ats_score'])
+
+    def render(stage, item):
+        item['files'] = stage.submit(render_step, item['index'], item['resume'], tuple(formats), layout, files_dir)
+
+    not_generated = lambda item: 'resume' not in item
+    stages = [
+        Stage('parse', parse, parse_workers or max(1, cpus // 2), processes=True, queue_size=queue_size,
+              applies=lambda item: not_generated(item) and bool(item['input'].get('resume_path'))),
+        Stage('generate', generate, llm_workers, applies=not_generated, queue_size=queue_size),
+        Stage('score', score, 1, applies=lambda item: 'ats_score' not in item, queue_size=queue_size),
+        Stage('render', render, render_workers or cpus, processes=True, queue_size=queue_size),
+    ]
+    results = queue.Queue(maxsize=queue_size)
+    for stage, outbox in zip(stages, [s.inbox for s in stages[1:]] + [results]):
+        stage.start(outbox)
+
+    stats = {'done': 0, 'failed': 0, 'skipped': 0, 'resumed': 0}
+    started = time.perf_counter()
+
+    feed_errors = []
+
+    def feed():
+        # Runs in its own thread; blocks whenever the parse queue is full.
+        # _END is always sent, so the stages and the loop below finish even
+        # if reading the input fails.
+        try:
+            for index, profile in enumerate(profiles):
+                if INVALID in profile:
+                    # Passes through every stage and is recorded as failed
+                    stages[0].inbox.put({
+                        'key': f"line-{profile['line']}", 'index': index, 'input': {},
+                        'error': profile[INVALID], 'failed_stage': 'input',
+                    })
+                    continue
+                key = item_key(profile)
+                previous = checkpoint.records.get(key)
+                if previous and previous['status'] == DONE:
+                    stats['skipped'] += 1
+                    continue
+                item = {'key': key, 'index': index, 'input': profile}
+                if previous and previous['status'] == GENERATED:
+                    item['resume'], item['ats_score'] = previous['resume'], previous['ats_score']
+                    stats['resumed'] += 1
+                stages[0].inbox.put(item)
+        except Exception as e:
+            feed_errors.append(e)
+        finally:
+            stages[0].inbox.put(_END)
+
+    feeder = threading.Thread(target=feed, name='pipeline-feed', daemon=True)
+    feeder.start()
+
+    try:
+        while True:
+            item = results.get()
+            if item is _END:
+                break
+            if 'error' in item:
+                stats['failed'] += 1
+                record(item, FAILED, stage=item['failed_stage'], error=item['error'])
+            else:
+                stats['done'] += 1
+                record(item, DONE, ats_score=item['ats_score']['score'], files=item['files'])
+
+            processed = stats['done'] + stats['failed']
+            if processed % 100 == 0:
+                rate = processed / (time.perf_counter() - started)
+                print(f"🔄 {processed} items ({rate:.1f} items/s)", file=sys.stderr)
+        feeder.join()
+        if feed_errors:
+            raise feed_errors[0]
+    finally:
+        for stage in stages:
+            stage.shutdown()
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - started
+    processed = stats['done'] + stats['failed']
+    stats['elapsed'] = round(elapsed, 2)
+    stats['items_per_second'] = round(processed / elapsed, 2) if elapsed > 0 else 0.0
+    stats['stages'] = [stage.report(elapsed) for stage in stages]
+    return stats
+
+
+def read_profiles(path):
+    """
+    Yield one profile dict per non-empty line. A line that isn't a JSON
+    object is yielded as {INVALID: <reason>, 'line': <line number>}, which
+    run_pipeline records as a failed item.
+    """
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                profile = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {INVALID: f'invalid JSON on line {number}: {e}', 'line': number}
+                continue
+            if not isinstance(profile, dict):
+                yield {INVALID: f'line {number} is not a JSON object', 'line': number}
+                continue
+            yield profile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate, score and render resumes for a JSONL file of profiles")
+    parser.add_argument('input', help="JSONL file with one profile (form inputs) per line")
+    parser.add_argument('-o', '--output', required=True, help="Output directory (checkpoint and files; reused to resume)")
+    parser.add_argument('-f', '--formats', default='pdf,docx', help="Comma-separated formats: pdf, docx")
+    parser.add_argument('-l', '--layout', default=DEFAULT_LAYOUT, choices=sorted(LAYOUTS), help="PDF layout")
+    parser.add_argument('--llm-workers', type=int, default=8, help="Concurrent generation threads")
+    parser.add_argument('--parse-workers', type=int, default=None, help="Parser processes (default: half the CPUs)")
+    parser.add_argument('--render-workers', type=int, default=None, help="Renderer processes (default: CPU count)")
+    parser.add_argument('--queue-size', type=int, default=16, help="Items buffered between two stages")
+    args = parser.parse_args(argv)
+
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    try:
+        stats = run_pipeline(
+            read_profiles(args.input), args.output, formats=formats, layout=args.layout,
+            llm_workers=args.llm_workers, parse_workers=args.parse_workers,
+            render_workers=args.render_workers, queue_size=args.queue_size,
+        )
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    print(
+        f"✅ Done: {stats['done']} done, {stats['failed']} failed, {stats['skipped']} already done, "
+        f"{stats['resumed']} resumed after generation, in {stats['elapsed']}s ({stats['items_per_second']} items/s)",
+        file=sys.stderr
+    )
+    print(f"  {'stage':<10}{'workers':>8}{'items':>8}{'items/s':>10}{'avg ms':>10}{'busy':>8}{'blocked s':>11}",
+          file=sys.stderr)
+    for report in stats['stages']:
+        print(
+            f"  {report['stage']:<10}{report['workers']:>8}{report['items']:>8}{report['items_per_second']:>10}"
+            f"{report['avg_ms']:>10}{report['utilization']:>8.0%}{report['blocked_seconds']:>11}",
+            file=sys.stderr
+        )
+    busiest = max(stats['stages'], key=lambda report: report['utilization'])
+    if busiest['items']:
+        print(f"🐢 Bottleneck: {busiest['stage']} ({busiest['utilization']:.0%} busy)", file=sys.stderr)
+    return 1 if stats['failed'] and not stats['done'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
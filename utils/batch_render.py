@@ -0,0 +1,157 @@
+"""
+Batch PDF/DOCX rendering.
+
+Renders many resume dicts across a process pool and streams the files into
+a ZIP archive as they finish, so memory use stays flat no matter how many
+resumes are exported.
+
+Usage:
+    python -m utils.batch_render resumes.jsonl -o resumes.zip [--formats pdf,docx] [--layout classic]
+
+Each input line is one resume dict as returned by generate_resume_content.
+Pass "-o -" to write the archive to stdout.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+import zipfile
+
+from .pdf_generator import create_pdf, create_docx, LAYOUTS, DEFAULT_LAYOUT
+from .workers import imap_unordered
+
+FORMATS = ('pdf', 'docx')
+
+# Key of the placeholder read_jsonl yields for a line it cannot read
+INVALID = '_invalid'
+
+
+def archive_name(index, resume_data, fmt):
+    """Stable, filesystem-safe name for one rendered file"""
+    name = re.sub(r'[^A-Za-z0-9]+', '_', str(resume_data.get('name') or 'Resume')).strip('_') or 'Resume'
+    return f"{index:05d}_{name}_Resume.{fmt}"
+
+
+def render_one(index, resume_data, formats, layout):
+    """Worker entry point: render one resume to every requested format"""
+    files = {}
+    for fmt in formats:
+        if fmt == 'pdf':
+            files[archive_name(index, resume_data, fmt)] = create_pdf(resume_data, layout=layout)
+        else:
+            files[archive_name(index, resume_data, fmt)] = create_docx(resume_data)
+    return index, files
+
+
+def render_batch(resumes, output, formats=FORMATS, layout=DEFAULT_LAYOUT, workers=None, max_in_flight=None):
+    """
+    Render an iterable of resume dicts into a ZIP archive.
+
+    output is a path or a writable binary file object (it does not need to
+    be seekable). Files are written to the archive as each resume finishes;
+    failures are listed in errors.jsonl inside the archive and returned.
+
+    Returns a stats dict: counts, bytes written, elapsed time, resumes per
+    second and the list of per-item errors.
+    """
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}")
+
+    stats = {'rendered': 0, 'failed': 0, 'files': 0, 'bytes': 0, 'errors': []}
+    started = time.perf_counter()
+
+    def tasks():
+        for index, resume_data in enumerate(resumes):
+            if isinstance(resume_data, dict) and INVALID in resume_data:
+                # Unreadable input line: listed with the other failures
+                stats['failed'] += 1
+                stats['errors'].append({'index': index, 'error': resume_data[INVALID]})
+                continue
+            yield index, resume_data, tuple(formats), layout
+
+    # PDF content streams and DOCX packages are already compressed
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for (index, _, _, _), result, error in imap_unordered(render_one, tasks(), workers, max_in_flight):
+            if error is not None:
+                stats['failed'] += 1
+                stats['errors'].append({'index': index, 'error': f'{type(error).__name__}: {error}'})
+                continue
+
+            _, files = result
+            for name, data in files.items():
+                archive.writestr(name, data)
+                stats['files'] += 1
+                stats['bytes'] += len(data)
+            stats['rendered'] += 1
+
+            done = stats['rendered'] + stats['failed']
+            if done % 100 == 0:
+                rate = done / (time.perf_counter() - started)
+                print(f"🔄 {done} resumes ({rate:.1f} resumes/s)", file=sys.stderr)
+
+        if stats['errors']:
+            archive.writestr('errors.jsonl', ''.join(json.dumps(e) + '\n' for e in stats['errors']))
+
+    elapsed = time.perf_counter() - started
+    total = stats['rendered'] + stats['failed']
+    stats['elapsed'] = round(elapsed, 2)
+    stats['resumes_per_second'] = round(total / elapsed, 2) if elapsed > 0 else 0.0
+    return stats
+
+
+def read_jsonl(path):
+    """
+    Yield one resume dict per non-empty line ("-" reads stdin). A line that
+    isn't a JSON object is yielded as {INVALID: <reason>}, which
+    render_batch records as a failed item.
+    """
+    stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                resume_data = json.loads(line)
+            except ValueError as e:
+                yield {INVALID: f'invalid JSON on line {number}: {e}'}
+                continue
+            if not isinstance(resume_data, dict):
+                yield {INVALID: f'line {number} is not a JSON object'}
+                continue
+            yield resume_data
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a JSONL file of resumes into a ZIP of PDF/DOCX files")
+    parser.add_argument('input', help="JSONL file with one resume dict per line (- for stdin)")
+    parser.add_argument('-o', '--output', required=True, help="ZIP file to write (- for stdout)")
+    parser.add_argument('-f', '--formats', default='pdf,docx', help="Comma-separated formats: pdf, docx")
+    parser.add_argument('-l', '--layout', default=DEFAULT_LAYOUT, choices=sorted(LAYOUTS), help="PDF layout")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    output = sys.stdout.buffer if args.output == '-' else args.output
+
+    stats = render_batch(read_jsonl(args.input), output, formats=formats, layout=args.layout, workers=args.workers)
+
+    print(
+        f"✅ Done: {stats['rendered']} rendered, {stats['failed']} failed, {stats['files']} files "
+        f"({stats['bytes'] / (1024 * 1024):.1f} MB) in {stats['elapsed']}s "
+        f"({stats['resumes_per_second']} resumes/s)",
+        file=sys.stderr
+    )
+    for error in stats['errors'][:20]:
+        print(f"  ❌ #{error['index']}: {error['error']}", file=sys.stderr)
+    return 1 if stats['failed'] and not stats['rendered'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Bulk resume ingestion.
+
+Walks a directory of PDF/DOCX resumes, parses them in a process pool and
+streams one JSON line per file to the output as results come in.
+
+Usage:
+    python -m utils.bulk_ingest RESUME_DIR -o parsed.jsonl [--workers 8] [--timeout 30]
+
+Re-running with the same output file skips every file already parsed
+successfully, so an interrupted import can simply be started again; files
+that failed or timed out are retried and get a new line.
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import sys
+import time
+from .resume_parser import parse_resume
+from .workers import imap_unordered, WorkerCrashed
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+
+class ParseTimeout(BaseException):
+    """
+    Raised inside a worker when a single file exceeds its time budget.
+    A BaseException, like KeyboardInterrupt, so the parsers' `except
+    Exception` handlers cannot turn it into an ordinary parse error.
+    """
+
+
+def find_resume_files(root):
+    """Yield PDF/DOCX paths under root in a stable order"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                yield os.path.join(dirpath, filename)
+
+
+def file_digest(path):
+    """SHA-256 of the file contents, used as the resume identity"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_done_digests(output_path):
+    """
+    Collect digests of files already parsed successfully in an existing
+    output file; failed and timed-out files are left out so they are retried
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Truncated last line from an interrupted run
+            if record.get('digest') and record.get('status') == 'ok':
+                done.add(record['digest'])
+    return done
+
+
+def _raise_timeout(signum, frame):
+    raise ParseTimeout()
+
+
+def parse_file(path, digest, timeout):
+    """
+    Worker entry point: parse one file and return a JSON-safe record.
+    Never raises, so one bad resume cannot fail the batch.
+    """
+    started = time.perf_counter()
+    record = {'path': path, 'digest': digest}
+
+    use_alarm = timeout and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        with open(path, 'rb') as f:
+            data = parse_resume(f)
+        if data is None:
+            record['status'] = 'error'
+            record['error'] = 'could not extract text'
+        else:
+            record['status'] = 'ok'
+            record['data'] = data
+    except ParseTimeout:
+        record['status'] = 'timeout'
+        record['error'] = f'exceeded {timeout}s'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    record['elapsed'] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def ingest(root, output_path, workers=None, timeout=30, max_in_flight=None):
+    """
+    Parse every resume under root into output_path (JSONL, appended).
+
+    Returns a stats dict with counts per status and files per second.
+    """
+    done = load_done_digests(output_path)
+
+    stats = {'ok': 0, 'error': 0, 'timeout': 0, 'crashed': 0, 'skipped': 0}
+    pending = []
+    for path in find_resume_files(root):
+        try:
+            digest = file_digest(path)
+        except OSError as e:
+            print(f"⚠️ Cannot read {path}: {e}", file=sys.stderr)
+            stats['error'] += 1
+            continue
+        if digest in done:
+            stats['skipped'] += 1
+        else:
+            pending.append((path, digest))
+            done.add(digest)  # Identical copies in the tree are parsed once
+
+    print(f"📂 {len(pending)} files to parse, {stats['skipped']} already done", file=sys.stderr)
+
+    started = time.perf_counter()
+    processed = 0
+
+    with open(output_path, 'a', encoding='utf-8') as out:
+        tasks = ((path, digest, timeout) for path, digest in pending)
+        for (path, digest, _), record, error in imap_unordered(parse_file, tasks, workers, max_in_flight):
+            if error is not None:
+                status = 'crashed' if isinstance(error, WorkerCrashed) else 'error'
+                record = {'path': path, 'digest': digest, 'status': status, 'error': f'{type(error).__name__}: {error}'}
+
+            status = record.get('status', 'error')
+            stats[status] = stats.get(status, 0) + 1
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+
+            processed += 1
+            if processed % 100 == 0:
+                rate = processed / (time.perf_counter() - started)
+                print(f"🔄 {processed}/{len(pending)} files ({rate:.1f} files/s)", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    stats['processed'] = processed
+    stats['elapsed'] = round(elapsed, 2)
+    stats['files_per_second'] = round(processed / elapsed, 2) if elapsed > 0 else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-parse a directory of PDF/DOCX resumes into JSONL")
+    parser.add_argument('root', help="Directory to scan for .pdf/.docx files")
+    parser.add_argument('-o', '--output', required=True, help="JSONL output file (appended, used for resume)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('-t', '--timeout', type=float, default=30, help="Per-file timeout in seconds")
+    args = parser.parse_args(argv)
+
+    stats = ingest(args.root, args.output, workers=args.workers, timeout=args.timeout)
+
+    print(
+        f"✅ Done: {stats['ok']} ok, {stats['error']} errors, {stats['timeout']} timeouts, "
+        f"{stats['crashed']} crashed, {stats['skipped']} skipped "
+        f"in {stats['elapsed']}s ({stats['files_per_second']} files/s)",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""
+Shared local paths.
+
+Everything the app persists on the local disk (job state, artifacts,
+profiles, the JD library) lives under RESUME_DATA_DIR.
+"""
+import os
+
+DATA_DIR = os.getenv('RESUME_DATA_DIR', '.resume_data')
+
+
+def data_path(*parts):
+    """Path under DATA_DIR, creating the parent directory if needed"""
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return path
@@ -0,0 +1,162 @@
+"""
+Template-based DOCX writer.
+
+python-docx builds an lxml tree for every heading, paragraph and run, then
+serialises and compresses the whole package (including its 350 KB
+styles.xml) on every save. Only word/document.xml differs between resumes,
+so this writer builds the static package once per process, already
+compressed, and per render only streams document.xml as escaped XML and
+appends it to a copy of that package.
+"""
+import io
+import re
+import threading
+import zipfile
+
+from .metrics import incr
+from .render_cache import SectionCache
+from .resume_model import as_document, escape_markup, ENTRY_SECTIONS
+
+DOCUMENT_PART = 'word/document.xml'
+
+# Same margins and title colour as the python-docx renderer
+MARGIN_INCHES = 0.75
+TITLE_COLOR = '1E88E5'
+
+# Control characters that are not allowed anywhere in XML 1.0
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_template = None
+_template_lock = threading.Lock()
+
+# Rendered paragraph XML per section, reused while a section's text is unchanged
+_section_cache = SectionCache()
+
+
+class DocxTemplate:
+    """The static parts of a resume .docx, prepared once per process"""
+
+    def __init__(self):
+        from docx import Document
+        from docx.shared import Inches
+
+        doc = Document()
+        for section in doc.sections:
+            section.top_margin = Inches(MARGIN_INCHES)
+            section.bottom_margin = Inches(MARGIN_INCHES)
+            section.left_margin = Inches(MARGIN_INCHES)
+            section.right_margin = Inches(MARGIN_INCHES)
+
+        saved = io.BytesIO()
+        doc.save(saved)
+
+        # Split the empty document.xml around its body so each render only
+        # has to produce the paragraphs in between
+        with zipfile.ZipFile(saved) as package:
+            document_xml = package.read(DOCUMENT_PART).decode('utf-8')
+            body_start = document_xml.index('<w:body>') + len('<w:body>')
+            sect_start = document_xml.index('<w:sectPr')
+            self.document_head = document_xml[:body_start]
+            self.document_tail = document_xml[sect_start:]
+
+            # Everything except document.xml, compressed once
+            static = io.BytesIO()
+            with zipfile.ZipFile(static, 'w', compression=zipfile.ZIP_DEFLATED) as out:
+                for info in package.infolist():
+                    if info.filename != DOCUMENT_PART:
+                        out.writestr(info, package.read(info.filename))
+            self.static_package = static.getvalue()
+
+    def render(self, body_xml):
+        """Zip body paragraphs together with the cached static parts"""
+        buffer = io.BytesIO(self.static_package)
+        with zipfile.ZipFile(buffer, 'a', compression=zipfile.ZIP_DEFLATED) as package:
+            package.writestr(DOCUMENT_PART, self.document_head + body_xml + self.document_tail)
+        return buffer.getvalue()
+
+
+def get_template():
+    """Return the process-wide DocxTemplate, building it on first use"""
+    global _template
+    if _template is not None:
+        incr('cache_hits')
+        return _template
+
+    incr('cache_misses')
+    with _template_lock:
+        if _template is None:
+            _template = DocxTemplate()
+    return _template
+
+
+def xml_text(text):
+    """Escape text for a w:t element"""
+    return escape_markup(_INVALID_XML_CHARS.sub('', str(text)))
+
+
+def paragraph(text, style=None, align=None, bold=False, color=None):
+    """One w:p element as a string"""
+    ppr = ''
+    if style or align:
+        ppr = '<w:pPr>'
+        if style:
+            ppr += f'<w:pStyle w:val="{style}"/>'
+        if align:
+            ppr += f'<w:jc w:val="{align}"/>'
+        ppr += '</w:pPr>'
+
+    rpr = ''
+    if bold or color:
+        rpr = '<w:rPr>'
+        if bold:
+            rpr += '<w:b/>'
+        if color:
+            rpr += f'<w:color w:val="{color}"/>'
+        rpr += '</w:rPr>'
+
+    return f'<w:p>{ppr}<w:r>{rpr}<w:t xml:space="preserve">{xml_text(text)}</w:t></w:r></w:p>'
+
+
+def section_paragraphs(resume, key):
+    """Paragraph XML for one section's content (heading not included)"""
+    if key == 'skills':
+        return paragraph(', '.join(resume.skill_list))
+
+    parts = []
+    if key in ENTRY_SECTIONS:
+        for entry in resume.entries[key]:
+            if entry.heading:
+                parts.append(paragraph(entry.heading, bold=True))
+            for detail in entry.details:
+                parts.append(paragraph(detail))
+            for bullet in entry.bullets:
+                parts.append(paragraph(bullet, style='ListBullet'))
+    else:
+        style = 'ListBullet' if key == 'certifications' else None
+        for line in resume.lines[key]:
+            parts.append(paragraph(line, style=style))
+    return ''.join(parts)
+
+
+def write_docx(resume_data, sections):
+    """
+    Build the .docx bytes for a resume.
+
+    sections is the ordered list of (resume_data key, heading text) pairs
+    to include when present.
+    """
+    resume = as_document(resume_data)
+    template = get_template()
+
+    body = [
+        paragraph(resume.name or 'Your Name', style='Title', align='center', color=TITLE_COLOR),
+        paragraph(f"{resume.phone} | {resume.email}", align='center'),
+    ]
+
+    for key, title in sections:
+        if not resume[key]:
+            continue
+        body.append(paragraph(title, style='Heading1'))
+        body.append(_section_cache.get('docx', key, resume[key], lambda: section_paragraphs(resume, key)))
+
+    return template.render(''.join(body))
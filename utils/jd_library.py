@@ -0,0 +1,295 @@
+"""
+Local job description library with full-text search.
+
+JDs live in SQLite (RESUME_DATA_DIR/jd_library.sqlite3) with an FTS5 index
+over title, company and text, so a search over tens of thousands of
+postings takes milliseconds. Each row also stores the features the scorer
+needs (skills, top keywords) and its role category, computed once at
+import. The library registers itself as a feature source for
+ats_scorer.jd_features, so scoring a JD that is in the library reads the
+stored features instead of analyzing the text again.
+
+Usage:
+    python -m utils.jd_library import jds.jsonl [--batch-size 1000]
+    python -m utils.jd_library search "python django" [-n 10] [--role "software engineer"]
+    python -m utils.jd_library stats
+
+Each JSONL line is {"job_description": ..., "title": ..., "company": ...};
+only job_description is required ("text" and "description" also work).
+Postings whose text is already in the library are skipped.
+"""
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from . import ats_scorer
+from .config import data_path
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the feature extraction changes; stored features are then
+# recomputed the next time the library is opened
+FEATURES_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jds (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    role_category TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jds_role ON jds (role_category);
+CREATE VIRTUAL TABLE IF NOT EXISTS jds_fts USING fts5(
+    title, company, text, content='jds', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jds_ai AFTER INSERT ON jds BEGIN
+    INSERT INTO jds_fts (rowid, title, company, text) VALUES (new.id, new.title, new.company, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS jds_ad AFTER DELETE ON jds BEGIN
+    INSERT INTO jds_fts (jds_fts, rowid, title, company, text) VALUES ('delete', old.id, old.title, old.company, old.text);
+END;
+"""
+
+_TOKEN = re.compile(r'\w+')
+
+
+def digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def fts_query(query):
+    """Free text as an FTS5 query: every word must match, the last one as a prefix"""
+    tokens = _TOKEN.findall(query or '')
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def features_row(text):
+    """(skills, keywords, role category) columns for a JD text"""
+    skills, keywords = ats_scorer.analyze_jd(text)
+    return json.dumps(sorted(skills)), json.dumps(list(keywords)), ats_scorer.role_category(text)
+
+
+def posting(record, index=1):
+    """(title, company, text) of an import record, or None if it has no text"""
+    text = (record.get('job_description') or record.get('text') or record.get('description') or '').strip()
+    if not text:
+        return None
+    title = (record.get('title') or '').strip() or text.splitlines()[0].strip()[:80] or f'Job {index}'
+    return title, (record.get('company') or '').strip(), text
+
+
+class JDLibrary:
+    """SQLite-backed JD store with FTS5 search and precomputed scoring features"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or data_path('jd_library.sqlite3')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.executescript(SCHEMA)
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != FEATURES_VERSION:
+            self.refresh_features()
+        ats_scorer.add_feature_source(self.stored_features)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def refresh_features(self):
+        """Recompute every row's stored features with the current extraction"""
+        with self._lock:
+            rows = self._conn.execute('SELECT id, text FROM jds').fetchall()
+            self._conn.execute('BEGIN')
+            self._conn.executemany(
+                'UPDATE jds SET skills = ?, keywords = ?, role_category = ? WHERE id = ?',
+                [(*features_row(text), row_id) for row_id, text in rows]
+            )
+            self._conn.execute(f'PRAGMA user_version = {FEATURES_VERSION}')
+            self._conn.execute('COMMIT')
+        if rows:
+            logger.info("🔁 Recomputed features for %d library JDs", len(rows))
+
+    def add(self, job_description, title='', company=''):
+        """Store one JD; returns its ID (the existing one if the text is already stored)"""
+        return self.add_many([{'job_description': job_description, 'title': title, 'company': company}])[0]
+
+    def add_many(self, records):
+        """
+        Store JD records in one transaction; returns their IDs in order,
+        None for records without text
+        """
+        now = time.time()
+        entries = [posting(record, index) for index, record in enumerate(records, 1)]
+        digests = {digest(entry[2]): entry for entry in entries if entry is not None}
+        placeholders = ','.join('?' * len(digests))
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                # Features are only computed for texts not stored yet
+                ids = dict(self._conn.execute(
+                    f"SELECT digest, id FROM jds WHERE digest IN ({placeholders})", list(digests)
+                ).fetchall()) if digests else {}
+                rows = [
+                    (key, *entry, *features_row(entry[2]), now)
+                    for key, entry in digests.items() if key not in ids
+                ]
+                for row in rows:
+                    ids[row[0]] = self._conn.execute(
+                        'INSERT INTO jds (digest, title, company, text, skills, keywords, role_category, '
+                        'created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        row
+                    ).lastrowid
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return [None if entry is None else ids[digest(entry[2])] for entry in entries]
+
+    def import_jsonl(self, path, batch_size=1000):
+        """Bulk import a JSONL file; returns (added, skipped) counts"""
+        before = self.count()
+        seen = 0
+        batch = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    self.add_many(batch)
+                    seen += len(batch)
+                    batch = []
+        if batch:
+            self.add_many(batch)
+            seen += len(batch)
+        added = self.count() - before
+        return added, seen - added
+
+    def search(self, query='', limit=20, role=None):
+        """
+        Best matches for a free-text query as [{'id', 'title', 'company',
+        'role_category', 'snippet'}], most relevant first; the most recently
+        added JDs when the query is empty. role filters by role category.
+        """
+        match = fts_query(query)
+        role_filter = ' AND jds.role_category = ?' if role else ''
+        role_params = (role,) if role else ()
+        if match is None:
+            rows = self._execute(
+                f"SELECT id, title, company, role_category, substr(text, 1, 160) FROM jds "
+                f"WHERE 1{role_filter} ORDER BY id DESC LIMIT ?",
+                (*role_params, limit)
+            ).fetchall()
+        else:
+            rows = self._execute(
+                "SELECT jds.id, jds.title, jds.company, jds.role_category, "
+                "snippet(jds_fts, 2, '**', '**', '…', 16) FROM jds_fts JOIN jds ON jds.id = jds_fts.rowid "
+                f"WHERE jds_fts MATCH ?{role_filter} ORDER BY bm25(jds_fts, 10.0, 2.0, 1.0) LIMIT ?",
+                (match, *role_params, limit)
+            ).fetchall()
+        return [
+            {'id': row[0], 'title': row[1], 'company': row[2], 'role_category': row[3], 'snippet': row[4]}
+            for row in rows
+        ]
+
+    def get(self, jd_id):
+        """Stored JD as a dict with its features, or None if unknown"""
+        row = self._execute(
+            'SELECT id, title, company, text, skills, keywords, role_category FROM jds WHERE id = ?', (jd_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'title': row[1],
+            'company': row[2],
+            'job_description': row[3],
+            'skills': json.loads(row[4]),
+            'keywords': json.loads(row[5]),
+            'role_category': row[6],
+        }
+
+    def stored_features(self, job_description):
+        """(skills, keywords) as ats_scorer.jd_features returns them, or None if not stored"""
+        row = self._execute(
+            'SELECT skills, keywords FROM jds WHERE digest = ?', (digest(job_description),)
+        ).fetchone()
+        if row is None:
+            return None
+        return frozenset(json.loads(row[0])), tuple(json.loads(row[1]))
+
+    def count(self):
+        return self._execute('SELECT COUNT(*) FROM jds').fetchone()[0]
+
+    def role_counts(self):
+        """{role category: number of JDs}, '' for uncategorized"""
+        return dict(self._execute('SELECT role_category, COUNT(*) FROM jds GROUP BY role_category').fetchall())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def get_library():
+    """The process-wide library, opened on first use"""
+    global _library
+    if _library is None:
+        with _library_lock:
+            if _library is None:
+                _library = JDLibrary()
+    return _library
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local job description library")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="Bulk import JDs from JSONL")
+    import_parser.add_argument('path')
+    import_parser.add_argument('--batch-size', type=int, default=1000, help="JDs per transaction")
+    search_parser = commands.add_parser('search', help="Full-text search")
+    search_parser.add_argument('query')
+    search_parser.add_argument('-n', '--limit', type=int, default=10)
+    search_parser.add_argument('--role', choices=sorted(ats_scorer.ROLE_KEYWORDS), help="Only this role category")
+    commands.add_parser('stats', help="JD counts by role category")
+    args = parser.parse_args(argv)
+
+    library = get_library()
+    if args.command == 'import':
+        started = time.perf_counter()
+        added, skipped = library.import_jsonl(args.path, batch_size=args.batch_size)
+        print(f"📚 Imported {added} JDs ({skipped} already stored or empty) in "
+              f"{time.perf_counter() - started:.1f}s; {library.count()} in the library")
+    elif args.command == 'search':
+        for hit in library.search(args.query, limit=args.limit, role=args.role):
+            company = f" @ {hit['company']}" if hit['company'] else ''
+            print(f"  {hit['id']:6d}  {hit['title']}{company}  [{hit['role_category'] or '-'}]")
+            print(f"          {hit['snippet']}")
+    else:
+        print(f"📚 {library.count()} JDs")
+        for role, count in sorted(library.role_counts().items(), key=lambda item: -item[1]):
+            print(f"  {count:7d}  {role or 'uncategorized'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Local background job queue with durable SQLite state.
+
+The Streamlit app enqueues a generation job and polls for its result
+instead of blocking the session's script thread for the whole LLM call.
+Job state lives in SQLite, so a browser refresh or a reconnect can pick the
+result up again by job ID. Running jobs are heartbeated by the process
+running them; a job whose heartbeat stops (its process died or restarted)
+is re-queued by any live process sharing the database within
+RESUME_JOB_STALE_SECONDS. One worker pool per process caps concurrent LLM calls across
+all sessions.
+
+A job may be submitted with a provisional result (e.g. a locally built
+resume to show while the LLM call waits and runs); it is stored alongside
+the final result and returned by get() as 'provisional'.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import data_path
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# How often a process refreshes updated_at on the jobs it is running and
+# looks for jobs orphaned by a dead one
+HEARTBEAT_SECONDS = float(os.getenv('RESUME_JOB_HEARTBEAT_SECONDS', '10'))
+
+# Running jobs not heartbeated for this long are assumed orphaned by a dead process
+STALE_AFTER_SECONDS = float(os.getenv('RESUME_JOB_STALE_SECONDS', '60'))
+
+# Finished jobs are deleted after this long
+RETENTION_SECONDS = int(os.getenv('RESUME_JOB_RETENTION_HOURS', '24')) * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    provisional TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+
+class JobQueue:
+    """
+    Run runner(payload, slot) for submitted payloads on a bounded thread
+    pool, recording each job's status and JSON result in SQLite.
+    """
+
+    def __init__(self, runner, db_path=None, max_workers=4):
+        self.runner = runner
+        self.db_path = db_path or data_path('jobs.sqlite3')
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-job')
+        self._running = set()
+        self._stopped = threading.Event()
+        self._recover()
+        self._watcher = threading.Thread(target=self._watch, name='resume-job-heartbeat', daemon=True)
+        self._watcher.start()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _migrate(self):
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        if 'provisional' not in columns:
+            self._conn.execute('ALTER TABLE jobs ADD COLUMN provisional TEXT')
+
+    def _recover(self):
+        """Re-queue orphaned jobs, drop expired ones and resume the backlog"""
+        self._requeue_stale()
+        self._execute(
+            'DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?',
+            (DONE, FAILED, time.time() - RETENTION_SECONDS)
+        )
+        rows = self._execute('SELECT id FROM jobs WHERE status = ? ORDER BY created_at', (QUEUED,)).fetchall()
+        for (job_id,) in rows:
+            self._executor.submit(self._run, job_id)
+
+    def _requeue_stale(self):
+        """Re-queue and schedule running jobs whose heartbeat has stopped"""
+        cutoff = time.time() - STALE_AFTER_SECONDS
+        rows = self._execute(
+            'SELECT id FROM jobs WHERE status = ? AND updated_at < ?', (RUNNING, cutoff)
+        ).fetchall()
+        for (job_id,) in rows:
+            # Conditional, so only one process re-queues a given job
+            requeued = self._execute(
+                'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ? AND updated_at < ?',
+                (QUEUED, time.time(), job_id, RUNNING, cutoff)
+            ).rowcount
+            if requeued:
+                logger.warning("⚠️ Job %s was orphaned by a stopped process; re-queued", job_id)
+                self._executor.submit(self._run, job_id)
+
+    def _heartbeat(self):
+        with self._lock:
+            running = list(self._running)
+        if running:
+            placeholders = ','.join('?' * len(running))
+            self._execute(
+                f'UPDATE jobs SET updated_at = ? WHERE status = ? AND id IN ({placeholders})',
+                (time.time(), RUNNING, *running)
+            )
+
+    def _watch(self):
+        while not self._stopped.wait(HEARTBEAT_SECONDS):
+            try:
+                self._heartbeat()
+                self._requeue_stale()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    def submit(self, payload, provisional=None, slot=None):
+        """
+        Store a new job and schedule it; returns the job ID. provisional is
+        a result to show until the job finishes, available from get() at once.
+        slot is the job's admission slot (utils.admission), handed to the
+        runner but never stored: a job recovered after a restart runs
+        without one and is admitted when it runs.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            'INSERT INTO jobs (id, status, payload, provisional, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (job_id, QUEUED, json.dumps(payload), json.dumps(provisional) if provisional else None, now, now)
+        )
+        self._executor.submit(self._run, job_id, slot)
+        return job_id
+
+    def get(self, job_id):
+        """Job as a dict (status, result, provisional, error, timestamps), or None if unknown"""
+        row = self._execute(
+            'SELECT id, status, result, provisional, error, created_at, updated_at FROM jobs WHERE id = ?',
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'status': row[1],
+            'result': json.loads(row[2]) if row[2] else None,
+            'provisional': json.loads(row[3]) if row[3] else None,
+            'error': row[4],
+            'created_at': row[5],
+            'updated_at': row[6],
+        }
+
+    def pending_count(self):
+        """Jobs waiting for or holding a worker"""
+        row = self._execute('SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)', (QUEUED, RUNNING)).fetchone()
+        return row[0]
+
+    def queued_count(self):
+        """Jobs waiting for a worker"""
+        row = self._execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (QUEUED,)).fetchone()
+        return row[0]
+
+    def _run(self, job_id, slot=None):
+        # Claim atomically, so two processes sharing the database never run
+        # the same job
+        claimed = self._execute(
+            'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?',
+            (RUNNING, time.time(), job_id, QUEUED)
+        ).rowcount
+        if not claimed:
+            if slot is not None:
+                slot.release()
+            return
+
+        with self._lock:
+            self._running.add(job_id)
+        try:
+            self._execute_job(job_id, slot)
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+
+    def _execute_job(self, job_id, slot):
+        row = self._execute('SELECT payload FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        try:
+            result = self.runner(json.loads(row[0]), slot)
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            self._execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?',
+                (FAILED, f'{type(e).__name__}: {e}', time.time(), job_id)
+            )
+            return
+
+        self._execute(
+            'UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?',
+            (DONE, json.dumps(result), time.time(), job_id)
+        )
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        self._watcher.join()
+        self._executor.shutdown(wait=wait)
+        with self._lock:
+            self._conn.close()
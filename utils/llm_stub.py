@@ -0,0 +1,236 @@
+"""
+Deterministic local stand-in for the Gemini API.
+
+Select it with RESUME_LLM_BACKEND=stub. The response is built from the
+candidate fields in the prompt, in the section format parse_ai_response
+expects, and any variation is seeded from a hash of the prompt, so the same
+input always produces the same resume. Benchmarks and load tests use it to
+run offline and reproducibly.
+
+Latency can be set to mimic a real model:
+- RESUME_STUB_TTFB_MS: delay before the first chunk (default 0)
+- RESUME_STUB_LATENCY_MS: total response time, including TTFB (default 0)
+- RESUME_STUB_PREFILL_MS_PER_1K: extra delay before the first chunk per
+  1,000 uncached input tokens (default 0)
+
+Like a provider with prompt caching, the stub remembers the system
+instructions it has seen: a repeated one counts as cached input tokens and
+adds no prefill delay. stream_response() reports the input and cached
+token counts of each call.
+"""
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+
+MODEL_NAME = 'local-stub'
+
+TTFB_SECONDS = float(os.getenv('RESUME_STUB_TTFB_MS', '0')) / 1000
+LATENCY_SECONDS = float(os.getenv('RESUME_STUB_LATENCY_MS', '0')) / 1000
+PREFILL_SECONDS_PER_TOKEN = float(os.getenv('RESUME_STUB_PREFILL_MS_PER_1K', '0')) / 1000 / 1000
+
+# Rough token count of English prompt text
+CHARS_PER_TOKEN = 4
+
+# System instructions kept "cached", by digest
+MAX_CACHED_PREFIXES = 64
+_cached_prefixes = set()
+_cache_lock = threading.Lock()
+
+CHUNK_CHARS = 200
+
+SKILL_BANK = [
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'SQL', 'PostgreSQL', 'MongoDB', 'Redis',
+    'React', 'Node.js', 'Django', 'Flask', 'FastAPI', 'REST APIs', 'GraphQL', 'Docker',
+    'Kubernetes', 'AWS', 'GCP', 'Terraform', 'CI/CD', 'Git', 'Linux', 'Pandas', 'NumPy',
+    'Machine Learning', 'Data Visualization', 'Agile/Scrum', 'Unit Testing', 'System Design',
+    'Communication', 'Problem Solving', 'Team Leadership', 'Mentoring',
+]
+
+VERBS = ['Developed', 'Implemented', 'Led', 'Designed', 'Built', 'Optimized', 'Automated', 'Migrated']
+
+OUTCOMES = [
+    'reducing response times by {n}%',
+    'cutting infrastructure costs by {n}%',
+    'improving test coverage to {n}%',
+    'serving {n},000+ daily active users',
+    'raising release frequency by {n}%',
+    'shrinking onboarding time by {n}%',
+]
+
+COMPANIES = ['Northwind Labs', 'Acme Corp', 'Globex Systems', 'Initech', 'Umbrella Analytics', 'Stark Digital']
+
+PROJECT_NAMES = ['Realtime Analytics Dashboard', 'Inventory Forecasting Service', 'Developer Portal',
+                 'Event Ingestion Pipeline', 'Recommendation Engine', 'Incident Triage Bot']
+
+CERTIFICATIONS = [
+    'AWS Certified Developer - Associate - Amazon Web Services',
+    'Certified Kubernetes Application Developer - CNCF',
+    'Google Professional Data Engineer - Google Cloud',
+    'Professional Scrum Master I - Scrum.org',
+]
+
+FIELD_PATTERNS = {
+    'name': r'^Name: (.*)$',
+    'target_role': r'^Target Role: (.*)$',
+    # Section rewrite prompts carry the other sections as one-line digests
+    'context_skills': r'^SKILLS: (.*)$',
+    'rewrite': r'^REWRITE THIS SECTION:\n([A-Z ]+):',
+    # Tailoring prompts list the sections to return and carry the current skills
+    'tailor': r'^TAILOR THESE SECTIONS: (.*)$',
+    'current_skills': r'^CURRENT SKILLS:\n(.*)$',
+}
+
+BLOCK_HEADERS = {
+    'experience': 'EXPERIENCE PROVIDED:',
+    'projects': 'PROJECTS PROVIDED:',
+    'education': 'EDUCATION PROVIDED:',
+    'skills': 'SKILLS PROVIDED:',
+    'job_description': 'JOB DESCRIPTION TO MATCH:',
+}
+
+# Defaults create_resume_prompt() fills in for fields the user left out
+PLACEHOLDERS = {
+    'Create entry-level experience', 'Create 2 relevant projects', 'Create appropriate education',
+    'Suggest comprehensive skills', 'None',
+}
+
+
+def prompt_fields(prompt):
+    """Recover the candidate fields from a create_resume_prompt() prompt"""
+    fields = {}
+    for key, pattern in FIELD_PATTERNS.items():
+        match = re.search(pattern, prompt, re.MULTILINE)
+        fields[key] = match.group(1).strip() if match else ''
+    for key, header in BLOCK_HEADERS.items():
+        match = re.search(re.escape(header) + r'\n(.*?)(?:\n\n|\Z)', prompt, re.DOTALL)
+        value = match.group(1).strip() if match else ''
+        fields[key] = '' if value in PLACEHOLDERS else value
+    return fields
+
+
+def build_response(prompt):
+    """
+    The response text for a prompt; identical prompts give identical text.
+
+    Full-resume prompts get all six sections; section rewrite prompts get
+    just the content of the requested section, and tailoring prompts just
+    the sections they list.
+    """
+    rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).digest())
+    fields = prompt_fields(prompt)
+    sections = build_sections(fields, rng)
+    if fields['rewrite'] in sections:
+        return sections[fields['rewrite']] + '\n'
+    if fields['tailor']:
+        wanted = [header.strip() for header in fields['tailor'].split(',')]
+        sections = {header: content for header, content in sections.items() if header in wanted}
+    return ''.join(f"{header}:\n{content}\n\n" for header, content in sections.items()).rstrip('\n') + '\n'
+
+
+def build_sections(fields, rng):
+    """{section header: content} for the candidate fields"""
+    role = fields['target_role'] or 'Software Engineer'
+
+    skills = [s.strip() for s in (fields['skills'] or fields['context_skills'] or fields['current_skills']).split(',')
+              if s.strip()]
+    jd_text = fields['job_description'].lower()
+    if fields['tailor']:
+        # Reorder so the skills the job mentions come first
+        skills.sort(key=lambda s: s.lower() not in jd_text)
+    skills += [s for s in SKILL_BANK if s.lower() in jd_text]
+    skills += rng.sample(SKILL_BANK, 15)
+    skills = list(dict.fromkeys(skills))[:15]
+
+    def bullets(count):
+        return '\n'.join(
+            f"• {rng.choice(VERBS)} {rng.choice(skills)} components for {rng.choice(skills)} workloads, "
+            f"{rng.choice(OUTCOMES).format(n=rng.randint(15, 90))}"
+            for _ in range(count)
+        )
+
+    summary = (
+        f"{role} with {rng.randint(2, 8)} years of experience building reliable software with "
+        f"{', '.join(skills[:3])}. Known for shipping measurable improvements in performance and "
+        f"quality across cross-functional teams. Seeking to apply {skills[3]} and {skills[4]} "
+        f"expertise to high-impact {role} work."
+    )
+
+    roles = []
+    for i, company in enumerate(rng.sample(COMPANIES, 2)):
+        title = role if i == 0 else f"Junior {role}"
+        end = 'Present' if i == 0 else f"May {2022 - i}"
+        roles.append(f"{title} | {company}\nJune {2022 - 2 * i} - {end}\n{bullets(4)}")
+
+    projects = []
+    for name in rng.sample(PROJECT_NAMES, 2):
+        projects.append(f"{name} | {', '.join(rng.sample(skills, 3))}\n{bullets(3)}")
+
+    education = fields['education'] or (
+        "Bachelor of Science in Computer Science\nState University\n2020\n"
+        "Relevant Coursework: Algorithms, Distributed Systems, Databases"
+    )
+    certifications = '\n'.join(f"• {c} ({rng.randint(2021, 2024)})" for c in rng.sample(CERTIFICATIONS, 2))
+
+    return {
+        'PROFESSIONAL SUMMARY': summary,
+        'SKILLS': ', '.join(skills),
+        'EXPERIENCE': '\n\n'.join(roles),
+        'PROJECTS': '\n\n'.join(projects),
+        'EDUCATION': education,
+        'CERTIFICATIONS': certifications,
+    }
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def input_usage(prompt, system=None):
+    """
+    {'input_tokens', 'cached_input_tokens'} for one call. The system
+    instruction counts as cached from the second call that sends it.
+    """
+    system_tokens = estimate_tokens(system)
+    cached = 0
+    if system:
+        key = hashlib.sha256(system.encode('utf-8')).digest()
+        with _cache_lock:
+            if key in _cached_prefixes:
+                cached = system_tokens
+            else:
+                if len(_cached_prefixes) >= MAX_CACHED_PREFIXES:
+                    _cached_prefixes.clear()
+                _cached_prefixes.add(key)
+    return {'input_tokens': system_tokens + estimate_tokens(prompt), 'cached_input_tokens': cached}
+
+
+def stream_response(prompt, system=None, ttfb=None, latency=None, usage=None):
+    """
+    Yield the response in chunks, sleeping so the first chunk arrives after
+    `ttfb` seconds plus the prefill time of the uncached input tokens, and
+    the last after `latency` seconds. If usage is a dict, the call's token
+    counts (see input_usage) are stored in it.
+    """
+    ttfb = TTFB_SECONDS if ttfb is None else ttfb
+    latency = LATENCY_SECONDS if latency is None else latency
+
+    tokens = input_usage(prompt, system)
+    if usage is not None:
+        usage.update(tokens)
+    prefill = (tokens['input_tokens'] - tokens['cached_input_tokens']) * PREFILL_SECONDS_PER_TOKEN
+    ttfb += prefill
+    latency += prefill
+
+    text = build_response(prompt)
+    chunks = [text[i:i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)]
+    gap = max(latency - ttfb, 0) / max(len(chunks) - 1, 1)
+
+    if ttfb:
+        time.sleep(ttfb)
+    for i, chunk in enumerate(chunks):
+        if i and gap:
+            time.sleep(gap)
+        yield chunk
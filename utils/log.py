@@ -0,0 +1,35 @@
+"""
+Leveled logging for the resume pipeline.
+
+Replaces the ad-hoc print calls. Set RESUME_LOG_LEVEL to DEBUG, INFO
+(default), WARNING, ERROR or OFF.
+"""
+import logging
+import os
+import sys
+
+_configured = False
+
+
+def _configure():
+    global _configured
+    level_name = os.getenv('RESUME_LOG_LEVEL', 'INFO').upper()
+
+    root = logging.getLogger('resume')
+    if level_name == 'OFF':
+        root.addHandler(logging.NullHandler())
+        root.setLevel(logging.CRITICAL + 1)
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        root.addHandler(handler)
+        root.setLevel(getattr(logging, level_name, logging.INFO))
+    root.propagate = False
+    _configured = True
+
+
+def get_logger(name):
+    """Logger under the 'resume' namespace, e.g. get_logger(__name__)"""
+    if not _configured:
+        _configure()
+    return logging.getLogger('resume.' + name.rsplit('.', 1)[-1])
@@ -0,0 +1,265 @@
+"""
+Stage-level timing spans and metrics export.
+
+Wrap each pipeline stage in a span:
+
+    with span('pdf_render', layout='classic') as s:
+        ...
+        s.incr('cache_hits')
+
+Code running inside a span can also call incr() / observe() without a
+handle; they apply to the innermost active span. Finished spans are sent to
+every registered sink. The Prometheus registry is always installed and can
+be rendered with prometheus_text() or served over HTTP with serve(); set
+RESUME_METRICS_JSONL to a path to also append one JSON line per span.
+
+Spans recorded in a worker process are not visible to the parent; run the
+task through run_collecting() and pass the returned records to replay().
+
+Point-in-time values (in-flight calls, queue depth) are exported as
+Prometheus gauges registered with register_gauge().
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram buckets for stage durations, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current = contextvars.ContextVar('resume_span', default=None)
+_collector = contextvars.ContextVar('resume_span_collector', default=None)
+
+
+class Span:
+    """One timed execution of a pipeline stage"""
+
+    __slots__ = ('stage', 'labels', 'counters', 'observations', 'started', 'duration', 'error')
+
+    def __init__(self, stage, labels):
+        self.stage = stage
+        self.labels = labels
+        self.counters = {}
+        self.observations = {}
+        self.started = time.time()
+        self.duration = None
+        self.error = None
+
+    def incr(self, counter, amount=1):
+        """Count an event (retry, fallback, cache hit...) within this span"""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def observe(self, name, seconds):
+        """Record a sub-timing such as time to first byte"""
+        self.observations[name] = seconds
+
+    def to_record(self):
+        return {
+            'stage': self.stage,
+            'ts': round(self.started, 3),
+            'duration': round(self.duration, 6),
+            'labels': self.labels,
+            'counters': self.counters,
+            'observations': {k: round(v, 6) for k, v in self.observations.items()},
+            'error': self.error,
+        }
+
+
+@contextmanager
+def span(stage, **labels):
+    """Time a block as one execution of `stage`"""
+    current = Span(stage, labels)
+    token = _current.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current.reset(token)
+        _emit(current.to_record())
+
+
+def incr(counter, amount=1):
+    """Increment a counter on the innermost active span, if any"""
+    current = _current.get()
+    if current is not None:
+        current.incr(counter, amount)
+
+
+def observe(name, seconds):
+    """Record a sub-timing on the innermost active span, if any"""
+    current = _current.get()
+    if current is not None:
+        current.observe(name, seconds)
+
+
+class PrometheusSink:
+    """Aggregates spans into histograms and counters in Prometheus text format"""
+
+    def __init__(self, prefix='resume'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {}  # (metric, stage) -> [bucket counts..., sum, count]
+        self._counters = {}  # (stage, counter) -> total
+        self._errors = {}  # stage -> total
+        self._gauges = {}  # metric -> function returning the current value
+
+    def _observe(self, metric, stage, seconds):
+        values = self._histograms.get((metric, stage))
+        if values is None:
+            values = self._histograms[(metric, stage)] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                values[i] += 1
+        values[-2] += seconds
+        values[-1] += 1
+
+    def emit(self, record):
+        stage = record['stage']
+        with self._lock:
+            self._observe('stage_duration_seconds', stage, record['duration'])
+            for name, seconds in record['observations'].items():
+                self._observe(f'stage_{name}_seconds', stage, seconds)
+            for counter, amount in record['counters'].items():
+                self._counters[(stage, counter)] = self._counters.get((stage, counter), 0) + amount
+            if record['error']:
+                self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def render(self):
+        lines = []
+        with self._lock:
+            seen = set()
+            for (metric, stage), values in sorted(self._histograms.items()):
+                name = f'{self.prefix}_{metric}'
+                if name not in seen:
+                    lines.append(f'# TYPE {name} histogram')
+                    seen.add(name)
+                for bound, count in zip(BUCKETS, values):
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {values[-1]}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {values[-2]:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {values[-1]}')
+
+            name = f'{self.prefix}_stage_events_total'
+            if self._counters:
+                lines.append(f'# TYPE {name} counter')
+            for (stage, counter), total in sorted(self._counters.items()):
+                lines.append(f'{name}{{stage="{stage}",event="{counter}"}} {total}')
+
+            name = f'{self.prefix}_stage_errors_total'
+            if self._errors:
+                lines.append(f'# TYPE {name} counter')
+            for stage, total in sorted(self._errors.items()):
+                lines.append(f'{name}{{stage="{stage}"}} {total}')
+
+            gauges = sorted(self._gauges.items())
+        for metric, read in gauges:
+            name = f'{self.prefix}_{metric}'
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {read():g}')
+        return '\n'.join(lines) + '\n'
+
+    def register_gauge(self, metric, read):
+        """Export read() as a gauge, evaluated on every render"""
+        with self._lock:
+            self._gauges[metric] = read
+
+
+class JsonLinesSink:
+    """Appends one JSON object per span to a file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+prometheus = PrometheusSink()
+_sinks = [prometheus]
+if os.getenv('RESUME_METRICS_JSONL'):
+    _sinks.append(JsonLinesSink(os.getenv('RESUME_METRICS_JSONL')))
+
+
+def add_sink(sink):
+    """Register an object with an emit(record) method to receive every span"""
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    _sinks.remove(sink)
+
+
+def _emit(record):
+    collector = _collector.get()
+    if collector is not None:
+        collector.append(record)
+        return
+    for sink in list(_sinks):
+        sink.emit(record)
+
+
+def register_gauge(metric, read):
+    """Export a current value, e.g. register_gauge('llm_in_flight', lambda: n)"""
+    prometheus.register_gauge(metric, read)
+
+
+def prometheus_text():
+    """Current metrics in Prometheus text exposition format"""
+    return prometheus.render()
+
+
+def serve(port, host='0.0.0.0'):
+    """
+    Serve prometheus_text() at /metrics from a daemon thread, for processes
+    without the API server (the Streamlit app). Returns the server.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+def run_collecting(fn, *args):
+    """
+    Run fn(*args) and return (result, span records) instead of emitting the
+    spans locally. Use as the process-pool entry point, then replay() the
+    records in the parent.
+    """
+    records = []
+    token = _collector.set(records)
+    try:
+        return fn(*args), records
+    finally:
+        _collector.reset(token)
+
+
+def replay(records):
+    """Send span records collected in another process to this process's sinks"""
+    for record in records:
+        _emit(record)
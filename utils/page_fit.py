@@ -0,0 +1,114 @@
+"""
+Fit a resume to a page budget before rendering it.
+
+fit_to_pages() walks CONDENSE_STEPS in order, first tightening the layout
+(spacing, then type size) and then trimming content (fewer bullets,
+projects and certifications, a shorter summary), and stops at the first
+step whose measure_pages() result fits. Measuring lays the flowables out
+with wrap() and never writes a PDF, so the loop costs a fraction of trial
+builds and create_pdf() builds only once.
+
+Trims keep the most important content: the first bullets of each entry,
+the first entries of each section (the most recent role comes first) and
+the opening sentences of the summary.
+"""
+import re
+from collections import namedtuple
+
+from .metrics import span
+from .pdf_generator import measure_pages, MAX_DENSITY
+from .resume_model import as_document, parse_entries, parse_lines, ENTRY_SECTIONS
+
+FitResult = namedtuple('FitResult', 'resume density pages steps')
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def entries_text(entries):
+    """Section text for a list of Entry objects, as parse_entries reads it"""
+    blocks = []
+    for entry in entries:
+        lines = ([entry.heading] if entry.heading else []) + entry.details
+        lines += [f"• {bullet}" for bullet in entry.bullets]
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks)
+
+
+def cap_bullets(resume, limit):
+    """Keep at most `limit` bullets per role and project"""
+    for key in ENTRY_SECTIONS:
+        entries = parse_entries(resume[key])
+        if any(len(entry.bullets) > limit for entry in entries):
+            for entry in entries:
+                entry.bullets = entry.bullets[:limit]
+            resume = resume.with_section(key, entries_text(entries))
+    return resume
+
+
+def cap_entries(resume, key, limit):
+    """Keep the first `limit` entries of an experience/projects section"""
+    entries = parse_entries(resume[key])
+    if len(entries) <= limit:
+        return resume
+    return resume.with_section(key, entries_text(entries[:limit]))
+
+
+def cap_lines(resume, key, limit):
+    """Keep the first `limit` lines of a list section such as certifications"""
+    lines = parse_lines(resume[key])
+    if len(lines) <= limit:
+        return resume
+    return resume.with_section(key, '\n'.join(f"• {line}" for line in lines[:limit]))
+
+
+def cap_sentences(resume, key, limit):
+    """Keep the first `limit` sentences of a prose section"""
+    sentences = _SENTENCE_END.split(resume[key].strip())
+    if len(sentences) <= limit:
+        return resume
+    return resume.with_section(key, ' '.join(sentences[:limit]))
+
+
+# (description, layout density, content trim or None), applied cumulatively
+CONDENSE_STEPS = (
+    ('tighter spacing', 1, None),
+    ('smaller type', MAX_DENSITY, None),
+    ('at most 4 bullets per entry', MAX_DENSITY, lambda r: cap_bullets(r, 4)),
+    ('at most 3 certifications', MAX_DENSITY, lambda r: cap_lines(r, 'certifications', 3)),
+    ('at most 2 projects', MAX_DENSITY, lambda r: cap_entries(r, 'projects', 2)),
+    ('at most 3 bullets per entry', MAX_DENSITY, lambda r: cap_bullets(r, 3)),
+    ('2-sentence summary', MAX_DENSITY, lambda r: cap_sentences(r, 'summary', 2)),
+    ('at most 3 roles', MAX_DENSITY, lambda r: cap_entries(r, 'experience', 3)),
+    ('at most 2 bullets per entry', MAX_DENSITY, lambda r: cap_bullets(r, 2)),
+    ('at most 1 project', MAX_DENSITY, lambda r: cap_entries(r, 'projects', 1)),
+    ('at most 2 roles', MAX_DENSITY, lambda r: cap_entries(r, 'experience', 2)),
+)
+
+
+def fit_to_pages(resume_data, layout, max_pages):
+    """
+    Condense a resume until it fits max_pages in the given layout.
+
+    Returns FitResult(resume, density, pages, steps): the possibly trimmed
+    ResumeDocument, the template density to render it with, the measured
+    page count and the descriptions of the steps applied. If every step
+    has been applied and the resume still doesn't fit, the most condensed
+    version is returned and pages reports the overflow.
+    """
+    resume = as_document(resume_data)
+    with span('page_fit', layout=layout) as fit_span:
+        density = 0
+        pages = measure_pages(resume, layout, density)
+        steps = []
+        for description, step_density, trim in CONDENSE_STEPS:
+            if pages <= max_pages:
+                break
+            density = step_density
+            if trim is not None:
+                resume = trim(resume)
+            steps.append(description)
+            pages = measure_pages(resume, layout, density)
+            fit_span.incr('steps')
+        if pages > max_pages:
+            fit_span.incr('over_budget')
+    return FitResult(resume, density, pages, steps)
@@ -1,107 +1,347 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import copy
 import io
+import threading
 
-def create_pdf(resume_data):
-    """Generate ATS-friendly PDF resume"""
+from .metrics import span, incr
+from .render_cache import SectionCache
+from .resume_model import as_document, escape_markup, ENTRY_SECTIONS
+
+# reportlab and python-docx are imported inside the functions that need
+# them so that importing this module (and app startup) stays cheap.
+
+# Resume sections in render order: (resume_data key, heading text)
+SECTIONS = [
+    ('summary', 'PROFESSIONAL SUMMARY'),
+    ('skills', 'SKILLS'),
+    ('experience', 'EXPERIENCE'),
+    ('projects', 'PROJECTS'),
+    ('education', 'EDUCATION'),
+    ('certifications', 'CERTIFICATIONS & ACHIEVEMENTS'),
+]
+
+# Named layouts. All are single-column with standard fonts and plain-text
+# headings so ATS parsers read them in order.
+LAYOUTS = {
+    'classic': {
+        'margin': 0.75,
+        'title_size': 24,
+        'title_color': '#1E88E5',
+        'title_align': 'center',
+        'heading_size': 14,
+        'heading_color': '#333333',
+        'heading_border': '#1E88E5',
+        'body_size': 10,
+        'section_gap': 0.1,
+    },
+    'compact': {
+        'margin': 0.5,
+        'title_size': 18,
+        'title_color': '#1E88E5',
+        'title_align': 'center',
+        'heading_size': 11,
+        'heading_color': '#333333',
+        'heading_border': None,
+        'body_size': 9,
+        'section_gap': 0.05,
+    },
+    'minimal': {
+        'margin': 0.75,
+        'title_size': 20,
+        'title_color': '#000000',
+        'title_align': 'left',
+        'heading_size': 12,
+        'heading_color': '#000000',
+        'heading_border': None,
+        'body_size': 10,
+        'section_gap': 0.1,
+    },
+}
+
+DEFAULT_LAYOUT = 'classic'
+
+# Condensed variants of a layout, used to fit a page budget. Each level
+# applies on top of the previous one.
+MAX_DENSITY = 2
+
+# SimpleDocTemplate's frame pads its content by 6pt on every side
+FRAME_PADDING = 6
+
+# Same tolerance reportlab's Frame uses when deciding whether a flowable fits
+_FUZZ = 1e-6
+
+
+def condensed_spec(spec, density):
+    """A layout spec tightened by `density` levels (0 returns it unchanged)"""
+    spec = dict(spec)
+    if density >= 1:
+        # Tighter margins and spacing
+        spec['margin'] = max(spec['margin'] - 0.15, 0.5)
+        spec['section_gap'] = spec['section_gap'] / 2
+        spec['header_gap'] = 0.1
+        spec['heading_space_before'] = 6 if spec['heading_border'] else 4
+    if density >= 2:
+        # Smaller type
+        spec['title_size'] -= 2
+        spec['heading_size'] -= 1
+        spec['body_size'] -= 1
+    return spec
+
+
+class PdfTemplate:
+    """
+    Paragraph styles and static flowables for one layout.
     
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
-                           rightMargin=0.75*inch, leftMargin=0.75*inch,
-                           topMargin=0.75*inch, bottomMargin=0.75*inch)
+    Built once per process by get_template(); create_pdf() then only has to
+    build flowables for the resume's own content.
+    """
+    
+    def __init__(self, name, spec):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Paragraph
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_LEFT, TA_CENTER
+        
+        self.name = name
+        self.pagesize = letter
+        self.margin = spec['margin'] * inch
+        self.section_gap = spec['section_gap'] * inch
+        self.header_gap = spec.get('header_gap', 0.2) * inch
+        
+        styles = getSampleStyleSheet()
+        
+        self.title_style = ParagraphStyle(
+            f'{name}Title',
+            parent=styles['Heading1'],
+            fontSize=spec['title_size'],
+            leading=spec['title_size'] * 1.2,
+            textColor=colors.HexColor(spec['title_color']),
+            spaceAfter=6,
+            alignment=TA_CENTER if spec['title_align'] == 'center' else TA_LEFT
+        )
+        
+        heading_options = {}
+        if spec['heading_border']:
+            heading_options = {
+                'borderWidth': 1,
+                'borderColor': colors.HexColor(spec['heading_border']),
+                'borderPadding': 5,
+            }
+        self.heading_style = ParagraphStyle(
+            f'{name}Heading',
+            parent=styles['Heading2'],
+            fontSize=spec['heading_size'],
+            leading=spec['heading_size'] * 1.2,
+            textColor=colors.HexColor(spec['heading_color']),
+            spaceAfter=6,
+            spaceBefore=spec.get('heading_space_before', 12 if spec['heading_border'] else 8),
+            **heading_options
+        )
+        
+        self.body_style = ParagraphStyle(
+            f'{name}Body',
+            parent=styles['Normal'],
+            fontSize=spec['body_size'],
+            leading=spec['body_size'] * 1.2,
+        )
+        
+        self.bullet_style = ParagraphStyle(
+            f'{name}Bullet',
+            parent=self.body_style,
+            leftIndent=12,
+            bulletIndent=2,
+        )
+        
+        # Section headings never change, so parse them once
+        self._headings = {key: Paragraph(title, self.heading_style) for key, title in SECTIONS}
+    
+    def heading(self, key):
+        """A fresh copy of the prebuilt heading (layout state is per-render)"""
+        return copy.copy(self._headings[key])
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def get_template(layout=DEFAULT_LAYOUT, density=0):
+    """
+    Return the process-wide PdfTemplate for a layout (condensed by
+    `density` levels), building it on first use
+    """
+    template = _templates.get((layout, density))
+    if template is not None:
+        incr('cache_hits')
+        return template
+    
+    incr('cache_misses')
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Choose from: {', '.join(LAYOUTS)}")
+    
+    with _templates_lock:
+        if (layout, density) not in _templates:
+            name = layout if not density else f'{layout}-condensed{density}'
+            _templates[(layout, density)] = PdfTemplate(name, condensed_spec(LAYOUTS[layout], density))
+        return _templates[(layout, density)]
+
+
+def section_flowables(template, resume, key):
+    """Flowables for one section's content (heading not included)"""
+    from reportlab.platypus import Paragraph
+    
+    body = template.body_style
+    
+    if key == 'skills':
+        return [Paragraph(escape_markup(', '.join(resume.skill_list)), body)]
+    
+    if key in ENTRY_SECTIONS:
+        flowables = []
+        for entry in resume.entries[key]:
+            if entry.heading:
+                flowables.append(Paragraph(f"<b>{escape_markup(entry.heading)}</b>", body))
+            for detail in entry.details:
+                flowables.append(Paragraph(escape_markup(detail), body))
+            for bullet in entry.bullets:
+                flowables.append(Paragraph(escape_markup(bullet), template.bullet_style, bulletText='•'))
+        return flowables
+    
+    style = template.bullet_style if key == 'certifications' else body
+    bullet = '•' if key == 'certifications' else None
+    return [Paragraph(escape_markup(line), style, bulletText=bullet) for line in resume.lines[key]]
+
+
+_section_cache = SectionCache()
+
+
+def cached_section_flowables(template, resume, key):
+    """
+    section_flowables() through the per-section cache. The cached
+    paragraphs are never laid out themselves; each build gets copies,
+    since layout state is stored on the flowable.
+    """
+    flowables = _section_cache.get(template.name, key, resume[key], lambda: section_flowables(template, resume, key))
+    return [copy.copy(flowable) for flowable in flowables]
+
+
+def build_elements(template, resume):
+    """The resume's flowables, in page order"""
+    from reportlab.platypus import Paragraph, Spacer
     
     # Container for PDF elements
     elements = []
     
-    # Styles
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1E88E5'),
-        spaceAfter=6,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=6,
-        spaceBefore=12,
-        borderWidth=1,
-        borderColor=colors.HexColor('#1E88E5'),
-        borderPadding=5
-    )
-    
     # Name (Title)
-    name = Paragraph(resume_data.get('name', 'Your Name'), title_style)
-    elements.append(name)
+    elements.append(Paragraph(escape_markup(resume.name or 'Your Name'), template.title_style))
     
     # Contact Info
-    contact_info = f"{resume_data.get('phone', '')} | {resume_data.get('email', '')}"
-    contact = Paragraph(contact_info, styles['Normal'])
-    elements.append(contact)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Professional Summary
-    if resume_data.get('summary'):
-        elements.append(Paragraph('PROFESSIONAL SUMMARY', heading_style))
-        elements.append(Paragraph(resume_data['summary'], styles['Normal']))
-        elements.append(Spacer(1, 0.1*inch))
-    
-    # Skills
-    if resume_data.get('skills'):
-        elements.append(Paragraph('SKILLS', heading_style))
-        elements.append(Paragraph(resume_data['skills'], styles['Normal']))
-        elements.append(Spacer(1, 0.1*inch))
+    contact_info = f"{resume.phone} | {resume.email}"
+    elements.append(Paragraph(escape_markup(contact_info), template.body_style))
+    elements.append(Spacer(1, template.header_gap))
     
-    # Experience
-    if resume_data.get('experience'):
-        elements.append(Paragraph('EXPERIENCE', heading_style))
-        exp_text = resume_data['experience'].replace('\n', '<br/>')
-        elements.append(Paragraph(exp_text, styles['Normal']))
-        elements.append(Spacer(1, 0.1*inch))
+    # Sections, in order
+    for key, _ in SECTIONS:
+        if not resume[key]:
+            continue
+        elements.append(template.heading(key))
+        elements.extend(cached_section_flowables(template, resume, key))
+        elements.append(Spacer(1, template.section_gap))
+    return elements
+
+
+def measure_pages(resume_data, layout=DEFAULT_LAYOUT, density=0):
+    """
+    Number of pages create_pdf would produce, without writing a PDF.
     
-    # Projects
-    if resume_data.get('projects'):
-        elements.append(Paragraph('PROJECTS', heading_style))
-        proj_text = resume_data['projects'].replace('\n', '<br/>')
-        elements.append(Paragraph(proj_text, styles['Normal']))
-        elements.append(Spacer(1, 0.1*inch))
+    Lays the flowables out with wrap() and split() the way SimpleDocTemplate's
+    frame does (space before/after overlap, splitting paragraphs across a
+    page break), but skips drawing and PDF serialisation, so it costs a
+    fraction of a build.
+    """
+    resume = as_document(resume_data)
+    template = get_template(layout, density)
+    width = template.pagesize[0] - 2 * template.margin - 2 * FRAME_PADDING
+    height = template.pagesize[1] - 2 * template.margin - 2 * FRAME_PADDING
     
-    # Education
-    if resume_data.get('education'):
-        elements.append(Paragraph('EDUCATION', heading_style))
-        edu_text = resume_data['education'].replace('\n', '<br/>')
-        elements.append(Paragraph(edu_text, styles['Normal']))
-        elements.append(Spacer(1, 0.1*inch))
+    pages, y, at_top, prev_after = 1, height, True, 0
+    flowables = build_elements(template, resume)
     
-    # Certifications
-    if resume_data.get('certifications'):
-        elements.append(Paragraph('CERTIFICATIONS & ACHIEVEMENTS', heading_style))
-        cert_text = resume_data['certifications'].replace('\n', '<br/>')
-        elements.append(Paragraph(cert_text, styles['Normal']))
+    while flowables:
+        flowable = flowables.pop(0)
+        space = 0 if at_top else max(flowable.getSpaceBefore() - prev_after, 0)
+        available = y - space
+        if available > 0:
+            h = flowable.wrap(width, available)[1]
+            if y - space - h >= -_FUZZ:
+                after = flowable.getSpaceAfter()
+                if space + h + after:
+                    at_top = False
+                y -= space + h + after
+                prev_after = after
+                continue
+            parts = flowable.split(width, available)
+            if len(parts) > 1:
+                flowables[0:0] = parts
+                continue
+        if at_top:
+            # Taller than an empty page; count it and move on
+            at_top = False
+            y = 0
+            continue
+        pages += 1
+        y, at_top, prev_after = height, True, 0
+        flowables.insert(0, flowable)
+    return pages
+
+
+def create_pdf(resume_data, layout=DEFAULT_LAYOUT, max_pages=None, density=0):
+    """
+    Generate ATS-friendly PDF resume.
     
-    # Build PDF
-    doc.build(elements)
+    With max_pages, the resume is first condensed until measure_pages()
+    fits the budget (see utils.page_fit), then built once.
+    """
+    from reportlab.platypus import SimpleDocTemplate
     
-    buffer.seek(0)
-    return buffer.getvalue()
+    with span('pdf_render', layout=layout):
+        resume = as_document(resume_data)
+        if max_pages:
+            from .page_fit import fit_to_pages
+            fit = fit_to_pages(resume, layout, max_pages)
+            resume, density = fit.resume, fit.density
+        template = get_template(layout, density)
+        
+        buffer = io.BytesIO()
+        # Content streams are deflated regardless of the global rl_config
+        doc = SimpleDocTemplate(buffer, pagesize=template.pagesize,
+                               rightMargin=template.margin, leftMargin=template.margin,
+                               topMargin=template.margin, bottomMargin=template.margin,
+                               pageCompression=1)
+        
+        # Build PDF
+        doc.build(build_elements(template, resume))
+        
+        buffer.seek(0)
+        return buffer.getvalue()
 
 def create_docx(resume_data):
     """Generate ATS-friendly DOCX resume"""
+    from .docx_writer import write_docx
+    
+    with span('docx_render'):
+        return write_docx(resume_data, SECTIONS)
+
+
+def create_docx_python_docx(resume_data):
+    """
+    Generate the DOCX resume through python-docx objects.
+    
+    Slower reference implementation kept for comparison benchmarks;
+    create_docx uses the template-based writer.
+    """
+    from docx import Document
+    from docx.shared import Inches, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
     
     doc = Document()
     
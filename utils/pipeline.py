@@ -0,0 +1,157 @@
+"""
+The resume pipeline as one function call, shared by the Streamlit job
+queue and other headless entry points.
+"""
+from . import admission
+from .ai_generator import format_basic_resume, generate_resume_content, get_llm, regenerate_section
+from .ats_scorer import calculate_ats_score
+from .pdf_generator import create_pdf, create_docx
+from .log import get_logger
+from .metrics import span
+from .profiling import profiled
+from .resume_model import ResumeDocument
+from .tailoring import tailor_to_jobs
+
+logger = get_logger(__name__)
+
+
+def admit_generation(input_data):
+    """
+    Admission decision for a generation about to wait for a worker, made
+    before it waits so shedding saves the wait.
+
+    Returns (slot, None) when the request may use the LLM: pass slot on to
+    run_resume_pipeline, which releases it (slot is None when no LLM is
+    configured). Returns (None, result) when the LLM is saturated: result is
+    the degraded local resume in run_resume_pipeline's shape, to serve right
+    away instead of queueing.
+    """
+    if get_llm() is None:
+        return None, None
+    slot, reason = admission.controller.admit()
+    if slot is not None:
+        return slot, None
+
+    logger.info("⚡ LLM overloaded (%s) - serving fallback", reason)
+    with span('generate') as generate_span:
+        generate_span.incr('shed')
+        return None, local_result(input_data, 'final', degraded=True)
+
+
+def provisional_result(input_data):
+    """
+    A quick draft to show while an LLM generation waits and runs, built in
+    milliseconds without the LLM (see local_result)
+    """
+    with span('provisional'):
+        return local_result(input_data, 'provisional')
+
+
+def local_result(input_data, phase, degraded=False):
+    """The format_basic_resume resume and its score, in run_resume_pipeline's shape"""
+    job_description = input_data.get('job_description') or ''
+    resume = ResumeDocument.from_dict({**format_basic_resume(input_data), 'degraded': degraded})
+    return {
+        'resume': resume.to_dict(),
+        'ats_score': calculate_ats_score(resume, job_description, input_data['target_role']),
+        'job_description': job_description,
+        'phase': phase,
+    }
+
+
+def run_resume_pipeline(input_data, profile=None, slot=None):
+    """
+    Generate and score a resume for one set of form inputs.
+
+    Returns a JSON-safe dict: {'resume': <resume dict>, 'ats_score': <score
+    dict>, 'job_description': <the JD it was scored against>, 'phase':
+    'final'}.
+
+    slot is the admission slot from admit_generation, if the request was
+    admitted before it was queued.
+
+    The run may be profiled (see utils.profiling); profile=True, or a truthy
+    'profile' key in input_data, requests it for this run. A profiled run
+    also renders the PDF and DOCX so the profile covers the whole hot path.
+    """
+    if profile is None:
+        profile = bool(input_data.get('profile'))
+    job_description = input_data.get('job_description') or ''
+
+    try:
+        with profiled('pipeline', requested=profile) as profile_path:
+            resume = generate_resume_content(input_data, slot)
+            ats_score = calculate_ats_score(resume, job_description, input_data['target_role'])
+            if profile_path:
+                create_pdf(resume)
+                create_docx(resume)
+    finally:
+        # Normally released after the LLM call; this covers early failures
+        if slot is not None:
+            slot.release()
+
+    return {
+        'resume': resume.to_dict(),
+        'ats_score': ats_score,
+        'job_description': job_description,
+        'phase': 'final',
+    }
+
+
+def regenerate_resume_section(payload):
+    """
+    Rewrite one section of an existing resume and re-score it.
+
+    payload: {'resume': <resume dict>, 'section': <key>, 'job_description':
+    <str>, 'feedback': <str>}. Returns the same shape as
+    run_resume_pipeline, plus 'section'.
+    """
+    resume = ResumeDocument.from_dict(payload['resume'])
+    job_description = payload.get('job_description') or ''
+    updated = regenerate_section(resume, payload['section'], job_description, payload.get('feedback') or '')
+    return {
+        'resume': updated.to_dict(),
+        'ats_score': calculate_ats_score(updated, job_description, updated.target_role),
+        'job_description': job_description,
+        'section': payload['section'],
+    }
+
+
+def tailor_resume_to_jobs(payload):
+    """
+    Tailor one profile to several job descriptions (see utils.tailoring).
+
+    payload: the form inputs plus 'job_descriptions', a list of JD strings
+    or {'title', 'job_description'} dicts. Returns the same shape as
+    run_resume_pipeline for the first variant, plus 'variants' with every
+    variant's title, resume, score and JD.
+    """
+    input_data = {key: value for key, value in payload.items() if key not in ('task', 'job_descriptions')}
+    result = tailor_to_jobs(input_data, payload['job_descriptions'])
+    first = result['variants'][0]
+    return {
+        'resume': first['resume'],
+        'ats_score': first['ats_score'],
+        'job_description': first['job_description'],
+        'phase': 'final',
+        'variants': result['variants'],
+        'stats': result['stats'],
+    }
+
+
+TASKS = {
+    'generate': run_resume_pipeline,
+    'regenerate_section': regenerate_resume_section,
+    'tailor': tailor_resume_to_jobs,
+}
+
+
+def run_job(payload, slot=None):
+    """
+    Job queue entry point: run the task named by payload['task'] (default
+    'generate'). slot is a generation's admission slot (see admit_generation).
+    """
+    task = payload.get('task', 'generate')
+    if task == 'generate':
+        return run_resume_pipeline(payload, slot=slot)
+    return TASKS[task](payload)
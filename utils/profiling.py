@@ -0,0 +1,131 @@
+"""
+Opt-in profiling of individual pipeline runs.
+
+A profiled run captures cProfile stats and the top tracemalloc allocation
+sites and writes them to RESUME_PROFILE_DIR (default: profiles/ under the
+data directory), keeping only the newest RESUME_PROFILE_KEEP runs.
+
+Which runs are profiled:
+- RESUME_PROFILE_RATE: fraction of runs sampled at random (default 0, off)
+- a per-request flag (profile=True), honoured only when
+  RESUME_PROFILE_REQUESTS=1 so clients can't switch it on in production
+
+Only one run is profiled at a time per process; a run that is selected
+while another profile is in progress simply runs unprofiled.
+"""
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from .config import DATA_DIR
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_RATE = float(os.getenv('RESUME_PROFILE_RATE', '0'))
+PROFILE_REQUESTS = os.getenv('RESUME_PROFILE_REQUESTS', '0') == '1'
+PROFILE_KEEP = int(os.getenv('RESUME_PROFILE_KEEP', '50'))
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 40
+
+_busy = threading.Lock()
+
+
+def profile_dir():
+    return os.getenv('RESUME_PROFILE_DIR') or os.path.join(DATA_DIR, 'profiles')
+
+
+def should_profile(requested=None):
+    """Decide whether this run is profiled (per-request flag, then sampling)"""
+    if requested and PROFILE_REQUESTS:
+        return True
+    return PROFILE_RATE > 0 and random.random() < PROFILE_RATE
+
+
+@contextmanager
+def profiled(tag, requested=None):
+    """
+    Profile the enclosed block if this run is selected.
+
+    Yields the output path prefix when profiling, otherwise None.
+    """
+    if not should_profile(requested) or not _busy.acquire(blocking=False):
+        yield None
+        return
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(10)
+    profiler = cProfile.Profile()
+
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    now = time.time()
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now)) + f'{now % 1:.3f}'[1:]
+    prefix = os.path.join(directory, f"{stamp}-{os.getpid()}-{tag}")
+
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield prefix
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        try:
+            write_report(prefix, profiler, snapshot, elapsed, peak)
+            rotate(directory)
+            logger.info("Profile written to %s.*", prefix)
+        finally:
+            _busy.release()
+
+
+def write_report(prefix, profiler, snapshot, elapsed, peak):
+    """Write <prefix>.prof (binary pstats) and <prefix>.txt (readable summary)"""
+    profiler.dump_stats(prefix + '.prof')
+
+    summary = io.StringIO()
+    summary.write(f"Wall time: {elapsed * 1000:.1f} ms\n")
+    summary.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+
+    summary.write(f"Top {TOP_ALLOCATIONS} allocation sites\n")
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ])
+    for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+        summary.write(f"  {stat.size / 1024:9.1f} KiB  {stat.count:7d} blocks  {stat.traceback}\n")
+
+    summary.write(f"\nTop {TOP_FUNCTIONS} functions by cumulative time\n")
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+
+    with open(prefix + '.txt', 'w', encoding='utf-8') as f:
+        f.write(summary.getvalue())
+
+
+def rotate(directory, keep=None):
+    """Delete the oldest profiles beyond the newest `keep` runs"""
+    keep = PROFILE_KEEP if keep is None else keep
+    runs = {}
+    for name in os.listdir(directory):
+        stem, ext = os.path.splitext(name)
+        if ext in ('.prof', '.txt'):
+            runs.setdefault(stem, []).append(os.path.join(directory, name))
+
+    stems = sorted(runs)  # Names start with a timestamp, so oldest first
+    for stem in stems[:max(len(stems) - keep, 0)]:
+        for path in runs[stem]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
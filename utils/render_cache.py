@@ -0,0 +1,48 @@
+"""
+Per-section cache for rendered resume content.
+
+Entries are keyed by (renderer variant, section key, section text), so a
+resume that differs from an earlier render in one section (after that
+section is edited or regenerated) rebuilds only that section and reuses
+the output for all the others.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from .metrics import incr
+
+CACHE_SIZE = int(os.getenv('RESUME_SECTION_CACHE_SIZE', '1024'))
+
+
+class SectionCache:
+    """Thread-safe LRU of rendered sections"""
+
+    def __init__(self, maxsize=None):
+        self.maxsize = CACHE_SIZE if maxsize is None else maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, variant, key, text, build):
+        """The cached output for this section text, calling build() on a miss"""
+        cache_key = (variant, key, text)
+        with self._lock:
+            value = self._entries.get(cache_key)
+            if value is not None:
+                self._entries.move_to_end(cache_key)
+        if value is not None:
+            incr('section_cache_hits')
+            return value
+
+        incr('section_cache_misses')
+        value = build()
+        if self.maxsize:
+            with self._lock:
+                self._entries[cache_key] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
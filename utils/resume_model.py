@@ -0,0 +1,239 @@
+"""
+Structured resume model shared by the generator, scorer and renderers.
+
+A ResumeDocument is built once from the section strings returned by
+parse_ai_response / format_basic_resume. It parses skills, roles and
+bullets up front and caches the lowercased text views the scorer needs, so
+consumers stop re-splitting and re-joining the same strings on every
+Streamlit rerun. It still behaves like the old read-only dict
+(doc['summary'], doc.get('skills')), so existing callers keep working.
+"""
+import re
+from collections.abc import Mapping
+
+CONTACT_KEYS = ('name', 'email', 'phone', 'target_role')
+SECTION_KEYS = ('summary', 'skills', 'experience', 'projects', 'education', 'certifications')
+FIELDS = CONTACT_KEYS + SECTION_KEYS
+
+# Keys of the Mapping view: the same as to_dict()
+MAPPING_KEYS = FIELDS + ('degraded',)
+
+# Sections whose blocks are "Title | Organisation" entries with bullets
+ENTRY_SECTIONS = ('experience', 'projects')
+
+BULLET_MARKERS = ('•', '-', '*', '▪', '●', '◦')
+
+_SKILL_SPLIT = re.compile(r'[,;|\n]')
+_TOKEN = re.compile(r'\b\w+\b')
+
+
+def escape_markup(text):
+    """
+    Escape &, < and > for XML text and reportlab paragraph markup. Quotes are
+    left alone since the text never goes into an attribute.
+    """
+    # Not xml.sax.saxutils.escape: importing it pulls in urllib.request,
+    # most of the startup import budget
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def classify_line(line):
+    """
+    Return (kind, text) for one line of a section: 'bullet' for bullet
+    points (marker stripped), 'role' for "Title | Company" lines, otherwise
+    'text'.
+    """
+    stripped = line.strip()
+    for marker in BULLET_MARKERS:
+        if stripped.startswith(marker) and stripped[len(marker):len(marker) + 1] in (' ', '\t'):
+            return 'bullet', stripped[len(marker):].strip()
+    if ' | ' in stripped:
+        return 'role', stripped
+    return 'text', stripped
+
+
+class Entry:
+    """One role or project: a heading line, detail lines (dates etc.) and bullets"""
+
+    __slots__ = ('heading', 'details', 'bullets')
+
+    def __init__(self, heading='', details=None, bullets=None):
+        self.heading = heading
+        self.details = details or []
+        self.bullets = bullets or []
+
+    def __repr__(self):
+        return f"Entry({self.heading!r}, {len(self.bullets)} bullets)"
+
+
+def parse_entries(text):
+    """Group the lines of an experience/projects section into Entry objects"""
+    entries = []
+    current = None
+    for line in str(text or '').split('\n'):
+        if not line.strip():
+            continue
+        kind, content = classify_line(line)
+        if kind == 'bullet':
+            if current is None:
+                current = Entry()
+                entries.append(current)
+            current.bullets.append(content)
+        elif kind == 'role' or current is None or current.bullets:
+            # A role line, or plain text after bullets, starts the next entry
+            current = Entry(content)
+            entries.append(current)
+        else:
+            current.details.append(content)
+    return entries
+
+
+def parse_lines(text):
+    """Non-empty lines of a section with bullet markers stripped"""
+    lines = []
+    for line in str(text or '').split('\n'):
+        if line.strip():
+            lines.append(classify_line(line)[1])
+    return lines
+
+
+def parse_skills(text):
+    """Individual skills in their original case, duplicates removed"""
+    skills = []
+    seen = set()
+    for line in str(text or '').split('\n'):
+        kind, content = classify_line(line)
+        for skill in _SKILL_SPLIT.split(content):
+            skill = skill.strip()
+            if skill and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills
+
+
+class ResumeDocument(Mapping):
+    """
+    Immutable resume: the raw section strings plus their parsed forms.
+
+    Parsed views (skill_list, entries, lines) are built on construction;
+    lowercased text and token sets are computed on first use and cached.
+    Use with_section() to get a copy with one section replaced.
+
+    degraded is True when the content came from the local fallback
+    generator because the LLM was overloaded or failing, so it can be
+    offered for regeneration later. Like the sections, it is also readable
+    as doc['degraded'] / doc.get('degraded'), matching to_dict().
+    """
+
+    __slots__ = FIELDS + (
+        'degraded', 'skill_list', 'entries', 'lines',
+        '_keyword_text', '_role_text', '_tokens', '_section_tokens',
+    )
+
+    def __init__(self, **fields):
+        for key in FIELDS:
+            value = fields.get(key)
+            object.__setattr__(self, key, '' if value is None else str(value))
+        object.__setattr__(self, 'degraded', bool(fields.get('degraded')))
+
+        object.__setattr__(self, 'skill_list', parse_skills(self.skills))
+        object.__setattr__(self, 'entries', {key: parse_entries(getattr(self, key)) for key in ENTRY_SECTIONS})
+        object.__setattr__(self, 'lines', {
+            key: parse_lines(getattr(self, key)) for key in SECTION_KEYS if key not in ENTRY_SECTIONS
+        })
+        for slot in ('_keyword_text', '_role_text', '_tokens', '_section_tokens'):
+            object.__setattr__(self, slot, None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from a resume dict; documents are returned unchanged"""
+        if isinstance(data, ResumeDocument):
+            return data
+        return cls(**{key: data.get(key) for key in FIELDS}, degraded=data.get('degraded', False))
+
+    def to_dict(self):
+        """Plain dict of the section strings and the degraded flag (JSON-safe)"""
+        data = {key: getattr(self, key) for key in FIELDS}
+        data['degraded'] = self.degraded
+        return data
+
+    def with_section(self, key, text):
+        """A new document with one field replaced; caches start fresh"""
+        if key not in FIELDS:
+            raise KeyError(key)
+        data = self.to_dict()
+        data[key] = text
+        return type(self)(**data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ResumeDocument is immutable; use with_section()")
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), self.to_dict()))
+
+    # Mapping interface, so the document can stand in for the old dict;
+    # it has the same keys as to_dict(), degraded included
+    def __getitem__(self, key):
+        if key not in MAPPING_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(MAPPING_KEYS)
+
+    def __len__(self):
+        return len(MAPPING_KEYS)
+
+    def __repr__(self):
+        return f"ResumeDocument(name={self.name!r}, target_role={self.target_role!r})"
+
+    # Cached derived views used by the scorer
+    @property
+    def keyword_text(self):
+        """Lowercased summary, skills, experience and projects"""
+        if self._keyword_text is None:
+            text = ' '.join([self.summary, self.skills, self.experience, self.projects]).lower()
+            object.__setattr__(self, '_keyword_text', text)
+        return self._keyword_text
+
+    @property
+    def role_text(self):
+        """Lowercased summary, experience and projects"""
+        if self._role_text is None:
+            text = ' '.join([self.summary, self.experience, self.projects]).lower()
+            object.__setattr__(self, '_role_text', text)
+        return self._role_text
+
+    @property
+    def tokens(self):
+        """Set of lowercased word tokens across all sections"""
+        if self._tokens is None:
+            tokens = set()
+            for key in SECTION_KEYS:
+                tokens |= self.section_tokens(key)
+            object.__setattr__(self, '_tokens', frozenset(tokens))
+        return self._tokens
+
+    def section_tokens(self, key):
+        """Set of lowercased word tokens in one section"""
+        if self._section_tokens is None:
+            object.__setattr__(self, '_section_tokens', {})
+        tokens = self._section_tokens.get(key)
+        if tokens is None:
+            tokens = frozenset(_TOKEN.findall(getattr(self, key).lower()))
+            self._section_tokens[key] = tokens
+        return tokens
+
+    @property
+    def lower_skills(self):
+        """Skills lowercased, as the scorer compares them"""
+        return [skill.lower() for skill in self.skill_list]
+
+
+def _rebuild(cls, data):
+    return cls(**data)
+
+
+def as_document(resume_data):
+    """Accept either a ResumeDocument or a plain resume dict"""
+    return ResumeDocument.from_dict(resume_data)
@@ -1,23 +1,143 @@
-import PyPDF2
-import pdfplumber
-from docx import Document
+from contextlib import contextmanager
+import io
+import mmap
+import os
 import re
+import shutil
+import tempfile
 
-def parse_resume(uploaded_file):
+from .log import get_logger
+from .metrics import span
+
+logger = get_logger(__name__)
+
+# Uploads larger than this are spooled to disk and memory-mapped for parsing
+SPOOL_THRESHOLD = int(os.getenv('RESUME_SPOOL_THRESHOLD_KB', '512')) * 1024
+
+# Hard upload limit, enforced before any parsing starts
+MAX_UPLOAD_BYTES = int(os.getenv('RESUME_MAX_UPLOAD_MB', '10')) * 1024 * 1024
+
+
+def parse_resume(uploaded_file, max_bytes=None):
     """
     Parse uploaded resume (PDF or DOCX) and extract information
     """
     file_type = uploaded_file.name.split('.')[-1].lower()
-    
-    if file_type == 'pdf':
-        return parse_pdf(uploaded_file)
-    elif file_type == 'docx':
-        return parse_docx(uploaded_file)
-    else:
+    if file_type not in ('pdf', 'docx'):
         return None
+    
+    with span('upload_parse', format=file_type):
+        check_upload_size(uploaded_file, max_bytes)
+        
+        with open_upload(uploaded_file) as stream:
+            if file_type == 'pdf':
+                return parse_pdf(stream)
+            return parse_docx(stream)
+
+
+def parse_resume_bytes(filename, data, max_bytes=None):
+    """
+    Parse a resume given as raw bytes. Module-level and picklable, so it can
+    be sent to a process pool.
+    """
+    stream = io.BytesIO(data)
+    stream.name = filename
+    return parse_resume(stream, max_bytes)
+
+
+def upload_size(uploaded_file):
+    """Size in bytes of an uploaded or opened file, without reading it"""
+    size = getattr(uploaded_file, 'size', None)
+    if size is not None:
+        return size
+    
+    try:
+        return os.fstat(uploaded_file.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        pass
+    
+    position = uploaded_file.tell()
+    uploaded_file.seek(0, os.SEEK_END)
+    size = uploaded_file.tell()
+    uploaded_file.seek(position)
+    return size
+
+
+def check_upload_size(uploaded_file, max_bytes=None):
+    """Reject uploads over the configured limit"""
+    limit = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    size = upload_size(uploaded_file)
+    if limit and size > limit:
+        raise ValueError(
+            f"File is {size / (1024 * 1024):.1f} MB; the upload limit is {limit / (1024 * 1024):.1f} MB"
+        )
+    return size
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only, seekable file object over an mmap (zipfile needs seekable())"""
+    
+    def __init__(self, mapped):
+        self._mapped = mapped
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def readinto(self, buffer):
+        data = self._mapped.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+    
+    def tell(self):
+        return self._mapped.tell()
+
+
+@contextmanager
+def open_upload(uploaded_file, threshold=None):
+    """
+    Yield a seekable stream over the upload for the parsers.
+    
+    Small uploads are used as-is. Real files on disk are memory-mapped
+    directly; larger in-memory uploads are first copied to a temporary file
+    in chunks and then memory-mapped, so the parsers read from the page
+    cache instead of another private copy of the bytes.
+    """
+    threshold = SPOOL_THRESHOLD if threshold is None else threshold
+    size = upload_size(uploaded_file)
+    
+    if size == 0 or size <= threshold:
+        uploaded_file.seek(0)
+        yield uploaded_file
+        return
+    
+    try:
+        fileno = uploaded_file.fileno()
+    except (AttributeError, OSError, ValueError):
+        fileno = None
+    
+    if fileno is not None:
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+            yield MappedFile(mapped)
+        return
+    
+    with tempfile.TemporaryFile() as spool:
+        uploaded_file.seek(0)
+        shutil.copyfileobj(uploaded_file, spool, 1024 * 1024)
+        spool.flush()
+        with mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield MappedFile(mapped)
 
 def parse_pdf(pdf_file):
     """Extract text from PDF"""
+    import pdfplumber
+    
     try:
         text = ""
         with pdfplumber.open(pdf_file) as pdf:
@@ -26,17 +146,19 @@ def parse_pdf(pdf_file):
         
         return extract_resume_sections(text)
     except Exception as e:
-        print(f"Error parsing PDF: {e}")
+        logger.warning("Error parsing PDF: %s", e)
         return None
 
 def parse_docx(docx_file):
     """Extract text from DOCX"""
+    from docx import Document
+    
     try:
         doc = Document(docx_file)
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         return extract_resume_sections(text)
     except Exception as e:
-        print(f"Error parsing DOCX: {e}")
+        logger.warning("Error parsing DOCX: %s", e)
         return None
 
 def extract_resume_sections(text):
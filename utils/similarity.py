@@ -0,0 +1,175 @@
+"""
+Local text similarity from hashed character n-gram vectors.
+
+Texts are lowercased, stop words are dropped, and every 3-5 character
+n-gram inside a word (words are padded with spaces, so "rest" also yields
+" re" and "st ") plus every whole word is hashed into one of DIMENSIONS
+buckets. Counts are log-scaled and L2-normalised, so the similarity of two
+texts is the dot product of their vectors. Sharing n-grams, "built REST
+services" gets partial credit against "RESTful service development" where
+exact keyword matching gets none.
+
+Hashing is done with NumPy over the whole text at once, so a resume is
+vectorised in well under a millisecond. Job description vectors are
+cached by a digest of the text (RESUME_SIMILARITY_CACHE entries), and
+similarities() scores one resume against many JDs with a single
+matrix-vector product.
+
+NumPy is imported on first use; set RESUME_SEMANTIC_SCORING=0 to leave
+the semantic_match component out of calculate_ats_score.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from .metrics import incr
+
+ENABLED = os.getenv('RESUME_SEMANTIC_SCORING', '1') != '0'
+
+DIMENSIONS = 1 << 13
+NGRAM_SIZES = (3, 4, 5)
+
+# Cached JD vectors (DIMENSIONS float32 each, 32 KB)
+CACHE_SIZE = int(os.getenv('RESUME_SIMILARITY_CACHE', '256'))
+
+# Cosine similarity mapped to 0 and to full points; unrelated texts share
+# common n-grams, so the floor sits well above zero
+SIMILARITY_FLOOR = 0.2
+SIMILARITY_CEILING = 0.6
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'is', 'was', 'are',
+    'were', 'been', 'be', 'have', 'has', 'will', 'you', 'your', 'our', 'we', 'as', 'by', 'from', 'this',
+    'that', 'it', 'its', 'into', 'who', 'all', 'can', 'such', 'other', 'about',
+})
+
+_WORD = re.compile(r'[a-z0-9+#]+')
+
+# Multiplicative hashing constants; 64-bit arithmetic wraps in NumPy
+_PRIME = 1099511628211
+_MIX = 0x9E3779B97F4A7C15
+_WORD_SEED = 0x5BD1E995
+
+
+def normalize(text):
+    """Lowercased words without stop words, joined and padded by single spaces"""
+    words = [w for w in _WORD.findall((text or '').lower()) if w not in STOP_WORDS]
+    return f" {' '.join(words)} " if words else ''
+
+
+def _buckets(codes, width, seed=0):
+    """Bucket of every `width`-long window of a uint64 code array"""
+    import numpy as np
+
+    count = len(codes) - width + 1
+    h = np.full(count, seed, dtype=np.uint64)
+    for k in range(width):
+        h = h * np.uint64(_PRIME) + codes[k:k + count]
+    return (h * np.uint64(_MIX)) >> np.uint64(64 - DIMENSIONS.bit_length() + 1)
+
+
+def vectorize(text):
+    """Unit-length float32 vector of the text's hashed n-grams and words"""
+    import numpy as np
+
+    padded = normalize(text)
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    if not padded:
+        return vector
+
+    codes = np.frombuffer(padded.encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+    space = codes == ord(' ')
+    parts = []
+    for width in NGRAM_SIZES:
+        if len(codes) < width:
+            continue
+        buckets = _buckets(codes, width)
+        # Keep n-grams within one word: no space except at either end
+        count = len(buckets)
+        inner = np.zeros(count, dtype=bool)
+        for k in range(1, width - 1):
+            inner |= space[k:k + count]
+        parts.append(buckets[~inner])
+
+    # Whole words, hashed in a separate space from the n-grams
+    starts = np.flatnonzero(space[:-1])
+    ends = np.flatnonzero(space[1:]) + 1
+    words = np.zeros(len(starts), dtype=np.uint64)
+    longest = int((ends - starts).max())
+    for k in range(1, longest):
+        position = np.minimum(starts + k, ends)
+        word_char = position < ends
+        words = np.where(word_char, words * np.uint64(_PRIME) + codes[position], words)
+    parts.append(((words ^ np.uint64(_WORD_SEED)) * np.uint64(_MIX)) >> np.uint64(64 - DIMENSIONS.bit_length() + 1))
+
+    counts = np.bincount(np.concatenate(parts).astype(np.intp), minlength=DIMENSIONS)
+    vector = np.log1p(counts, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class VectorCache:
+    """LRU of text vectors keyed by a digest of the text, not the text itself"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text):
+        key = hashlib.blake2b((text or '').encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+        if vector is not None:
+            incr('jd_vector_hits')
+            return vector
+
+        incr('jd_vector_misses')
+        vector = vectorize(text)
+        vector.flags.writeable = False
+        with self._lock:
+            self._vectors[key] = vector
+            while len(self._vectors) > self.maxsize:
+                self._vectors.popitem(last=False)
+        return vector
+
+    def clear(self):
+        with self._lock:
+            self._vectors.clear()
+
+
+jd_vectors = VectorCache()
+
+
+def similarity(text, job_description):
+    """Cosine similarity (0-1) of a text and a job description"""
+    return float(vectorize(text) @ jd_vectors.get(job_description))
+
+
+def similarities(text, job_descriptions):
+    """Cosine similarity of one text to each job description, as a float32 array"""
+    import numpy as np
+
+    if not job_descriptions:
+        return np.zeros(0, dtype=np.float32)
+    matrix = np.stack([jd_vectors.get(jd) for jd in job_descriptions])
+    return matrix @ vectorize(text)
+
+
+def similarity_matrix(texts, job_descriptions):
+    """[len(texts), len(job_descriptions)] cosine similarities in one matrix product"""
+    import numpy as np
+
+    resumes = np.stack([vectorize(text) for text in texts])
+    jds = np.stack([jd_vectors.get(jd) for jd in job_descriptions])
+    return resumes @ jds.T
+
+
+def similarity_points(value, points=25):
+    """Map a cosine similarity onto 0-points, like the other score components"""
+    scaled = (value - SIMILARITY_FLOOR) / (SIMILARITY_CEILING - SIMILARITY_FLOOR)
+    return min(max(scaled, 0.0), 1.0) * points
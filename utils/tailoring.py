@@ -0,0 +1,170 @@
+"""
+Tailor one candidate profile to many job descriptions in a single run.
+
+A base resume is generated once without any JD. For each JD, only the
+JD-sensitive sections (summary, skills order and experience bullets, see
+TAILORED_SECTIONS) are then rewritten from a short prompt, with the
+per-JD calls running concurrently. Projects, education and certifications
+are shared by every variant, so their prompt and response tokens are paid
+for once, and rendering reuses their cached output across variants.
+
+Usage:
+    python -m utils.tailoring profile.json jds.jsonl -o tailored.zip [--formats pdf,docx] [--results out.jsonl]
+
+profile.json holds the form inputs (full_name, email, phone, target_role,
+...). Each line of jds.jsonl is {"title": ..., "job_description": ...};
+a directory of .txt files (one JD each, titled by file name) also works.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from . import similarity
+from .ai_generator import generate_resume_content, tailor_resume, TAILORED_SECTIONS
+from .ats_scorer import calculate_ats_score
+from .batch_render import archive_name, render_batch
+from .metrics import span
+from .pdf_generator import create_pdf, create_docx, LAYOUTS, DEFAULT_LAYOUT
+
+# Concurrent per-JD LLM calls within one run
+CONCURRENCY = int(os.getenv('RESUME_TAILOR_CONCURRENCY', '4'))
+
+# Upper bound on JDs per run
+MAX_JOBS = int(os.getenv('RESUME_TAILOR_MAX_JOBS', '25'))
+
+
+def normalize_jobs(job_descriptions):
+    """[(title, job description)] from strings or {'title', 'job_description'} dicts"""
+    jobs = []
+    for index, job in enumerate(job_descriptions, 1):
+        if isinstance(job, str):
+            job = {'job_description': job}
+        text = (job.get('job_description') or '').strip()
+        if text:
+            title = job.get('title') or text.splitlines()[0].strip()[:60] or f'Job {index}'
+            jobs.append((title, text))
+    if not jobs:
+        raise ValueError("Provide at least one non-empty job description")
+    if len(jobs) > MAX_JOBS:
+        raise ValueError(f"At most {MAX_JOBS} job descriptions per run (got {len(jobs)})")
+    return jobs
+
+
+def tailor_to_jobs(input_data, job_descriptions, concurrency=None):
+    """
+    Generate one resume variant per job description.
+
+    Returns a JSON-safe dict: {'base': <resume dict>, 'variants': [{'title',
+    'job_description', 'resume', 'ats_score'}, ...] in input order, 'stats':
+    timings in seconds}. With semantic scoring on, each variant also has
+    'base_semantic_match', the untailored resume's semantic match to its JD.
+    """
+    jobs = normalize_jobs(job_descriptions)
+    stats = {'jobs': len(jobs), 'tailored_sections': list(TAILORED_SECTIONS)}
+
+    with span('tailor_batch', jobs=len(jobs)):
+        started = time.perf_counter()
+        base = generate_resume_content({**input_data, 'job_description': ''})
+        stats['base_seconds'] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency or CONCURRENCY, thread_name_prefix='resume-tailor') as pool:
+            tailored = list(pool.map(lambda job: tailor_resume(base, job[1]), jobs))
+        stats['tailor_seconds'] = round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        variants = [
+            {
+                'title': title,
+                'job_description': text,
+                'resume': resume.to_dict(),
+                'ats_score': calculate_ats_score(resume, text, resume.target_role),
+            }
+            for (title, text), resume in zip(jobs, tailored)
+        ]
+        if similarity.ENABLED:
+            # The base against every JD in one matrix product
+            base_match = similarity.similarities(base.keyword_text, [text for _, text in jobs])
+            for variant, value in zip(variants, base_match):
+                variant['base_semantic_match'] = round(similarity.similarity_points(float(value)))
+        stats['score_seconds'] = round(time.perf_counter() - started, 3)
+
+    return {'base': base.to_dict(), 'variants': variants, 'stats': stats}
+
+
+def variants_zip(variants, layout=DEFAULT_LAYOUT):
+    """
+    PDF and DOCX of every variant in one ZIP, rendered in this process so
+    the sections the variants share come from the render cache.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for index, variant in enumerate(variants):
+            resume = variant['resume']
+            archive.writestr(archive_name(index, resume, 'pdf'), create_pdf(resume, layout=layout))
+            archive.writestr(archive_name(index, resume, 'docx'), create_docx(resume))
+        archive.writestr('variants.json', json.dumps(
+            [{'title': v['title'], 'ats_score': v['ats_score']['score']} for v in variants], indent=2
+        ))
+    return buffer.getvalue()
+
+
+def load_jobs(path):
+    """JD list from a JSONL file or a directory of .txt files"""
+    if os.path.isdir(path):
+        jobs = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.txt'):
+                with open(os.path.join(path, name), encoding='utf-8') as f:
+                    jobs.append({'title': os.path.splitext(name)[0], 'job_description': f.read()})
+        return jobs
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tailor one profile to many job descriptions")
+    parser.add_argument('profile', help="JSON file with the form inputs")
+    parser.add_argument('jobs', help="JSONL of {title, job_description}, or a directory of .txt JDs")
+    parser.add_argument('-o', '--output', required=True, help="ZIP archive for the rendered variants")
+    parser.add_argument('-f', '--formats', default='pdf,docx', help="Comma-separated formats: pdf, docx")
+    parser.add_argument('-l', '--layout', default=DEFAULT_LAYOUT, choices=sorted(LAYOUTS), help="PDF layout")
+    parser.add_argument('--concurrency', type=int, default=None, help="Concurrent per-JD LLM calls")
+    parser.add_argument('--results', help="Also write each variant (title, resume, score) as JSONL here")
+    args = parser.parse_args(argv)
+
+    with open(args.profile, encoding='utf-8') as f:
+        input_data = json.load(f)
+    try:
+        result = tailor_to_jobs(input_data, load_jobs(args.jobs), args.concurrency)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    # One worker process, so every variant shares its section render cache
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    rendered = render_batch((v['resume'] for v in result['variants']), args.output,
+                            formats=formats, layout=args.layout, workers=1)
+
+    stats = result['stats']
+    print(f"🎯 {stats['jobs']} variants: base {stats['base_seconds']}s, "
+          f"tailoring {stats['tailor_seconds']}s, scoring {stats['score_seconds']}s, "
+          f"rendering {rendered['elapsed']}s")
+    for index, variant in enumerate(result['variants']):
+        print(f"  {index:05d}  {variant['ats_score']['score']:3d}/100  {variant['title']}")
+    print(f"💾 {rendered['files']} files written to {args.output}")
+
+    if args.results:
+        with open(args.results, 'w', encoding='utf-8') as f:
+            for variant in result['variants']:
+                f.write(json.dumps(variant) + '\n')
+    return 1 if rendered['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Process pool helpers shared by the batch tools.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkerCrashed(Exception):
+    """A task was running in a worker process that died, twice"""
+
+
+def imap_unordered(fn, arg_tuples, workers=None, max_in_flight=None):
+    """
+    Run fn(*args) for each tuple in a process pool, yielding
+    (args, result, error) as tasks finish, in completion order.
+
+    Only max_in_flight tasks are submitted at a time, so arg_tuples can be a
+    lazy iterator over a very large input. Exceptions raised by fn come back
+    as the error. If a worker dies (segfault, OOM kill) the pool is rebuilt;
+    tasks that were in flight get one retry, and a task caught in a second
+    crash is reported with a WorkerCrashed error instead of being retried.
+    Retries run one at a time, so only the task that kills its worker on its
+    own is ever reported as crashed.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+
+    source = enumerate(arg_tuples)
+    retry = []
+    crashes = {}
+
+    while True:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        in_flight = {}
+        try:
+            while True:
+                if retry:
+                    # Re-run crash suspects one at a time so the next crash
+                    # pins down the culprit instead of its neighbours
+                    if not in_flight:
+                        index, args = retry.pop()
+                        in_flight[executor.submit(fn, *args)] = (index, args)
+                else:
+                    while len(in_flight) < max_in_flight:
+                        item = next(source, None)
+                        if item is None:
+                            break
+                        index, args = item
+                        in_flight[executor.submit(fn, *args)] = (index, args)
+
+                if not in_flight:
+                    return
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, args = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        in_flight[future] = (index, args)
+                        raise
+                    except Exception as e:
+                        yield args, None, e
+                    else:
+                        yield args, result, None
+        except BrokenProcessPool:
+            for index, args in in_flight.values():
+                crashes[index] = crashes.get(index, 0) + 1
+                if crashes[index] < 2:
+                    retry.append((index, args))
+                else:
+                    yield args, None, WorkerCrashed("worker process died")
+            logger.warning("⚠️ Worker pool crashed, restarting")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)